@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark session snapshot codecs.
+
+Plays a realistic session through the gameplay tools (AI turns with moves,
+room reveals and dice rolls; other players' actions recorded between them),
+then measures encode/decode time and encoded size for every codec in
+session_codec.CODECS, both for the snapshot alone and for the full session
+document including the action log.
+
+Run with:
+    python benchmarks/bench_session_codecs.py [--turns 200] [--repeat 50]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp_server import history_manager, session_codec
+from mcp_server.data_loader import get_maps_data
+from mcp_server.tools import (
+    context_tools,
+    dice_tools,
+    movement_tools,
+    session_tools,
+    turn_order_tools,
+    turn_tools,
+)
+
+
+PLAYERS = [
+    {"characterId": "professor-longfellow", "isAI": True},
+    {"characterId": "father-rhinehardt"},
+    {"characterId": "madame-zostra"},
+    {"characterId": "ox-bellows"},
+]
+
+OTHER_ACTIONS = ["move", "draw_card", "attack", "use_item", "discover_room"]
+
+
+def _try_reveal(session_id: str, direction: str, unrevealed: list[str]) -> bool:
+    """Reveal the first room tile that fits behind an unexplored door."""
+    movement_tools.set_pending_room_reveal(session_id, direction)
+    for room_name in list(unrevealed):
+        for rotation in (0, 90, 180, 270):
+            result = movement_tools.reveal_room(session_id, room_name, rotation)
+            if "error" not in result:
+                unrevealed.remove(room_name)
+                return True
+    return False
+
+
+def play_session(turns: int, seed: int = 7) -> str:
+    """
+    Play a session until the given turn number.
+
+    Returns:
+        The session ID
+    """
+    rng = random.Random(seed)
+    session_id = session_tools.create_game_session(PLAYERS)["sessionId"]
+    state = history_manager.load_history_file(session_id)
+    player_ids = [p["id"] for p in state["players"]]
+    turn_order_tools.set_turn_order(session_id, player_ids)
+
+    unrevealed = [
+        room["name"]["en"]
+        for room in get_maps_data().get("ROOMS", [])
+        if not room.get("isStartingRoom")
+    ]
+    rng.shuffle(unrevealed)
+
+    while state["turnState"]["currentTurnNumber"] <= turns:
+        current = state["turnState"]["currentPlayerId"]
+
+        if current == player_ids[0]:
+            turn_tools.start_turn(session_id)
+            for _ in range(4):
+                options = movement_tools.get_movement_options(session_id).get("options", [])
+                doors = [o for o in options if o["doorKind"] != "stairs"]
+                if not doors:
+                    break
+                option = rng.choice(doors)
+                if option["explored"]:
+                    movement_tools.move_direction(session_id, option["direction"])
+                elif not _try_reveal(session_id, option["direction"], unrevealed):
+                    break
+
+            stat = rng.choice(["speed", "might", "knowledge", "sanity"])
+            roll = dice_tools.request_dice_roll(session_id, "stat_check", stat, target=4)
+            if "rollId" in roll:
+                dice_tools.record_dice_result(
+                    session_id, roll["rollId"], rng.randint(0, 2 * roll.get("diceCount", 4))
+                )
+        else:
+            context_tools.record_other_player_action(
+                session_id,
+                current,
+                rng.choice(OTHER_ACTIONS),
+                {"note": f"turn {state['turnState']['currentTurnNumber']}"},
+            )
+
+        turn_tools.end_turn(session_id)
+        state = history_manager.load_history_file(session_id)
+
+    history_manager.flush_sessions()
+    return session_id
+
+
+def bench(data, repeat: int) -> list[tuple]:
+    """Measure each codec on a value. Returns (name, bytes, encode ms, decode ms) rows."""
+    rows = []
+    for name in session_codec.CODECS:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            payload = session_codec.encode(data, name)
+        encode_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            decoded = session_codec.decode(payload, name)
+        decode_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        assert decoded == data, f"{name} did not round-trip"
+        rows.append((name, len(payload), encode_ms, decode_ms))
+    return rows
+
+
+def print_table(title: str, rows: list[tuple]) -> None:
+    print(f"\n{title}")
+    print(f"{'codec':<12}{'bytes':>10}{'encode ms':>12}{'decode ms':>12}")
+    for name, size, encode_ms, decode_ms in rows:
+        print(f"{name:<12}{size:>10}{encode_ms:>12.3f}{decode_ms:>12.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=200, help="Turns to play")
+    parser.add_argument("--repeat", type=int, default=50, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history_manager.set_store(None)
+        history_manager.HISTORY_DIR = Path(tmp)
+
+        session_id = play_session(args.turns)
+        snapshot = history_manager.get_store().read(session_id)
+        document = session_tools.load_game_session(session_id)
+
+        print(
+            f"Session after {args.turns} turns: "
+            f"{len(snapshot['map']['placedRooms'])} rooms placed, "
+            f"{len(document['actionLog'])} logged actions"
+        )
+        print_table("Snapshot", bench(snapshot, args.repeat))
+        print_table("Snapshot + action log", bench(document, args.repeat))
+
+        history_manager.set_store(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark tool latency on the event loop while a large session is saved.
+
+Plays a long session, then runs two coroutines on one asyncio loop the way
+the MCP server does: one keeps saving the session (debug codec, full
+flush), the other issues a cheap static-data tool call (get_item_by_id) at
+a fixed rate. Latency is measured from each call's scheduled start, so
+time spent waiting for a blocked loop counts. Both are run inline on the
+loop (the old dispatch) and through workers.run_blocking (the current one).
+
+Run with:
+    python benchmarks/bench_tool_latency.py [--turns 400] [--calls 500]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_session_codecs import play_session
+from mcp_server import history_manager, workers
+from mcp_server.tools import cards_tools
+
+
+ITEM_ID = "ao_giap"
+
+
+async def _inline(func, *args):
+    return func(*args)
+
+
+def _save(session_id: str) -> None:
+    state = history_manager.load_history_file(session_id)
+    history_manager.save_history_file(session_id, state)
+    history_manager.flush_sessions()
+
+
+async def _saver(call, session_id: str, stop: asyncio.Event) -> int:
+    saves = 0
+    while not stop.is_set():
+        await call(_save, session_id)
+        saves += 1
+        await asyncio.sleep(0)
+    return saves
+
+
+async def _probe(call, calls: int, interval: float) -> list[float]:
+    latencies = []
+    start = time.perf_counter()
+    for i in range(calls):
+        scheduled = start + i * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        result = await call(cards_tools.get_item_by_id, ITEM_ID)
+        assert result is not None
+        latencies.append((time.perf_counter() - scheduled) * 1000)
+    return latencies
+
+
+async def run_mode(call, session_id: str, calls: int, interval: float) -> tuple:
+    """Run the probe against a concurrent saver. Returns (latencies ms, saves)."""
+    stop = asyncio.Event()
+    saver = asyncio.create_task(_saver(call, session_id, stop))
+    latencies = await _probe(call, calls, interval)
+    stop.set()
+    saves = await saver
+    return latencies, saves
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=400, help="Turns to play")
+    parser.add_argument("--calls", type=int, default=500, help="Probe calls per mode")
+    parser.add_argument("--interval", type=float, default=2.0, help="Ms between probe calls")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history_manager.SESSION_CODEC = "debug"
+        history_manager.set_store(None)
+        history_manager.HISTORY_DIR = Path(tmp)
+
+        session_id = play_session(args.turns)
+        size = history_manager.get_store().snapshot_path(session_id).stat().st_size
+        print(f"Session after {args.turns} turns: {size} byte snapshot")
+
+        print(f"\n{'mode':<12}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'saves':>8}")
+        for mode, call in (("inline", _inline), ("offloaded", workers.run_blocking)):
+            latencies, saves = asyncio.run(
+                run_mode(call, session_id, args.calls, args.interval / 1000)
+            )
+            print(
+                f"{mode:<12}{statistics.median(latencies):>10.3f}"
+                f"{_percentile(latencies, 99):>10.3f}{max(latencies):>10.3f}{saves:>8}"
+            )
+
+        workers.shutdown()
+        history_manager.set_store(None)
+
+
+if __name__ == "__main__":
+    main()
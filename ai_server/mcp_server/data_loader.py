@@ -1,14 +1,99 @@
 """
 Data loader for game info JSON files.
-Provides cached access to all game data.
+Provides cached access to all game data, plus a catalog of lookup indexes
+built once over it.
+
+All files are loaded together on first use. The parsed data and the
+catalog are also pickled to a cache file next to the data, so a freshly
+spawned server skips parsing and indexing. The cache is keyed on the
+mtime and size of every source file and of this module, and is rebuilt
+whenever one of them changes.
+
+The data is frozen as it is loaded: dicts become read-only mappings
+(MappingProxyType) and lists become tuples, so tool results can share
+the cached records without copying and no caller can corrupt them. Use
+thaw() to get a mutable copy, e.g. before storing data in session state.
+
+reload_if_changed() rebuilds the data and catalog off to the side and
+swaps them in together when a source file changes; callers holding the
+previous catalog keep a consistent snapshot.
 """
 
+import copyreg
 import json
+import os
+import pickle
+import sys
+import threading
+import unicodedata
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple
+
+from . import doors
+from .doors import DoorLayout
+
+ITEMS_FILE = "cardsData.json"
+CHARACTERS_FILE = "charactersData.json"
+MAPS_FILE = "mapsData.json"
+TRANSLATIONS_FILE = "rulesBookVietnameseEnglishTableData.json"
+HAUNT_REFERENCE_FILE = "traitorsTomeReferenceTableData.json"
+TRAITOR_MAP_FILE = "traitorsTomeTraitorMap.json"
+
+DATA_FILES = (
+    ITEMS_FILE,
+    CHARACTERS_FILE,
+    MAPS_FILE,
+    TRANSLATIONS_FILE,
+    HAUNT_REFERENCE_FILE,
+    TRAITOR_MAP_FILE,
+)
 
-# Cache for loaded data
+# Precompiled cache of the parsed data and catalog ("0" disables it)
+DATA_CACHE = os.environ.get("BAHOTH_DATA_CACHE", "1") != "0"
+DATA_CACHE_FILE = ".catalog.cache"
+
+# Seconds between checks for changed data files (0 = no hot reload)
+DATA_RELOAD_INTERVAL = float(os.environ.get("BAHOTH_DATA_RELOAD_INTERVAL", "0"))
+
+# Parsed data by filename and the catalog built over it. Both are replaced,
+# never mutated, once published.
 _cache: dict[str, Any] = {}
+_catalog: "Catalog | None" = None
+
+# Source stamps the published data was loaded from
+_stamps: dict[str, tuple[int, int]] = {}
+
+# Serializes loading and reloading
+_load_lock = threading.Lock()
+
+
+def _mappingproxy(mapping: dict) -> Mapping:
+    return MappingProxyType(mapping)
+
+
+# Frozen views and catalog indexes are pickled into the data cache. Shared
+# views stay shared: pickle memoizes the reduced objects.
+copyreg.pickle(MappingProxyType, lambda proxy: (_mappingproxy, (dict(proxy),)))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert parsed JSON into read-only mappings and tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Recursively copy frozen data back into plain dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
 
 def _get_data_dir() -> Path:
     """Get the path to the game_info data directory."""
@@ -17,47 +102,506 @@ def _get_data_dir() -> Path:
 
 def _load_json(filename: str) -> Any:
     """Load a JSON file from the data directory with caching."""
-    if filename in _cache:
-        return _cache[filename]
-
-    filepath = _get_data_dir() / filename
-    with open(filepath, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    _cache[filename] = data
-    return data
+    _ensure_loaded()
+    return _cache[filename]
 
 
-def get_items_data() -> dict:
+def get_items_data() -> Mapping:
     """Load items/cards data."""
-    return _load_json("cardsData.json")
+    return _load_json(ITEMS_FILE)
 
 
-def get_characters_data() -> dict:
+def get_characters_data() -> Mapping:
     """Load characters data."""
-    return _load_json("charactersData.json")
+    return _load_json(CHARACTERS_FILE)
 
 
-def get_maps_data() -> dict:
+def get_maps_data() -> Mapping:
     """Load rooms/maps data."""
-    return _load_json("mapsData.json")
+    return _load_json(MAPS_FILE)
 
 
-def get_translations_data() -> dict:
+def get_translations_data() -> Mapping:
     """Load translation reference data."""
-    return _load_json("rulesBookVietnameseEnglishTableData.json")
+    return _load_json(TRANSLATIONS_FILE)
 
 
-def get_haunt_reference_data() -> dict:
+def get_haunt_reference_data() -> Mapping:
     """Load haunt reference table data."""
-    return _load_json("traitorsTomeReferenceTableData.json")
+    return _load_json(HAUNT_REFERENCE_FILE)
 
 
-def get_traitor_map_data() -> dict:
+def get_traitor_map_data() -> Mapping:
     """Load traitor determination map data."""
-    return _load_json("traitorsTomeTraitorMap.json")
+    return _load_json(TRAITOR_MAP_FILE)
+
+
+class Catalog(NamedTuple):
+    """
+    Read-only indexes over the static game data.
+
+    Lists are tuples and indexes are read-only mappings; the records they
+    hold are the frozen data records themselves. Name keys are normalized
+    with normalize_name() unless noted otherwise; door_layouts is keyed by
+    the rooms' English names.
+
+    The haunt table is a dense matrix of haunt numbers (None for a blank
+    cell): haunt_matrix[omen index][room index], with the omen index taken
+    from haunt_omens / haunt_omen_index (folded key or alias) and the room
+    index from haunt_rooms / haunt_room_index (room_key() of the table's,
+    the translations' and the room tiles' names).
+    """
+
+    items: tuple[Mapping, ...]
+    cards_by_id: Mapping[str, Mapping]
+    cards_by_type: Mapping[str, tuple[Mapping, ...]]
+    characters: tuple[Mapping, ...]
+    characters_by_id: Mapping[str, Mapping]
+    rooms: tuple[Mapping, ...]
+    rooms_by_name: Mapping[str, Mapping]
+    rooms_by_floor: Mapping[str, tuple[Mapping, ...]]
+    rooms_by_token: Mapping[str, tuple[Mapping, ...]]
+    door_layouts: Mapping[str, DoorLayout]
+    starting_rooms: tuple[Mapping, ...]
+    translations_by_term: Mapping[str, tuple[tuple[Mapping, Mapping], ...]]
+    translations_by_folded_term: Mapping[str, tuple[tuple[Mapping, Mapping], ...]]
+    translation_sections: Mapping[str, Mapping]
+    haunt_omens: tuple[Mapping, ...]
+    haunt_omen_index: Mapping[str, int]
+    haunt_rooms: tuple[str, ...]
+    haunt_room_index: Mapping[str, int]
+    haunt_matrix: tuple[tuple[int | None, ...], ...]
+    item_search: "SearchIndex"
+    character_search: "SearchIndex"
+    room_search: "SearchIndex"
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a name for index lookups (case and whitespace insensitive)."""
+    return " ".join(name.casefold().split())
+
+
+def fold_name(name: str) -> str:
+    """
+    Fold a name for search: normalize_name() without diacritics.
+
+    "Hầm Mộ" and "ham mo" fold to the same string.
+    """
+    decomposed = unicodedata.normalize("NFKD", name.replace("đ", "d").replace("Đ", "D"))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return normalize_name(stripped)
+
+
+def room_key(name: str) -> str:
+    """
+    Key a room name for exact lookups: fold_name() without punctuation.
+
+    "Servants' Quarters" and "servants quarters" get the same key.
+    """
+    return " ".join("".join(c if c.isalnum() else " " for c in fold_name(name)).split())
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between two strings, or limit + 1 once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class SearchIndex:
+    """
+    Ranked name search over a list of records.
+
+    Names are folded with fold_name(), so queries match with or without
+    Vietnamese tone marks. A trigram inverted index narrows the candidates;
+    matches rank exact > prefix > substring > fuzzy (small edit distance),
+    then by data order.
+    """
+
+    GRAM = 3
+
+    # Exact, prefix, substring, fuzzy
+    EXACT, PREFIX, SUBSTRING, FUZZY = range(4)
+
+    def __init__(self, records: tuple[Mapping, ...], names: list[list[str]]):
+        """
+        Build the index.
+
+        Args:
+            records: The records to search
+            names: For each record, the names it can be found by
+        """
+        self.records = records
+        self._names = tuple(
+            tuple(dict.fromkeys(fold_name(n) for n in record_names if n))
+            for record_names in names
+        )
+        postings: dict[str, set[int]] = {}
+        for doc, record_names in enumerate(self._names):
+            for name in record_names:
+                for gram in self._grams(name):
+                    postings.setdefault(gram, set()).add(doc)
+        self._postings = MappingProxyType({g: frozenset(d) for g, d in postings.items()})
+
+    @classmethod
+    def _grams(cls, text: str) -> set[str]:
+        return {text[i:i + cls.GRAM] for i in range(len(text) - cls.GRAM + 1)}
+
+    @staticmethod
+    def _max_distance(query: str) -> int:
+        """Edit distance tolerated for fuzzy matches (none below 5 characters)."""
+        return (len(query) - 1) // 4
+
+    def _rank(self, query: str, name: str) -> tuple[int, int] | None:
+        """Rank one name against a folded query, or None if it does not match."""
+        if name == query:
+            return (self.EXACT, 0)
+        if name.startswith(query):
+            return (self.PREFIX, 0)
+        if query in name:
+            return (self.SUBSTRING, 0)
+
+        limit = self._max_distance(query)
+        if limit == 0:
+            return None
+
+        # Compare with the whole name and with each run of as many words
+        # as the query has
+        words = name.split()
+        width = len(query.split())
+        windows = {name} | {
+            " ".join(words[i:i + width]) for i in range(max(len(words) - width + 1, 1))
+        }
+        distance = min(_edit_distance(query, w, limit) for w in windows)
+        return (self.FUZZY, distance) if distance <= limit else None
+
+    def search(self, query: str, fuzzy: bool = True) -> list[Mapping]:
+        """
+        Find records by name.
+
+        Args:
+            query: Full or partial name, with or without diacritics
+            fuzzy: Whether to include near misses (typos)
+
+        Returns:
+            Matching records, best match first
+        """
+        folded = fold_name(query)
+        grams = self._grams(folded)
+
+        if not grams:
+            # Too short to use the index
+            candidates = range(len(self.records))
+        elif fuzzy and self._max_distance(folded):
+            candidates = set().union(*(self._postings.get(g, ()) for g in grams))
+        else:
+            # A substring match contains every gram of the query
+            postings = [self._postings.get(g, frozenset()) for g in grams]
+            candidates = frozenset.intersection(*postings)
+
+        ranked = []
+        for doc in sorted(candidates):
+            ranks = [self._rank(folded, name) for name in self._names[doc]]
+            ranks = [r for r in ranks if r is not None and (fuzzy or r[0] != self.FUZZY)]
+            if ranks:
+                ranked.append((min(ranks), doc))
+
+        ranked.sort()
+        return [self.records[doc] for _, doc in ranked]
+
+
+def _name_values(record: Mapping) -> list[str]:
+    """All string values of a record's name dict (en, vi, nickname, ...)."""
+    return [v for v in record.get("name", {}).values() if isinstance(v, str)]
+
+
+def _group(pairs) -> Mapping[str, tuple]:
+    """Group (key, value) pairs into a read-only mapping of tuples, keeping order."""
+    groups: dict[str, list] = {}
+    for key, value in pairs:
+        groups.setdefault(key, []).append(value)
+    return MappingProxyType({key: tuple(values) for key, values in groups.items()})
+
+
+def _first(pairs) -> Mapping[str, Any]:
+    """Build a read-only mapping keeping the first value seen for each key."""
+    index: dict[str, Any] = {}
+    for key, value in pairs:
+        if key:
+            index.setdefault(key, value)
+    return MappingProxyType(index)
+
+
+def _build_haunt_table(
+    reference: Mapping, rooms: tuple[Mapping, ...], sections: list[Mapping]
+) -> dict[str, Any]:
+    """
+    Build the haunt matrix and its omen and room indexes.
+
+    Table rows name rooms in Vietnamese; they are linked to the room tiles
+    through the rooms translation section, so a row can be found by any of
+    the names a session or client may use for the room.
+    """
+    omen_defs = tuple(reference.get("OMEN_DEFS", []))
+    rows = [row for row in reference.get("REFERENCE_ROWS", []) if row.get("room")]
+
+    room_translations = next(
+        (section.get("entries", []) for section in sections if section.get("id") == "rooms"),
+        [],
+    )
+    translations_by_key = _group(
+        (room_key(entry.get(lang, "")), entry)
+        for entry in room_translations
+        for lang in ("vi", "en")
+    )
+    tiles_by_key = _group(
+        (room_key(room.get("name", {}).get(lang, "")), room)
+        for room in rooms
+        for lang in ("en", "vi")
+    )
+
+    room_names = []
+    for index, row in enumerate(rows):
+        names = [row["room"]]
+        for entry in translations_by_key.get(room_key(row["room"]), ()):
+            names.extend(entry.get(lang, "") for lang in ("vi", "en"))
+        for name in list(names):
+            for tile in tiles_by_key.get(room_key(name), ()):
+                names.extend(tile.get("name", {}).get(lang, "") for lang in ("en", "vi"))
+        room_names.extend((room_key(name), index) for name in names)
+
+    return {
+        "haunt_omens": omen_defs,
+        "haunt_omen_index": _first(
+            (fold_name(name), index)
+            for index, omen_def in enumerate(omen_defs)
+            for name in [omen_def.get("key", ""), *omen_def.get("aliases", [])]
+        ),
+        "haunt_rooms": tuple(row["room"] for row in rows),
+        "haunt_room_index": _first(room_names),
+        "haunt_matrix": tuple(
+            tuple(row.get(omen_def.get("key")) or None for row in rows)
+            for omen_def in omen_defs
+        ),
+    }
+
+
+def _build_catalog(data: dict[str, Any]) -> Catalog:
+    """Build the catalog indexes from parsed game data."""
+    cards_data = data[ITEMS_FILE]
+    cards = [
+        card
+        for key in ("ITEMS", "EVENTS", "OMENS")
+        for card in cards_data.get(key, [])
+    ]
+    characters = tuple(data[CHARACTERS_FILE].get("CHARACTERS", []))
+    rooms = tuple(data[MAPS_FILE].get("ROOMS", []))
+    sections = data[TRANSLATIONS_FILE].get("TRANSLATION_SECTIONS", [])
+    items = tuple(cards_data.get("ITEMS", []))
+
+    return Catalog(
+        items=items,
+        cards_by_id=_first((card.get("id"), card) for card in cards),
+        cards_by_type=_group((card.get("type"), card) for card in cards),
+        characters=characters,
+        characters_by_id=_first((char.get("id"), char) for char in characters),
+        rooms=rooms,
+        rooms_by_name=_first(
+            (normalize_name(room.get("name", {}).get(lang, "")), room)
+            for room in rooms
+            for lang in ("en", "vi")
+        ),
+        rooms_by_floor=_group(
+            (floor, room) for room in rooms for floor in room.get("floorsAllowed", [])
+        ),
+        rooms_by_token=_group(
+            (token, room) for room in rooms for token in dict.fromkeys(room.get("tokens", []))
+        ),
+        door_layouts=_first(
+            (normalize_name(room.get("name", {}).get("en", "")),
+             doors.build_door_layout(room.get("doors", [])))
+            for room in rooms
+        ),
+        starting_rooms=tuple(room for room in rooms if room.get("isStartingRoom")),
+        translations_by_term=_group(
+            (term, (section, entry))
+            for section in sections
+            for entry in section.get("entries", [])
+            for term in dict.fromkeys(
+                normalize_name(entry.get(lang, "")) for lang in ("vi", "en")
+            )
+            if term
+        ),
+        translations_by_folded_term=_group(
+            (term, (section, entry))
+            for section in sections
+            for entry in section.get("entries", [])
+            for term in dict.fromkeys(
+                fold_name(entry.get(lang, "")) for lang in ("vi", "en")
+            )
+            if term
+        ),
+        translation_sections=_first((section.get("id"), section) for section in sections),
+        **_build_haunt_table(data[HAUNT_REFERENCE_FILE], rooms, sections),
+        item_search=SearchIndex(items, [_name_values(item) for item in items]),
+        character_search=SearchIndex(characters, [_name_values(char) for char in characters]),
+        room_search=SearchIndex(rooms, [_name_values(room) for room in rooms]),
+    )
+
+
+def _source_stamps() -> dict[str, tuple[int, int]]:
+    """Get (mtime_ns, size) of each data file and of the modules building the catalog."""
+    paths = {name: _get_data_dir() / name for name in DATA_FILES}
+    paths["<loader>"] = Path(__file__)
+    paths["<doors>"] = Path(doors.__file__)
+    stamps = {}
+    for name, path in paths.items():
+        stat = path.stat()
+        stamps[name] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+
+def _read_data_cache(stamps: dict) -> tuple[dict, Catalog] | None:
+    """Read the parsed data and catalog from the cache file if it matches the stamps."""
+    if not DATA_CACHE:
+        return None
+
+    try:
+        with open(_get_data_dir() / DATA_CACHE_FILE, "rb") as f:
+            blob = pickle.load(f)
+        if blob["sources"] != stamps or not isinstance(blob["catalog"], Catalog):
+            return None
+    except Exception:
+        # Missing, corrupt or written by an older layout (unpickling
+        # garbage can raise nearly anything): rebuild
+        return None
+
+    return blob["data"], blob["catalog"]
+
+
+def _write_data_cache(stamps: dict, data: dict, catalog: Catalog) -> None:
+    """Write the parsed data and catalog to the cache file (best effort)."""
+    if not DATA_CACHE:
+        return
+
+    blob = {
+        "sources": stamps,
+        "data": data,
+        "catalog": catalog,
+    }
+    path = _get_data_dir() / DATA_CACHE_FILE
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            # One dump so indexes keep sharing the data records
+            pickle.dump(blob, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        # Read-only install or data that cannot be pickled: run without the cache
+        print(f"Game data cache not written: {e!r}", file=sys.stderr)
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def _load_snapshot() -> tuple[dict, dict, Catalog]:
+    """
+    Load all data files and build their catalog, from the cache file if valid.
+
+    Returns:
+        (source stamps, parsed data by filename, catalog)
+    """
+    # Stamp before reading, so a change made while reading is seen next time
+    stamps = _source_stamps()
+    cached = _read_data_cache(stamps)
+    if cached is not None:
+        return (stamps, *cached)
+
+    data = {}
+    for filename in DATA_FILES:
+        with open(_get_data_dir() / filename, "r", encoding="utf-8") as f:
+            data[filename] = freeze(json.load(f))
+    catalog = _build_catalog(data)
+    _write_data_cache(stamps, data, catalog)
+    return stamps, data, catalog
+
+
+def _publish(stamps: dict, data: dict, catalog: Catalog) -> None:
+    """Make freshly loaded data and its catalog current."""
+    global _cache, _catalog, _stamps
+    # Catalog last: readers only check _catalog to see if data is loaded,
+    # so the data has to be in place before it is set
+    _cache, _stamps = data, stamps
+    _catalog = catalog
+
+
+def _ensure_loaded() -> None:
+    """Load the data and catalog on first use."""
+    if _catalog is not None:
+        return
+    with _load_lock:
+        if _catalog is None:
+            _publish(*_load_snapshot())
+
+
+def get_catalog() -> Catalog:
+    """
+    Get the catalog of static data indexes, loading it on first use.
+
+    Hold on to the returned catalog for the length of an operation to keep
+    a consistent view across a hot reload.
+    """
+    _ensure_loaded()
+    return _catalog
+
+
+def reload_if_changed() -> bool:
+    """
+    Reload the data and catalog if a data file changed since they were loaded.
+
+    The new data is parsed and indexed before being swapped in. If a file
+    cannot be parsed (e.g. it is mid-edit) or does not have the expected
+    shape, the current data stays in use and the reload is retried on the
+    next call.
+
+    Returns:
+        True if new data was swapped in
+    """
+    if _catalog is None:
+        # Nothing loaded yet: first use will read the current files
+        return False
+
+    with _load_lock:
+        try:
+            if _source_stamps() == _stamps:
+                return False
+            snapshot = _load_snapshot()
+        except Exception as e:
+            # Building the catalog from a malformed file can raise nearly anything
+            print(f"Game data reload failed, keeping current data: {e!r}", file=sys.stderr)
+            return False
+
+        _publish(*snapshot)
+        return True
 
 
 def clear_cache() -> None:
-    """Clear the data cache."""
-    _cache.clear()
+    """Clear the data cache and the catalog built from it."""
+    global _cache, _catalog, _stamps
+    with _load_lock:
+        _catalog = None
+        _cache, _stamps = {}, {}
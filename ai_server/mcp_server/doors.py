@@ -0,0 +1,132 @@
+"""
+Door layouts of room tiles as 4-bit masks.
+
+Sides are numbered clockwise from the top, so rotating a tile 90° clockwise
+moves every door one side further along: a rotation is a 4-bit circular
+shift of the door mask. Each room template's doors are encoded once, for
+all four rotations, when the catalog is built; checking whether a rotation
+puts a door on a side, or whether two neighbouring tiles face each other
+with doors, is then a bitwise AND.
+"""
+
+from typing import NamedTuple
+
+
+# Sides in clockwise order; a side's bit is 1 << its index
+SIDES = ("top", "right", "bottom", "left")
+SIDE_INDEX = {side: index for index, side in enumerate(SIDES)}
+SIDE_BITS = {side: 1 << index for index, side in enumerate(SIDES)}
+
+# Map cell offset (dx, dy) of the neighbour behind each side; y grows upwards
+SIDE_OFFSETS = {"top": (0, 1), "right": (1, 0), "bottom": (0, -1), "left": (-1, 0)}
+
+# Supported tile rotations in degrees clockwise, by number of quarter turns
+ROTATIONS = (0, 90, 180, 270)
+
+ALL_SIDES = 0b1111
+
+
+def rotate_mask(mask: int, quarter_turns: int) -> int:
+    """Rotate a door mask clockwise by the given number of quarter turns."""
+    turns = quarter_turns % 4
+    return ((mask << turns) | (mask >> (4 - turns))) & ALL_SIDES
+
+
+def opposite_mask(mask: int) -> int:
+    """Get the mask of the sides facing the given ones (top <-> bottom, left <-> right)."""
+    return rotate_mask(mask, 2)
+
+
+def rotation_turns(rotation: int) -> int:
+    """
+    Get the number of clockwise quarter turns of a rotation in degrees.
+
+    Angles that are not a multiple of 90 count as no rotation.
+    """
+    degrees = rotation % 360
+    return degrees // 90 if degrees in ROTATIONS else 0
+
+
+def side_mask(sides) -> int:
+    """Encode door sides as a mask. Unknown sides are ignored."""
+    mask = 0
+    for side in sides:
+        mask |= SIDE_BITS.get(side, 0)
+    return mask
+
+
+def mask_sides(mask: int) -> list[str]:
+    """Decode a mask into its sides, in clockwise order from the top."""
+    return [side for index, side in enumerate(SIDES) if mask & (1 << index)]
+
+
+def kind_mask(kinds, kind: str = "door") -> int:
+    """Encode the sides whose door is of the given kind, from a DoorLayout.kinds entry."""
+    mask = 0
+    for index, side_kind in enumerate(kinds):
+        if side_kind == kind:
+            mask |= 1 << index
+    return mask
+
+
+class DoorLayout(NamedTuple):
+    """
+    Precomputed doors of a room template, for each rotation.
+
+    All tuples are indexed by rotation_turns() of the rotation.
+    masks holds the door mask, kinds the door kind per side index (None
+    without a door) and doors the (side, kind) pairs in template order.
+    rotations_by_side maps a side index to the rotations that put a door
+    on that side.
+    """
+
+    masks: tuple[int, ...]
+    kinds: tuple[tuple[str | None, ...], ...]
+    doors: tuple[tuple[tuple[str, str], ...], ...]
+    rotations_by_side: tuple[tuple[int, ...], ...]
+
+
+def build_door_layout(doors) -> DoorLayout:
+    """
+    Encode a room template's door list.
+
+    Args:
+        doors: List of {"side", "kind"} dicts from the room template
+
+    Returns:
+        The DoorLayout for the four rotations
+    """
+    base = {}
+    for door in doors:
+        base[door.get("side")] = door.get("kind")
+
+    masks = []
+    kinds = []
+    rotated = []
+    for turns in range(len(ROTATIONS)):
+        by_side: list[str | None] = [None] * len(SIDES)
+        pairs = {}
+        for side, kind in base.items():
+            if side in SIDE_INDEX:
+                new_index = (SIDE_INDEX[side] + turns) % len(SIDES)
+                by_side[new_index] = kind
+                pairs[SIDES[new_index]] = kind
+            else:
+                pairs[side] = kind
+        masks.append(rotate_mask(side_mask(base), turns))
+        kinds.append(tuple(by_side))
+        rotated.append(tuple(pairs.items()))
+
+    return DoorLayout(
+        masks=tuple(masks),
+        kinds=tuple(kinds),
+        doors=tuple(rotated),
+        rotations_by_side=tuple(
+            tuple(
+                rotation
+                for rotation, mask in zip(ROTATIONS, masks)
+                if mask & (1 << index)
+            )
+            for index in range(len(SIDES))
+        ),
+    )
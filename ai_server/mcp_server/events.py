@@ -0,0 +1,218 @@
+"""
+Game events and the reducers that apply them to session state.
+
+Tools describe each state change as an event: an action log entry with an
+``event`` field naming its reducer and ``details`` carrying everything the
+reducer needs (resolved IDs, rotated doors, resulting movement points), so
+applying it never depends on game data or randomness. The same reducer
+runs when a tool emits the event and when history_manager replays the log
+tail after the last snapshot.
+
+Log entries without an ``event`` field (older logs, informational entries)
+are never replayed.
+"""
+
+import copy
+from typing import Callable
+
+
+def _find(items: list[dict], key: str, value) -> dict | None:
+    """Find the first dict in a list whose key has the given value."""
+    for item in items:
+        if item.get(key) == value:
+            return item
+    return None
+
+
+def _turn_state(state: dict) -> dict:
+    return state.setdefault("turnState", {})
+
+
+def _set_position(state: dict, player_id: str, position: dict) -> None:
+    player = _find(state.get("players", []), "id", player_id)
+    if player is not None:
+        player["currentPosition"] = dict(position)
+
+
+def _clear_pending_reveal(turn_state: dict) -> None:
+    turn_state.pop("pendingRevealDirection", None)
+    turn_state.pop("pendingRevealRoomId", None)
+
+
+def _apply_start_turn(state: dict, event: dict) -> None:
+    turn_state = _turn_state(state)
+    _clear_pending_reveal(turn_state)
+    turn_state["phase"] = "movement"
+    turn_state["movementRemaining"] = event["details"]["movementPoints"]
+    turn_state["actionsThisTurn"] = []
+
+
+def _apply_end_turn(state: dict, event: dict) -> None:
+    details = event["details"]
+    turn_state = _turn_state(state)
+    _clear_pending_reveal(turn_state)
+    turn_state["currentPlayerId"] = details["nextPlayer"]
+    turn_state["currentTurnNumber"] = details["nextTurnNumber"]
+    turn_state["phase"] = "waiting"
+    turn_state["movementRemaining"] = 0
+    turn_state["actionsThisTurn"] = []
+
+
+def _apply_move(state: dict, event: dict) -> None:
+    # Also used for use_stairs: both only change position and movement,
+    # and leave the room a pending reveal was set for
+    details = event["details"]
+    _set_position(state, event["playerId"], details["to"])
+    turn_state = _turn_state(state)
+    _clear_pending_reveal(turn_state)
+    turn_state["movementRemaining"] = details["movementRemaining"]
+
+
+def _apply_reveal_room(state: dict, event: dict) -> None:
+    details = event["details"]
+    room = copy.deepcopy(details["room"])
+
+    map_data = state.setdefault("map", {})
+    placed_rooms = map_data.setdefault("placedRooms", [])
+    placed_rooms.append(room)
+    map_data["nextRoomId"] = details["nextRoomId"]
+
+    # Connect the door the player came through, and the neighbours' doors
+    # facing the new room's doors, to the new room. Older events have no
+    # connectedNeighbours.
+    for connected in [details["connectedFrom"], *details.get("connectedNeighbours", ())]:
+        from_room = _find(placed_rooms, "instanceId", connected["roomId"])
+        if from_room is not None:
+            door = from_room.get("doors", {}).get(connected["side"])
+            if door is not None:
+                door["connectedTo"] = room["instanceId"]
+
+    _set_position(state, event["playerId"], {
+        "floor": room["floor"],
+        "roomId": room["instanceId"],
+        "x": room["x"],
+        "y": room["y"],
+    })
+    turn_state = _turn_state(state)
+    turn_state["movementRemaining"] = details["movementRemaining"]
+    # The pending reveal has been placed
+    _clear_pending_reveal(turn_state)
+
+
+def _apply_set_pending_reveal(state: dict, event: dict) -> None:
+    details = event["details"]
+    turn_state = _turn_state(state)
+    turn_state["pendingRevealDirection"] = details["direction"]
+    turn_state["pendingRevealRoomId"] = details["roomId"]
+
+
+def _apply_dice_roll(state: dict, event: dict) -> None:
+    turn_state = _turn_state(state)
+    roll_id = event["details"]["rollId"]
+    turn_state["pendingRolls"] = [
+        r for r in turn_state.get("pendingRolls", []) if r.get("rollId") != roll_id
+    ]
+
+
+def _apply_other_player_action(state: dict, event: dict) -> None:
+    player_id = event["playerId"]
+    turn_number = event["turn"]
+    action = {"action": event["action"], "details": event.get("details")}
+    context = state.setdefault("otherPlayersContext", [])
+
+    # One entry per player per turn
+    for entry in context:
+        if entry.get("playerId") == player_id and entry.get("turn") == turn_number:
+            entry.setdefault("actions", []).append(action)
+            return
+
+    context.append({
+        "turn": turn_number,
+        "playerId": player_id,
+        "playerName": event.get("playerName"),
+        "actions": [action],
+    })
+
+
+def _apply_request_context(state: dict, event: dict) -> None:
+    request = copy.deepcopy(event["details"]["request"])
+    state.setdefault("contextRequests", []).append(request)
+
+
+def _apply_record_context(state: dict, event: dict) -> None:
+    details = event["details"]
+    request = _find(state.get("contextRequests", []), "requestId", details["requestId"])
+    if request is None:
+        return
+
+    answers = list(details["answers"])
+    request["answers"] = answers
+    request["status"] = "answered"
+
+    # Also keep the Q&A in other players context for long-term tracking
+    qa_pairs = []
+    for i, question in enumerate(request.get("questions", [])):
+        answer = answers[i] if i < len(answers) else "No answer"
+        qa_pairs.append({"question": question, "answer": answer})
+
+    state.setdefault("otherPlayersContext", []).append({
+        "turn": request.get("turn", 1),
+        "playerId": request.get("playerId"),
+        "playerName": request.get("playerName"),
+        "context": qa_pairs,
+        "summary": "; ".join([f"{qa['question']}: {qa['answer']}" for qa in qa_pairs]),
+    })
+
+
+def _apply_ask_question(state: dict, event: dict) -> None:
+    question = copy.deepcopy(event["details"]["question"])
+    state.setdefault("pendingQuestions", []).append(question)
+
+
+def _apply_answer_question(state: dict, event: dict) -> None:
+    details = event["details"]
+    question = _find(state.get("pendingQuestions", []), "questionId", details["questionId"])
+    if question is not None:
+        question["answer"] = details["answer"]
+        question["status"] = "answered"
+
+
+# Event name -> reducer(state, event)
+REDUCERS: dict[str, Callable[[dict, dict], None]] = {
+    "start_turn": _apply_start_turn,
+    "end_turn": _apply_end_turn,
+    "move": _apply_move,
+    "use_stairs": _apply_move,
+    "reveal_room": _apply_reveal_room,
+    "set_pending_reveal": _apply_set_pending_reveal,
+    "dice_roll": _apply_dice_roll,
+    "other_player_action": _apply_other_player_action,
+    "request_context": _apply_request_context,
+    "record_context": _apply_record_context,
+    "ask_question": _apply_ask_question,
+    "answer_question": _apply_answer_question,
+}
+
+
+def is_replayable(entry: dict) -> bool:
+    """Check whether a log entry is an event with a reducer."""
+    return entry.get("event") in REDUCERS
+
+
+def apply_event(state: dict, entry: dict) -> bool:
+    """
+    Apply an event to a session state in place.
+
+    Args:
+        state: The session state
+        entry: Action log entry with an ``event`` field
+
+    Returns:
+        True if the entry was applied, False if it is not a replayable event
+    """
+    reducer = REDUCERS.get(entry.get("event"))
+    if reducer is None:
+        return False
+
+    reducer(state, entry)
+    return True
@@ -2,30 +2,149 @@
 History Manager for game state persistence.
 
 Handles read/write operations for game session history files.
-Files are stored in data/game_history/<session_id>.json
+Files are stored in data/game_history/<session_id>.json (see session_store
+for the available storage backends).
+
+The action log is kept apart from the snapshot and is only ever appended
+to; the snapshot records how much of it belongs to the saved state
+("actionLogOffset"). Sessions are event-sourced: tools emit events (see
+events.py) that are appended to the log, and a snapshot is only written
+every SESSION_SNAPSHOT_EVERY events. Loading reads the snapshot and
+replays the events logged after it.
+
+Recently used sessions are kept in memory. Saves update the in-memory copy
+and are written to disk by flush_sessions() (write-behind), either once
+they have been dirty for SESSION_FLUSH_INTERVAL seconds or on shutdown.
+
+Every change increments ``meta.version``. Writers can pass the version
+their change is based on through ``expected_version``; if the session has
+moved on, SessionConflictError is raised and the client can reload and
+retry. Transactions also hold the store's advisory lock on the session.
+Several processes can share one history directory, but only with
+SESSION_FLUSH_INTERVAL set to 0 so no process holds unwritten changes.
+
+All functions are thread-safe. Each session has its own lock, held while
+it is loaded, saved, flushed or inside a transaction; the cache itself is
+guarded by a separate short-lived lock that is always taken second.
 """
 
-import json
+import copy
 import os
+import threading
+import time
 import uuid
-import tempfile
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from .events import apply_event, is_replayable
+from .map_index import MapIndex
+from .session_store import SessionStore, create_store
+
 
 # Path to game history directory
 HISTORY_DIR = Path(__file__).parent.parent / "data" / "game_history"
 
+# Storage backend: "json" (one file per session) or "sqlite"
+SESSION_STORE = os.environ.get("BAHOTH_SESSION_STORE", "json")
+
+# Snapshot file codec for the json store: "json" (compact), "debug" (pretty
+# JSON), "json+gzip", "json+lzma", "pickle" or "marshal". See session_codec.
+SESSION_CODEC = os.environ.get("BAHOTH_SESSION_CODEC", "json")
+
+# Maximum number of sessions kept in memory (least recently used are evicted)
+SESSION_CACHE_SIZE = int(os.environ.get("BAHOTH_SESSION_CACHE_SIZE", "64"))
+
+# Seconds a modified session may stay in memory before it is written to disk.
+# 0 disables write-behind: every save is written immediately.
+SESSION_FLUSH_INTERVAL = float(os.environ.get("BAHOTH_SESSION_FLUSH_INTERVAL", "2.0"))
+
+# Number of events appended after a snapshot before a new snapshot is saved
+SESSION_SNAPSHOT_EVERY = int(os.environ.get("BAHOTH_SESSION_SNAPSHOT_EVERY", "50"))
+
+
+class SessionConflictError(Exception):
+    """Raised when a session changed since the version a client based its change on."""
+
+    def __init__(self, session_id: str, expected: int, current: int):
+        super().__init__(
+            f"Session {session_id} is at version {current}, expected {expected}. "
+            "Reload the session and retry."
+        )
+        self.session_id = session_id
+        self.expected = expected
+        self.current = current
+
+
+# meta.version the next write in this context must find (None = no check).
+# Set per tool call by the server from the "expected_version" argument.
+expected_version: ContextVar[int | None] = ContextVar("expected_version", default=None)
+
+
+class _CachedSession:
+    """In-memory copy of a stored session."""
+
+    __slots__ = ("state", "revision", "dirty_since", "pending_events", "map_index")
+
+    def __init__(self, state: dict, revision):
+        self.state = state
+        self.revision = revision  # store revision this copy matches
+        self.dirty_since = None   # monotonic time of first unflushed save
+        self.pending_events = 0   # events logged since the stored snapshot
+        self.map_index = None     # MapIndex of state's placed rooms, built on use
 
-def _ensure_history_dir():
-    """Ensure the history directory exists."""
-    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
 
+# Session cache: session_id -> _CachedSession, least recently used first
+_session_cache: "OrderedDict[str, _CachedSession]" = OrderedDict()
 
-def _get_history_path(session_id: str) -> Path:
-    """Get the full path for a session's history file."""
-    return HISTORY_DIR / f"{session_id}.json"
+# Guards _session_cache and _store. Never wait for a session lock while
+# holding it.
+_cache_lock = threading.RLock()
+
+# Per-session locks, alive while anyone holds or waits for them
+_session_locks: "weakref.WeakValueDictionary[str, threading.RLock]" = weakref.WeakValueDictionary()
+
+# Active storage backend, created on first use
+_store: SessionStore | None = None
+
+
+def get_store() -> SessionStore:
+    """Get the active session store, creating it from the settings above."""
+    global _store
+    with _cache_lock:
+        if _store is None:
+            _store = create_store(SESSION_STORE, HISTORY_DIR, SESSION_CODEC)
+        return _store
+
+
+def set_store(store: SessionStore | None) -> None:
+    """
+    Switch the session store.
+
+    Flushes and forgets every cached session first. Passing None makes the
+    next call create a store from the module settings again.
+    """
+    global _store
+    flush_sessions()
+    with _cache_lock:
+        _session_cache.clear()
+        if _store is not None:
+            _store.close()
+        _store = store
+
+
+def _session_lock(session_id: str) -> threading.RLock:
+    """Get the in-process lock for a session."""
+    with _cache_lock:
+        lock = _session_locks.get(session_id)
+        if lock is None:
+            lock = threading.RLock()
+            _session_locks[session_id] = lock
+        return lock
 
 
 def generate_session_id() -> str:
@@ -47,10 +166,14 @@ def create_history_file(session_id: str, initial_state: dict) -> str:
     Raises:
         FileExistsError: If session already exists
     """
-    _ensure_history_dir()
-    path = _get_history_path(session_id)
+    with _session_lock(session_id):
+        return _create_history_file(session_id, initial_state)
 
-    if path.exists():
+
+def _create_history_file(session_id: str, initial_state: dict) -> str:
+    store = get_store()
+
+    if session_exists(session_id):
         raise FileExistsError(f"Session {session_id} already exists")
 
     # Add metadata
@@ -61,11 +184,22 @@ def create_history_file(session_id: str, initial_state: dict) -> str:
             "lastUpdated": datetime.utcnow().isoformat() + "Z",
             "gamePhase": "exploration",
             "hauntNumber": None,
+            "version": 0,
         },
         **initial_state,
+        "actionLogOffset": 0,
+        "actionCounts": {},
     }
+    initial_actions = state.pop("actionLog", None) or []
+    for action in initial_actions:
+        action.setdefault("timestamp", state["meta"]["createdAt"])
+
+    store.create(session_id, state)
+    if initial_actions:
+        _append_actions(session_id, state, initial_actions)
+        store.write(session_id, state)
 
-    _atomic_write(path, state)
+    _cache_session(session_id, _CachedSession(state, store.revision(session_id)))
     return session_id
 
 
@@ -77,21 +211,82 @@ def load_history_file(session_id: str) -> dict | None:
         session_id: The session ID to load
 
     Returns:
-        The game state dictionary, or None if not found
+        The game state dictionary, or None if not found.
+        The dict is shared with the session cache: only modify it inside
+        a session_transaction or when saving it afterwards.
     """
-    path = _get_history_path(session_id)
-
-    if not path.exists():
+    with _session_lock(session_id):
+        return _load_history_file(session_id)
+
+
+def _load_history_file(session_id: str) -> dict | None:
+    store = get_store()
+    with _cache_lock:
+        entry = _session_cache.get(session_id)
+
+    if entry is not None:
+        if entry.dirty_since is None:
+            # Clean copy: reuse it unless the store was written behind our back
+            revision = store.revision(session_id)
+            if revision is None or revision != entry.revision:
+                entry = None
+        with _cache_lock:
+            if entry is not None:
+                _session_cache.move_to_end(session_id)
+                return entry.state
+            _session_cache.pop(session_id, None)
+
+    revision = store.revision(session_id)
+    state = store.read(session_id)
+    if state is None:
         return None
 
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    entry = _CachedSession(state, revision)
+    _cache_session(session_id, entry)
+
+    if isinstance(state.get("actionLog"), list):
+        _migrate_action_log(session_id, entry)
+    else:
+        _replay_events(session_id, entry)
+
+    return state
+
+
+def get_map_index(state: dict) -> MapIndex:
+    """
+    Get the placed room index of a session state.
+
+    The index of a cached session is built on first use and kept with the
+    cached copy, catching up with rooms revealed since; it goes away with
+    the copy. Other states get a new index.
+
+    Args:
+        state: A session state, usually from load_history_file()
+
+    Returns:
+        MapIndex over state["map"]["placedRooms"]
+    """
+    rooms = state.get("map", {}).get("placedRooms")
+    if rooms is None:
+        return MapIndex([])
+
+    session_id = state.get("meta", {}).get("sessionId")
+    with _cache_lock:
+        entry = _session_cache.get(session_id)
+        if entry is None or entry.state is not state:
+            return MapIndex(rooms)
+        if entry.map_index is None or entry.map_index.rooms is not rooms:
+            entry.map_index = MapIndex(rooms)
+        return entry.map_index
 
 
 def save_history_file(session_id: str, state: dict) -> bool:
     """
     Save game state to history file.
 
+    The state is stored in the session cache right away and written to
+    disk by flush_sessions() (immediately if SESSION_FLUSH_INTERVAL is 0).
+
     Args:
         session_id: The session ID
         state: The game state to save
@@ -99,17 +294,28 @@ def save_history_file(session_id: str, state: dict) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    path = _get_history_path(session_id)
+    with _session_lock(session_id):
+        if not session_exists(session_id):
+            return False
+
+        _check_version(session_id, state)
+        _bump_version(state)
 
-    if not path.exists():
-        return False
+        # Update lastUpdated timestamp
+        if "meta" in state:
+            state["meta"]["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
 
-    # Update lastUpdated timestamp
-    if "meta" in state:
-        state["meta"]["lastUpdated"] = datetime.utcnow().isoformat() + "Z"
+        with _cache_lock:
+            entry = _session_cache.get(session_id)
+            if entry is not None:
+                entry.state = state
+                _session_cache.move_to_end(session_id)
+        if entry is None:
+            entry = _CachedSession(state, None)
+            _cache_session(session_id, entry)
 
-    _atomic_write(path, state)
-    return True
+        _mark_dirty(session_id, entry)
+        return True
 
 
 def delete_history_file(session_id: str) -> bool:
@@ -122,75 +328,164 @@ def delete_history_file(session_id: str) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    path = _get_history_path(session_id)
+    store = get_store()
+    with _session_lock(session_id), store.lock(session_id):
+        _evict_session(session_id)
+        return store.delete(session_id)
+
+
+def list_sessions(
+    phase: str | None = None,
+    sort_by: str = "lastUpdated",
+    descending: bool = True,
+    offset: int = 0,
+    limit: int | None = None,
+) -> list[dict]:
+    """
+    List game sessions from the session index.
+
+    Args:
+        phase: Only include sessions in this game phase
+        sort_by: sessionId, createdAt, lastUpdated, gamePhase or playerCount
+        descending: Sort in descending order
+        offset: Number of sessions to skip
+        limit: Maximum number of sessions to return (None = all)
+
+    Returns:
+        List of session info dictionaries with sessionId, createdAt,
+        lastUpdated, gamePhase and playerCount
+    """
+    # Unflushed sessions are newer in memory than in the index
+    flush_sessions()
+    return get_store().list_sessions(phase, sort_by, descending, offset, limit)
 
-    if not path.exists():
-        return False
 
-    path.unlink()
-    return True
+def count_sessions(phase: str | None = None) -> int:
+    """Count game sessions, optionally only those in a game phase."""
+    flush_sessions()
+    return get_store().count_sessions(phase)
 
 
-def list_sessions() -> list[dict]:
+def rebuild_session_index() -> int:
     """
-    List all available game sessions.
+    Rebuild the session index from the stored sessions.
+
+    Use this to recover when the index has drifted, e.g. after session
+    files were copied in or removed by hand.
 
     Returns:
-        List of session info dictionaries with id, createdAt, gamePhase
+        Number of sessions indexed
     """
-    _ensure_history_dir()
-    sessions = []
-
-    for file_path in HISTORY_DIR.glob("*.json"):
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                meta = data.get("meta", {})
-                sessions.append({
-                    "sessionId": meta.get("sessionId", file_path.stem),
-                    "createdAt": meta.get("createdAt"),
-                    "lastUpdated": meta.get("lastUpdated"),
-                    "gamePhase": meta.get("gamePhase"),
-                    "playerCount": len(data.get("players", [])),
-                })
-        except (json.JSONDecodeError, IOError):
-            continue
-
-    # Sort by lastUpdated descending
-    sessions.sort(key=lambda x: x.get("lastUpdated", ""), reverse=True)
-    return sessions
+    flush_sessions()
+    return get_store().rebuild_index()
 
 
 def session_exists(session_id: str) -> bool:
     """Check if a session exists."""
-    return _get_history_path(session_id).exists()
+    with _cache_lock:
+        if session_id in _session_cache:
+            return True
+    return get_store().exists(session_id)
 
 
-def _atomic_write(path: Path, data: dict):
+def flush_sessions(force: bool = True) -> int:
     """
-    Write data to file atomically using temp file + rename.
+    Write modified in-memory sessions to disk.
 
-    This ensures data integrity even if the process crashes mid-write.
+    Args:
+        force: Flush every dirty session. When False, only sessions that
+            have been dirty for at least SESSION_FLUSH_INTERVAL are written.
+
+    Returns:
+        Number of sessions written
     """
-    # Write to temp file in same directory
-    fd, temp_path = tempfile.mkstemp(
-        dir=path.parent,
-        prefix=".tmp_",
-        suffix=".json"
-    )
+    now = time.monotonic()
+    flushed = 0
+
+    with _cache_lock:
+        candidates = [
+            (session_id, entry)
+            for session_id, entry in _session_cache.items()
+            if entry.dirty_since is not None
+        ]
+
+    for session_id, entry in candidates:
+        with _session_lock(session_id):
+            # Check again now that no transaction can be using the session
+            if entry.dirty_since is None:
+                continue
+            if not force and now - entry.dirty_since < SESSION_FLUSH_INTERVAL:
+                continue
+            _flush_session(session_id, entry)
+            flushed += 1
+
+    return flushed
+
+
+def _mark_dirty(session_id: str, entry: _CachedSession) -> None:
+    """Record an unflushed change, writing it at once without write-behind."""
+    if entry.dirty_since is None:
+        entry.dirty_since = time.monotonic()
+
+    if SESSION_FLUSH_INTERVAL <= 0:
+        _flush_session(session_id, entry)
+
+
+def _flush_session(session_id: str, entry: _CachedSession) -> None:
+    """Write one cached session to the store. Hold the session's lock."""
+    store = get_store()
+    store.write(session_id, entry.state)
+    entry.revision = store.revision(session_id)
+    entry.dirty_since = None
+    entry.pending_events = 0
+
+
+def _cache_session(session_id: str, entry: _CachedSession) -> None:
+    """Insert a session into the cache, evicting least recently used ones."""
+    evicted = []
+
+    with _cache_lock:
+        _session_cache[session_id] = entry
+        _session_cache.move_to_end(session_id)
+
+        # Sessions that are busy in another thread stay cached for now
+        excess = len(_session_cache) - max(SESSION_CACHE_SIZE, 1)
+        for old_id in list(_session_cache)[:-1]:
+            if excess <= 0:
+                break
+            lock = _session_lock(old_id)
+            if lock.acquire(blocking=False):
+                evicted.append((old_id, _session_cache.pop(old_id), lock))
+                excess -= 1
+
+    for old_id, old_entry, lock in evicted:
+        try:
+            if old_entry.dirty_since is not None:
+                _flush_session(old_id, old_entry)
+        finally:
+            lock.release()
+
+
+def _evict_session(session_id: str) -> None:
+    """Drop a session from the cache without writing it."""
+    with _cache_lock:
+        _session_cache.pop(session_id, None)
+
+
+def _rollback_session(session_id: str, entry: _CachedSession | None, backup: dict | None) -> None:
+    """
+    Undo a failed transaction's changes to the cached copy.
 
-    try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    A copy with unflushed changes is put back to its state from before the
+    transaction; a clean copy is dropped, the next load reads it again.
+    """
+    if backup is None:
+        _evict_session(session_id)
+        return
 
-        # Atomic rename (works on same filesystem)
-        temp_path_obj = Path(temp_path)
-        temp_path_obj.replace(path)
-    except Exception:
-        # Clean up temp file on error
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
-        raise
+    with _cache_lock:
+        entry.state = backup
+        entry.map_index = None
 
 
 def add_action_to_log(session_id: str, action: dict) -> bool:
@@ -204,39 +499,262 @@ def add_action_to_log(session_id: str, action: dict) -> bool:
     Returns:
         True if successful
     """
-    state = load_history_file(session_id)
-    if state is None:
-        return False
-
-    if "actionLog" not in state:
-        state["actionLog"] = []
-
-    # Add timestamp if not present
-    if "timestamp" not in action:
-        action["timestamp"] = datetime.utcnow().isoformat() + "Z"
-
-    state["actionLog"].append(action)
-    return save_history_file(session_id, state)
-
-
-def get_action_log(session_id: str, last_n: int = None) -> list[dict]:
+    with session_transaction(session_id) as txn:
+        if txn.state is None:
+            return False
+        txn.log(action)
+    return txn.committed
+
+
+def get_action_log(
+    session_id: str,
+    last_n: int = None,
+    action_type: str = None,
+) -> list[dict]:
     """
     Get the action log for a session.
 
     Args:
         session_id: The session ID
         last_n: Optional limit to last N actions
+        action_type: Optional filter on the entries' "action" field
 
     Returns:
         List of actions, or empty list if session not found
     """
+    if last_n is None:
+        log = list(iter_actions_reversed(session_id, action_type))
+    else:
+        log = []
+        for action in iter_actions_reversed(session_id, action_type):
+            if len(log) >= last_n:
+                break
+            log.append(action)
+
+    log.reverse()
+    return log
+
+
+def iter_actions_reversed(session_id: str, action_type: str = None):
+    """
+    Iterate over a session's action log from the newest entry backwards.
+
+    Only the tail of the log that is actually consumed gets read, so
+    looking up recent actions costs the same regardless of log length.
+
+    Args:
+        session_id: The session ID
+        action_type: Optional filter on the entries' "action" field
+
+    Yields:
+        Action dictionaries, newest first
+    """
     state = load_history_file(session_id)
     if state is None:
-        return []
+        return
 
-    log = state.get("actionLog", [])
+    yield from get_store().iter_actions_reversed(
+        session_id,
+        state.get("actionLogOffset", 0),
+        action_type,
+    )
 
-    if last_n is not None:
-        return log[-last_n:]
 
-    return log
+def count_actions(session_id: str, action_type: str) -> int:
+    """Get how many entries of an action type the session's log holds."""
+    state = load_history_file(session_id)
+    if state is None:
+        return 0
+    return state.get("actionCounts", {}).get(action_type, 0)
+
+
+def _append_actions(session_id: str, state: dict, actions: list[dict]) -> None:
+    """Append entries to the action log and update the per-action counts."""
+    counts = state.setdefault("actionCounts", {})
+    for action in actions:
+        action_type = action.get("action")
+        counts[action_type] = counts.get(action_type, 0) + 1
+
+    _bump_version(state, len(actions))
+    get_store().append_actions(session_id, state, actions)
+
+
+def _bump_version(state: dict, count: int = 1) -> None:
+    """Advance meta.version by the number of changes made."""
+    meta = state.get("meta")
+    if meta is not None:
+        meta["version"] = meta.get("version", 0) + count
+
+
+def _check_version(session_id: str, state: dict) -> None:
+    """
+    Compare the session against the expected version of this context.
+
+    The expectation only applies to the first write of a tool call and is
+    cleared once it has been checked.
+
+    Raises:
+        SessionConflictError: If the session is at a different version
+    """
+    expected = expected_version.get()
+    if expected is None:
+        return
+
+    expected_version.set(None)
+    current = state.get("meta", {}).get("version", 0)
+    if current != expected:
+        raise SessionConflictError(session_id, expected, current)
+
+
+def _replay_events(session_id: str, entry: _CachedSession) -> None:
+    """Apply the events logged after a freshly loaded snapshot."""
+    state = entry.state
+    counts = state.setdefault("actionCounts", {})
+
+    for offset, action in get_store().iter_actions(session_id, state.get("actionLogOffset", 0)):
+        # Entries that are not events were saved with a later snapshot that
+        # never made it to disk; they can only be counted, not re-applied
+        apply_event(state, action)
+        action_type = action.get("action")
+        counts[action_type] = counts.get(action_type, 0) + 1
+        state["actionLogOffset"] = offset
+        _bump_version(state)
+        if "meta" in state and action.get("timestamp"):
+            state["meta"]["lastUpdated"] = action["timestamp"]
+        entry.pending_events += 1
+
+
+def _migrate_action_log(session_id: str, entry: _CachedSession) -> None:
+    """Move an embedded ``actionLog`` list of an older snapshot to the action log."""
+    state = entry.state
+    actions = state.pop("actionLog")
+    state["actionLogOffset"] = 0
+    state["actionCounts"] = {}
+    _append_actions(session_id, state, actions)
+    _mark_dirty(session_id, entry)
+
+
+class SessionTransaction:
+    """
+    Unit of work over a single session's state.
+
+    Tools describe changes as events with ``emit()``, which applies the
+    event's reducer to ``state`` right away. State changes that have no
+    event are made in place and marked with ``save()``; ``log()`` queues
+    informational entries. Nothing touches the disk until the surrounding
+    ``session_transaction`` block exits.
+    """
+
+    def __init__(self, session_id: str, state: dict | None):
+        self.session_id = session_id
+        self.state = state
+        self.actions: list[dict] = []
+        self.dirty = False
+        self.committed = False
+
+    def save(self) -> None:
+        """Mark the state as modified so a snapshot is saved on commit."""
+        self.dirty = True
+
+    def log(self, action: dict) -> None:
+        """Queue an action log entry; it is appended on commit."""
+        self._queue(action)
+        self.dirty = True
+
+    def emit(self, event: dict) -> None:
+        """
+        Apply an event to the state and queue it for the action log.
+
+        Raises:
+            ValueError: If the event has no reducer
+        """
+        if not is_replayable(event):
+            raise ValueError(f"Unknown event: {event.get('event')}")
+        apply_event(self.state, event)
+        self._queue(event)
+
+    def _queue(self, action: dict) -> None:
+        if "timestamp" not in action:
+            action["timestamp"] = datetime.utcnow().isoformat() + "Z"
+        self.actions.append(action)
+
+    def commit(self) -> bool:
+        """
+        Append queued actions to the log.
+
+        The state is saved as a snapshot if it changed outside of events,
+        or once SESSION_SNAPSHOT_EVERY events have piled up since the last
+        one; otherwise the appended events are the only write.
+        """
+        if self.state is None or not (self.dirty or self.actions):
+            return False
+
+        with _cache_lock:
+            entry = _session_cache.get(self.session_id)
+        if entry is None or entry.state is not self.state:
+            self.dirty = True
+
+        if self.actions:
+            if "meta" in self.state:
+                # Same value a replay of these actions would set
+                self.state["meta"]["lastUpdated"] = self.actions[-1]["timestamp"]
+            _append_actions(self.session_id, self.state, self.actions)
+            if entry is not None:
+                entry.pending_events += len(self.actions)
+                if entry.dirty_since is None:
+                    entry.revision = get_store().revision(self.session_id)
+            self.actions = []
+
+        if self.dirty or entry.pending_events >= SESSION_SNAPSHOT_EVERY:
+            self.committed = save_history_file(self.session_id, self.state)
+        else:
+            with _cache_lock:
+                if self.session_id in _session_cache:
+                    _session_cache.move_to_end(self.session_id)
+            self.committed = True
+
+        self.dirty = False
+        return self.committed
+
+
+@contextmanager
+def session_transaction(session_id: str):
+    """
+    Load a session once and commit all changes with a single write.
+
+    Usage:
+        with session_transaction(session_id) as txn:
+            if txn.state is None:
+                return {"error": ...}
+            txn.emit({"action": "start_turn", "event": "start_turn", ...})
+
+    Changes are discarded if the block or the commit raises: the possibly
+    half-modified cached copy is dropped so the next load starts again
+    from the stored snapshot and action log. If the copy holds changes not
+    yet flushed to the store, it is copied before the block runs and
+    restored instead.
+    ``txn.state`` is None when the session does not exist.
+
+    The session stays locked in the store for the whole block.
+
+    Raises:
+        SessionConflictError: If ``expected_version`` is set and the
+            session is at a different version
+    """
+    with _session_lock(session_id), get_store().lock(session_id):
+        txn = SessionTransaction(session_id, load_history_file(session_id))
+        if txn.state is not None:
+            _check_version(session_id, txn.state)
+
+        with _cache_lock:
+            entry = _session_cache.get(session_id)
+        backup = None
+        if entry is not None and entry.state is txn.state and entry.dirty_since is not None:
+            backup = copy.deepcopy(txn.state)
+
+        try:
+            yield txn
+            txn.commit()
+        except BaseException:
+            _rollback_session(session_id, entry, backup)
+            raise
@@ -0,0 +1,158 @@
+"""
+Lookup index over the rooms placed on a session's map.
+
+Placed rooms are stored as a list in ``state["map"]["placedRooms"]``.
+MapIndex maps instance IDs and (floor, x, y) cells to those room dicts so
+movement queries do not rescan the list for every door and direction.
+
+It also keeps the exploration frontier: the unexplored doors that lead to
+an empty cell, where the next revealed room can be placed. Placing a room
+adds its own open doors and removes every frontier door leading into its
+cell, including the one it was revealed through. Doors of the new room
+that face an open door of a neighbour are connected when the room is
+revealed (see facing_doors()), so they never reach the frontier.
+
+The index is derived data: it is never written to the session. Rooms are
+only ever appended to the list, so sync() indexes the rooms added since
+the last lookup (and rebuilds if the list shrank). history_manager keeps
+one index per cached session; see history_manager.get_map_index().
+"""
+
+import threading
+from typing import NamedTuple
+
+from .doors import SIDE_BITS, SIDE_OFFSETS, mask_sides, opposite_mask, side_mask
+
+
+def open_door_mask(room: dict) -> int:
+    """Get the door mask of a placed room's doors that are not connected yet."""
+    return side_mask(
+        side
+        for side, door_info in room.get("doors", {}).items()
+        if door_info and door_info.get("kind") == "door" and not door_info.get("connectedTo")
+    )
+
+
+class FrontierDoor(NamedTuple):
+    """An unexplored door of a placed room and the empty cell behind it."""
+
+    room_id: str
+    side: str
+    floor: str
+    x: int
+    y: int
+
+
+class MapIndex:
+    """Instance ID, position and frontier index of one placedRooms list."""
+
+    __slots__ = (
+        "rooms", "by_id", "by_position", "frontier", "_frontier_by_cell",
+        "_indexed", "_lock",
+    )
+
+    def __init__(self, rooms: list[dict]):
+        self.rooms = rooms
+        self.by_id: dict[str, dict] = {}
+        self.by_position: dict[tuple[str, int, int], dict] = {}
+        # (room ID, side) -> FrontierDoor, in the order the doors were placed
+        self.frontier: dict[tuple[str, str], FrontierDoor] = {}
+        # (floor, x, y) -> frontier keys of the doors leading into that cell
+        self._frontier_by_cell: dict[tuple[str, int, int], list[tuple[str, str]]] = {}
+        self._indexed = 0
+        self._lock = threading.Lock()
+        self.sync()
+
+    def sync(self) -> None:
+        """Index the rooms appended to the list since the last sync."""
+        with self._lock:
+            if len(self.rooms) < self._indexed:
+                self.by_id.clear()
+                self.by_position.clear()
+                self.frontier.clear()
+                self._frontier_by_cell.clear()
+                self._indexed = 0
+
+            # First room wins, like a scan of the list would
+            for room in self.rooms[self._indexed:]:
+                self.by_id.setdefault(room.get("instanceId"), room)
+                position = (room.get("floor"), room.get("x"), room.get("y"))
+                self.by_position.setdefault(position, room)
+                self._update_frontier(room, position)
+            self._indexed = len(self.rooms)
+
+    def _update_frontier(self, room: dict, position: tuple[str, int, int]) -> None:
+        """Close the frontier doors into a new room's cell and open its own."""
+        for key in self._frontier_by_cell.pop(position, ()):
+            self.frontier.pop(key, None)
+
+        floor = position[0]
+        x, y = room.get("x", 0), room.get("y", 0)
+        for side, door_info in room.get("doors", {}).items():
+            if not door_info or door_info.get("kind") != "door":
+                continue
+            if door_info.get("connectedTo") or side not in SIDE_OFFSETS:
+                continue
+            dx, dy = SIDE_OFFSETS[side]
+            cell = (floor, x + dx, y + dy)
+            # A room is already there (placed from another side)
+            if cell in self.by_position:
+                continue
+            key = (room.get("instanceId"), side)
+            self.frontier[key] = FrontierDoor(key[0], side, *cell)
+            self._frontier_by_cell.setdefault(cell, []).append(key)
+
+    def room_by_id(self, room_id: str) -> dict | None:
+        """Get a room by its instance ID."""
+        self.sync()
+        return self.by_id.get(room_id)
+
+    def room_at(self, floor: str, x: int, y: int) -> dict | None:
+        """Get the room at a position on a floor."""
+        self.sync()
+        return self.by_position.get((floor, x, y))
+
+    def facing_doors(self, floor: str, x: int, y: int, mask: int) -> list[tuple[str, dict]]:
+        """
+        Get the placed rooms around a cell with an open door facing it.
+
+        Args:
+            floor: Floor of the cell
+            x, y: Position of the cell
+            mask: Door mask (see doors) of the cell's sides to check
+
+        Returns:
+            (side, neighbour room) pairs, for each side in the mask whose
+            neighbour has an unconnected door on the opposite side
+        """
+        self.sync()
+        facing = []
+        for side in mask_sides(mask):
+            dx, dy = SIDE_OFFSETS[side]
+            neighbour = self.by_position.get((floor, x + dx, y + dy))
+            if neighbour is None:
+                continue
+            # Flipping the neighbour's open doors puts them on this cell's sides
+            if SIDE_BITS[side] & opposite_mask(open_door_mask(neighbour)):
+                facing.append((side, neighbour))
+        return facing
+
+    def frontier_door(self, room_id: str, side: str) -> FrontierDoor | None:
+        """Get a room's door on a side if it is on the frontier."""
+        self.sync()
+        return self.frontier.get((room_id, side))
+
+    def frontier_doors(self, room_id: str | None = None) -> list[FrontierDoor]:
+        """Get the frontier doors, of one room or of the whole map."""
+        self.sync()
+        with self._lock:
+            if room_id is None:
+                return list(self.frontier.values())
+            room = self.by_id.get(room_id)
+            if room is None:
+                return []
+            return [
+                self.frontier[(room_id, side)]
+                for side in room.get("doors", {})
+                if (room_id, side) in self.frontier
+            ]
@@ -0,0 +1,136 @@
+"""
+Serialization codecs for session snapshot files.
+
+Every encoded snapshot starts with a one-line format header naming its
+codec, e.g. ``BAHOTH/1 json+gzip``, so files written with any codec can
+be read back without configuration. Files without a header are legacy
+plain JSON snapshots.
+
+Codecs:
+- json: compact JSON (default)
+- debug: pretty-printed JSON, for reading session files by hand
+- json+gzip / json+lzma: compact JSON, compressed
+- pickle: pickle protocol 5 (trusted local files only)
+- marshal: marshal format (trusted local files only, Python-version specific)
+
+Decoding pickle or marshal data can run arbitrary code, so decode() only
+accepts them when the caller names them as its own configured codec; the
+JSON-based codecs are always readable.
+"""
+
+import gzip
+import json
+import lzma
+import marshal
+import pickle
+from typing import Any, Callable, NamedTuple
+
+
+HEADER_PREFIX = b"BAHOTH/1 "
+
+DEFAULT_CODEC = "json"
+
+
+class Codec(NamedTuple):
+    """
+    A named pair of encode/decode functions between values and bytes.
+
+    Unsafe codecs can execute code while decoding untrusted input.
+    """
+
+    name: str
+    encode: Callable[[Any], bytes]
+    decode: Callable[[bytes], Any]
+    unsafe: bool = False
+
+
+def _json_encode(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json_decode(payload: bytes) -> Any:
+    return json.loads(payload)
+
+
+def _debug_encode(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+CODECS: dict[str, Codec] = {
+    "json": Codec("json", _json_encode, _json_decode),
+    "debug": Codec("debug", _debug_encode, _json_decode),
+    "json+gzip": Codec(
+        "json+gzip",
+        lambda data: gzip.compress(_json_encode(data), compresslevel=6, mtime=0),
+        lambda payload: _json_decode(gzip.decompress(payload)),
+    ),
+    "json+lzma": Codec(
+        "json+lzma",
+        lambda data: lzma.compress(_json_encode(data), preset=1),
+        lambda payload: _json_decode(lzma.decompress(payload)),
+    ),
+    "pickle": Codec(
+        "pickle",
+        lambda data: pickle.dumps(data, protocol=5),
+        pickle.loads,
+        unsafe=True,
+    ),
+    "marshal": Codec("marshal", marshal.dumps, marshal.loads, unsafe=True),
+}
+
+
+def get_codec(name: str) -> Codec:
+    """
+    Get a codec by name.
+
+    Args:
+        name: One of the names in CODECS
+
+    Returns:
+        The codec
+
+    Raises:
+        ValueError: If the codec is unknown
+    """
+    codec = CODECS.get(name)
+    if codec is None:
+        raise ValueError(f"Unknown session codec: {name}. Use one of: {', '.join(CODECS)}")
+    return codec
+
+
+def encode(data: Any, codec: str = DEFAULT_CODEC) -> bytes:
+    """Encode a value with a codec, prefixed by the format header."""
+    codec_obj = get_codec(codec)
+    return HEADER_PREFIX + codec_obj.name.encode("ascii") + b"\n" + codec_obj.encode(data)
+
+
+def decode(payload: bytes, allowed_codec: str = DEFAULT_CODEC) -> Any:
+    """
+    Decode bytes written by encode(), or a legacy headerless JSON file.
+
+    Args:
+        payload: The encoded bytes
+        allowed_codec: The configured codec. Payloads of an unsafe codec
+            (pickle, marshal) are only decoded if it is this one.
+
+    Raises:
+        ValueError: If the header is malformed, names an unsafe codec other
+            than allowed_codec, or the payload is corrupt
+    """
+    if not payload.startswith(HEADER_PREFIX):
+        return _json_decode(payload)
+
+    end = payload.find(b"\n")
+    if end < 0:
+        raise ValueError("Session file header is not terminated")
+
+    name = payload[len(HEADER_PREFIX):end].decode("ascii", errors="replace").strip()
+    codec = get_codec(name)
+    if codec.unsafe and name != allowed_codec:
+        raise ValueError(
+            f"Refusing to decode {name} session data: only {allowed_codec} is configured"
+        )
+    try:
+        return codec.decode(payload[end + 1:])
+    except Exception as e:
+        raise ValueError(f"Corrupt {name} session data: {e}") from e
@@ -0,0 +1,933 @@
+"""
+Storage backends for game session state.
+
+history_manager keeps sessions in memory and delegates persistence to a
+SessionStore. Two backends are available:
+
+- JsonFileStore: one <session_id>.json snapshot plus an append-only
+  <session_id>.actions.jsonl action log per session (the default)
+- SQLiteStore: a single sessions.db in WAL mode with indexed tables for
+  sessions, players, placed rooms, pending rolls and the action log
+
+Select the backend with the BAHOTH_SESSION_STORE environment variable
+("json" or "sqlite"). JsonFileStore snapshots are encoded with a
+session_codec codec, chosen with BAHOTH_SESSION_CODEC.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: sessions are only locked within the process
+    fcntl = None
+
+from .session_codec import DEFAULT_CODEC, decode, encode, get_codec
+
+
+class SessionStore:
+    """
+    Persistence interface for session snapshots and action logs.
+
+    Snapshots are plain state dicts. Every snapshot carries an
+    ``actionLogOffset`` that marks how much of the action log belongs to
+    it; the meaning of the offset is private to each store.
+    """
+
+    # Directory for the per-session advisory lock files
+    lock_dir: Path
+
+    def lock(self, session_id: str):
+        """
+        Hold an exclusive advisory lock on a session.
+
+        Serializes read-modify-write cycles across processes sharing the
+        store. Re-entrant within a thread.
+        """
+        return _file_lock(self.lock_dir / f"{session_id}.lock")
+
+    def create(self, session_id: str, state: dict) -> None:
+        """Persist a new session. Raises FileExistsError if it exists."""
+        raise NotImplementedError
+
+    def read(self, session_id: str) -> dict | None:
+        """Load a session snapshot, or None if not found."""
+        raise NotImplementedError
+
+    def write(self, session_id: str, state: dict) -> None:
+        """Replace a session snapshot."""
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> bool:
+        """Delete a session and its action log. Returns False if not found."""
+        raise NotImplementedError
+
+    def exists(self, session_id: str) -> bool:
+        """Check if a session exists."""
+        raise NotImplementedError
+
+    def revision(self, session_id: str):
+        """
+        Get a cheap token that changes whenever the snapshot is written or
+        actions are appended.
+
+        Used to tell whether an in-memory copy is still current.
+        Returns None if the session does not exist.
+        """
+        raise NotImplementedError
+
+    def list_sessions(
+        self,
+        phase: str | None = None,
+        sort_by: str = "lastUpdated",
+        descending: bool = True,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """
+        List session summaries from the session index.
+
+        Each summary has sessionId, createdAt, lastUpdated, gamePhase and
+        playerCount. ``sort_by`` is one of the summary keys.
+        """
+        raise NotImplementedError
+
+    def count_sessions(self, phase: str | None = None) -> int:
+        """Count sessions, optionally only those in a game phase."""
+        raise NotImplementedError
+
+    def rebuild_index(self) -> int:
+        """Rebuild the session index from the stored sessions. Returns the count."""
+        raise NotImplementedError
+
+    def append_actions(self, session_id: str, state: dict, actions: list[dict]) -> None:
+        """
+        Append entries to the action log and advance state["actionLogOffset"].
+
+        Loaded states have replayed the whole log, so anything past the
+        state's offset is a partially written entry and is discarded first.
+        Also refreshes the session's summary in the session index.
+        """
+        raise NotImplementedError
+
+    def iter_actions(self, session_id: str, start_offset: int) -> Iterator[tuple[int, dict]]:
+        """
+        Yield action log entries after ``start_offset``, oldest first.
+
+        Each entry comes with the offset just past it, i.e. the offset a
+        snapshot including that entry would record.
+        """
+        raise NotImplementedError
+
+    def iter_actions_reversed(
+        self,
+        session_id: str,
+        end_offset: int,
+        action_type: str | None = None,
+    ) -> Iterator[dict]:
+        """Yield action log entries up to ``end_offset``, newest first."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class JsonFileStore(SessionStore):
+    """
+    Stores each session as a JSON snapshot plus a JSONL action log.
+
+    Summaries for list_sessions() come from a SessionIndex kept in
+    session_index.db, so listing does not open every snapshot.
+    """
+
+    def __init__(self, directory: Path, codec: str = DEFAULT_CODEC):
+        self.directory = Path(directory)
+        self.lock_dir = self.directory / ".locks"
+        self.codec = get_codec(codec).name
+        self._index: SessionIndex | None = None
+
+    @property
+    def index(self) -> "SessionIndex":
+        """The session index, created (and filled from the files) on first use."""
+        if self._index is None:
+            self._ensure_dir()
+            path = self.directory / "session_index.db"
+            is_new = not path.exists()
+            self._index = SessionIndex(path)
+            if is_new:
+                self.rebuild_index()
+        return self._index
+
+    def _ensure_dir(self) -> None:
+        """Ensure the history directory exists."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def snapshot_path(self, session_id: str) -> Path:
+        """Get the full path for a session's history file."""
+        return self.directory / f"{session_id}.json"
+
+    def action_log_path(self, session_id: str) -> Path:
+        """Get the full path for a session's action log file."""
+        return self.directory / f"{session_id}.actions.jsonl"
+
+    def create(self, session_id: str, state: dict) -> None:
+        self._ensure_dir()
+        path = self.snapshot_path(session_id)
+
+        if path.exists():
+            raise FileExistsError(f"Session {session_id} already exists")
+
+        # Start with an empty action log (a leftover one would be misattributed)
+        self.action_log_path(session_id).write_bytes(b"")
+        self.write(session_id, state)
+
+    def read(self, session_id: str) -> dict | None:
+        path = self.snapshot_path(session_id)
+
+        if not path.exists():
+            return None
+
+        return decode(path.read_bytes(), self.codec)
+
+    def write(self, session_id: str, state: dict) -> None:
+        self._ensure_dir()
+        _atomic_write(self.snapshot_path(session_id), encode(state, self.codec))
+        self.index.upsert(session_summary(state, session_id))
+
+    def delete(self, session_id: str) -> bool:
+        path = self.snapshot_path(session_id)
+        self.index.remove(session_id)
+
+        if not path.exists():
+            return False
+
+        path.unlink()
+        self.action_log_path(session_id).unlink(missing_ok=True)
+        (self.lock_dir / f"{session_id}.lock").unlink(missing_ok=True)
+        return True
+
+    def exists(self, session_id: str) -> bool:
+        return self.snapshot_path(session_id).exists()
+
+    def revision(self, session_id: str) -> tuple[int, int] | None:
+        try:
+            snapshot_mtime = self.snapshot_path(session_id).stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        try:
+            log_size = self.action_log_path(session_id).stat().st_size
+        except FileNotFoundError:
+            log_size = 0
+        return snapshot_mtime, log_size
+
+    def list_sessions(
+        self,
+        phase: str | None = None,
+        sort_by: str = "lastUpdated",
+        descending: bool = True,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> list[dict]:
+        return self.index.query(phase, sort_by, descending, offset, limit)
+
+    def count_sessions(self, phase: str | None = None) -> int:
+        return self.index.count(phase)
+
+    def rebuild_index(self) -> int:
+        self._ensure_dir()
+        summaries = []
+
+        for file_path in self.directory.glob("*.json"):
+            if file_path.name.startswith("."):
+                continue  # leftover temp file of an interrupted write
+            try:
+                data = decode(file_path.read_bytes(), self.codec)
+                summaries.append(session_summary(data, file_path.stem))
+            except (ValueError, IOError):
+                continue
+
+        self.index.replace_all(summaries)
+        return len(summaries)
+
+    def close(self) -> None:
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    def append_actions(self, session_id: str, state: dict, actions: list[dict]) -> None:
+        # The offset is the byte length of the log belonging to the snapshot
+        self._ensure_dir()
+        offset = state.get("actionLogOffset", 0)
+
+        data = bytearray()
+        for action in actions:
+            line = json.dumps(action, ensure_ascii=False, separators=(",", ":"))
+            data += line.encode("utf-8") + b"\n"
+
+        with open(self.action_log_path(session_id), "ab") as f:
+            if f.tell() > offset:
+                f.truncate(offset)
+                f.seek(offset)
+            f.write(data)
+            f.flush()
+            state["actionLogOffset"] = f.tell()
+
+        self.index.upsert(session_summary(state, session_id))
+
+    def iter_actions(self, session_id: str, start_offset: int) -> Iterator[tuple[int, dict]]:
+        path = self.action_log_path(session_id)
+        if not path.exists():
+            return
+
+        with open(path, "rb") as f:
+            f.seek(start_offset)
+            data = f.read()
+
+        offset = start_offset
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # partially written entry
+            offset += len(line)
+            if line.strip():
+                yield offset, json.loads(line)
+
+    def iter_actions_reversed(
+        self,
+        session_id: str,
+        end_offset: int,
+        action_type: str | None = None,
+    ) -> Iterator[dict]:
+        path = self.action_log_path(session_id)
+        if end_offset <= 0 or not path.exists():
+            return
+
+        for line in _read_lines_reversed(path, end_offset):
+            action = json.loads(line)
+            if action_type is None or action.get("action") == action_type:
+                yield action
+
+
+class SQLiteStore(SessionStore):
+    """
+    Stores sessions in a SQLite database (WAL mode).
+
+    The bulky, frequently queried parts of the state get their own tables;
+    the rest of the snapshot is kept as a JSON document in ``sessions``.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id   TEXT PRIMARY KEY,
+            created_at   TEXT,
+            last_updated TEXT,
+            game_phase   TEXT,
+            player_count INTEGER NOT NULL DEFAULT 0,
+            revision     INTEGER NOT NULL DEFAULT 0,
+            state        TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_last_updated
+            ON sessions (last_updated);
+        CREATE INDEX IF NOT EXISTS idx_sessions_phase
+            ON sessions (game_phase, last_updated);
+
+        CREATE TABLE IF NOT EXISTS players (
+            session_id TEXT NOT NULL,
+            player_id  TEXT NOT NULL,
+            position   INTEGER NOT NULL,
+            is_ai      INTEGER NOT NULL DEFAULT 0,
+            data       TEXT NOT NULL,
+            PRIMARY KEY (session_id, player_id)
+        );
+
+        CREATE TABLE IF NOT EXISTS placed_rooms (
+            session_id  TEXT NOT NULL,
+            instance_id TEXT NOT NULL,
+            position    INTEGER NOT NULL,
+            floor       TEXT,
+            x           INTEGER,
+            y           INTEGER,
+            data        TEXT NOT NULL,
+            PRIMARY KEY (session_id, instance_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_placed_rooms_cell
+            ON placed_rooms (session_id, floor, x, y);
+
+        CREATE TABLE IF NOT EXISTS pending_rolls (
+            session_id TEXT NOT NULL,
+            roll_id    TEXT NOT NULL,
+            position   INTEGER NOT NULL,
+            data       TEXT NOT NULL,
+            PRIMARY KEY (session_id, roll_id)
+        );
+
+        CREATE TABLE IF NOT EXISTS action_log (
+            session_id TEXT NOT NULL,
+            seq        INTEGER NOT NULL,
+            turn       INTEGER,
+            player_id  TEXT,
+            action     TEXT,
+            timestamp  TEXT,
+            data       TEXT NOT NULL,
+            PRIMARY KEY (session_id, seq)
+        );
+        CREATE INDEX IF NOT EXISTS idx_action_log_action
+            ON action_log (session_id, action, seq);
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock_dir = self.path.parent / ".locks"
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            self.path,
+            isolation_level=None,  # explicit BEGIN/COMMIT below
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def _transaction(self):
+        """Run a block inside BEGIN IMMEDIATE ... COMMIT."""
+        return _SQLiteTransaction(self._conn, self._lock)
+
+    def create(self, session_id: str, state: dict) -> None:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is not None:
+                raise FileExistsError(f"Session {session_id} already exists")
+            conn.execute("DELETE FROM action_log WHERE session_id = ?", (session_id,))
+            self._write_rows(conn, session_id, state)
+
+    def read(self, session_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            state = json.loads(row[0])
+            state["players"] = self._load_children(
+                "SELECT data FROM players WHERE session_id = ? ORDER BY position",
+                session_id,
+            )
+            if isinstance(state.get("map"), dict):
+                state["map"]["placedRooms"] = self._load_children(
+                    "SELECT data FROM placed_rooms WHERE session_id = ? ORDER BY position",
+                    session_id,
+                )
+            if isinstance(state.get("turnState"), dict):
+                state["turnState"]["pendingRolls"] = self._load_children(
+                    "SELECT data FROM pending_rolls WHERE session_id = ? ORDER BY position",
+                    session_id,
+                )
+            return state
+
+    def write(self, session_id: str, state: dict) -> None:
+        with self._transaction() as conn:
+            self._write_rows(conn, session_id, state)
+
+    def delete(self, session_id: str) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            for table in ("players", "placed_rooms", "pending_rolls", "action_log"):
+                conn.execute(f"DELETE FROM {table} WHERE session_id = ?", (session_id,))
+        (self.lock_dir / f"{session_id}.lock").unlink(missing_ok=True)
+        return cursor.rowcount > 0
+
+    def exists(self, session_id: str) -> bool:
+        return self.revision(session_id) is not None
+
+    def revision(self, session_id: str) -> int | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT revision FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def list_sessions(
+        self,
+        phase: str | None = None,
+        sort_by: str = "lastUpdated",
+        descending: bool = True,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> list[dict]:
+        # The sessions table doubles as the session index
+        with self._lock:
+            return _query_summaries(
+                self._conn, "sessions", phase, sort_by, descending, offset, limit
+            )
+
+    def count_sessions(self, phase: str | None = None) -> int:
+        with self._lock:
+            return _count_summaries(self._conn, "sessions", phase)
+
+    def rebuild_index(self) -> int:
+        # Recompute the summary columns from the stored documents
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT session_id, state FROM sessions").fetchall()
+            for session_id, document in rows:
+                meta = json.loads(document).get("meta", {})
+                player_count = conn.execute(
+                    "SELECT COUNT(*) FROM players WHERE session_id = ?", (session_id,)
+                ).fetchone()[0]
+                conn.execute(
+                    "UPDATE sessions SET created_at = ?, last_updated = ?, "
+                    "game_phase = ?, player_count = ? WHERE session_id = ?",
+                    (
+                        meta.get("createdAt"),
+                        meta.get("lastUpdated"),
+                        meta.get("gamePhase"),
+                        player_count,
+                        session_id,
+                    ),
+                )
+        return len(rows)
+
+    def append_actions(self, session_id: str, state: dict, actions: list[dict]) -> None:
+        # The offset is the seq of the last log row belonging to the snapshot
+        offset = state.get("actionLogOffset", 0)
+        rows = []
+        for i, action in enumerate(actions, start=offset + 1):
+            rows.append((
+                session_id,
+                i,
+                action.get("turn"),
+                action.get("playerId"),
+                action.get("action"),
+                action.get("timestamp"),
+                json.dumps(action, ensure_ascii=False, separators=(",", ":")),
+            ))
+
+        summary = session_summary(state, session_id)
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM action_log WHERE session_id = ? AND seq > ?",
+                (session_id, offset),
+            )
+            conn.executemany(
+                "INSERT INTO action_log "
+                "(session_id, seq, turn, player_id, action, timestamp, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "UPDATE sessions SET revision = revision + 1, last_updated = ?, "
+                "game_phase = ?, player_count = ? WHERE session_id = ?",
+                (summary["lastUpdated"], summary["gamePhase"], summary["playerCount"], session_id),
+            )
+        state["actionLogOffset"] = offset + len(actions)
+
+    def iter_actions(self, session_id: str, start_offset: int) -> Iterator[tuple[int, dict]]:
+        query = (
+            "SELECT seq, data FROM action_log WHERE session_id = ? AND seq > ? "
+            "ORDER BY seq LIMIT ?"
+        )
+        page_size = 64
+        while True:
+            with self._lock:
+                rows = self._conn.execute(query, (session_id, start_offset, page_size)).fetchall()
+            for seq, data in rows:
+                yield seq, json.loads(data)
+            if len(rows) < page_size:
+                break
+            start_offset = rows[-1][0]
+
+    def iter_actions_reversed(
+        self,
+        session_id: str,
+        end_offset: int,
+        action_type: str | None = None,
+    ) -> Iterator[dict]:
+        if action_type is None:
+            query = (
+                "SELECT seq, data FROM action_log WHERE session_id = ? AND seq <= ? "
+                "ORDER BY seq DESC LIMIT ?"
+            )
+            params = (session_id,)
+        else:
+            query = (
+                "SELECT seq, data FROM action_log WHERE session_id = ? AND action = ? "
+                "AND seq <= ? ORDER BY seq DESC LIMIT ?"
+            )
+            params = (session_id, action_type)
+
+        # Read in pages (keyset pagination) so callers that stop early only
+        # read what they use, without leaving a cursor open between yields
+        page_size = 64
+        while end_offset > 0:
+            with self._lock:
+                rows = self._conn.execute(query, (*params, end_offset, page_size)).fetchall()
+            for seq, data in rows:
+                yield json.loads(data)
+            if len(rows) < page_size:
+                break
+            end_offset = rows[-1][0] - 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _load_children(self, query: str, session_id: str) -> list[dict]:
+        """Load the JSON ``data`` column of a child table, in order."""
+        return [json.loads(data) for (data,) in self._conn.execute(query, (session_id,))]
+
+    def _write_rows(self, conn: sqlite3.Connection, session_id: str, state: dict) -> None:
+        """Split a snapshot into the session row and its child rows."""
+        players = state.get("players", [])
+        map_data = state.get("map")
+        turn_state = state.get("turnState")
+        rooms = map_data.get("placedRooms", []) if isinstance(map_data, dict) else []
+        rolls = turn_state.get("pendingRolls", []) if isinstance(turn_state, dict) else []
+
+        # Serialize the rest of the document without the child collections
+        document = {k: v for k, v in state.items() if k != "players"}
+        if isinstance(map_data, dict):
+            document["map"] = {k: v for k, v in map_data.items() if k != "placedRooms"}
+        if isinstance(turn_state, dict):
+            document["turnState"] = {k: v for k, v in turn_state.items() if k != "pendingRolls"}
+
+        meta = state.get("meta", {})
+        conn.execute(
+            "INSERT INTO sessions "
+            "(session_id, created_at, last_updated, game_phase, player_count, revision, state) "
+            "VALUES (?, ?, ?, ?, ?, 1, ?) "
+            "ON CONFLICT (session_id) DO UPDATE SET "
+            "created_at = excluded.created_at, last_updated = excluded.last_updated, "
+            "game_phase = excluded.game_phase, player_count = excluded.player_count, "
+            "revision = sessions.revision + 1, state = excluded.state",
+            (
+                session_id,
+                meta.get("createdAt"),
+                meta.get("lastUpdated"),
+                meta.get("gamePhase"),
+                len(players),
+                _dumps(document),
+            ),
+        )
+
+        for table in ("players", "placed_rooms", "pending_rolls"):
+            conn.execute(f"DELETE FROM {table} WHERE session_id = ?", (session_id,))
+
+        conn.executemany(
+            "INSERT INTO players (session_id, player_id, position, is_ai, data) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (session_id, p.get("id", str(i)), i, int(bool(p.get("isAI"))), _dumps(p))
+                for i, p in enumerate(players)
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO placed_rooms (session_id, instance_id, position, floor, x, y, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (session_id, r.get("instanceId", str(i)), i,
+                 r.get("floor"), r.get("x"), r.get("y"), _dumps(r))
+                for i, r in enumerate(rooms)
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO pending_rolls (session_id, roll_id, position, data) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (session_id, r.get("rollId", str(i)), i, _dumps(r))
+                for i, r in enumerate(rolls)
+            ],
+        )
+
+
+class SessionIndex:
+    """
+    Small SQLite table of session summaries for the JSON file store.
+
+    Updated whenever a snapshot is written or deleted; rebuild it with
+    JsonFileStore.rebuild_index() if it drifts from the files on disk.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS session_index (
+            session_id   TEXT PRIMARY KEY,
+            created_at   TEXT,
+            last_updated TEXT,
+            game_phase   TEXT,
+            player_count INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_session_index_last_updated
+            ON session_index (last_updated);
+        CREATE INDEX IF NOT EXISTS idx_session_index_phase
+            ON session_index (game_phase, last_updated);
+    """
+
+    def __init__(self, path: Path):
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def upsert(self, summary: dict) -> None:
+        """Insert or update one session's summary."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO session_index "
+                "(session_id, created_at, last_updated, game_phase, player_count) "
+                "VALUES (?, ?, ?, ?, ?)",
+                _summary_row(summary),
+            )
+
+    def remove(self, session_id: str) -> None:
+        """Remove a session's summary."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM session_index WHERE session_id = ?", (session_id,)
+            )
+
+    def replace_all(self, summaries: list[dict]) -> None:
+        """Replace the whole index with the given summaries."""
+        with _SQLiteTransaction(self._conn, self._lock) as conn:
+            conn.execute("DELETE FROM session_index")
+            conn.executemany(
+                "INSERT OR REPLACE INTO session_index "
+                "(session_id, created_at, last_updated, game_phase, player_count) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [_summary_row(summary) for summary in summaries],
+            )
+
+    def query(
+        self,
+        phase: str | None = None,
+        sort_by: str = "lastUpdated",
+        descending: bool = True,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """Get a sorted, filtered page of summaries."""
+        with self._lock:
+            return _query_summaries(
+                self._conn, "session_index", phase, sort_by, descending, offset, limit
+            )
+
+    def count(self, phase: str | None = None) -> int:
+        """Count indexed sessions, optionally only those in a game phase."""
+        with self._lock:
+            return _count_summaries(self._conn, "session_index", phase)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# Summary keys accepted by list_sessions(sort_by=...) and their columns
+SUMMARY_SORT_COLUMNS = {
+    "sessionId": "session_id",
+    "createdAt": "created_at",
+    "lastUpdated": "last_updated",
+    "gamePhase": "game_phase",
+    "playerCount": "player_count",
+}
+
+
+def _summary_row(summary: dict) -> tuple:
+    """Convert a session summary to a session_index row."""
+    return (
+        summary["sessionId"],
+        summary.get("createdAt"),
+        summary.get("lastUpdated"),
+        summary.get("gamePhase"),
+        summary.get("playerCount", 0),
+    )
+
+
+def _query_summaries(
+    conn: sqlite3.Connection,
+    table: str,
+    phase: str | None,
+    sort_by: str,
+    descending: bool,
+    offset: int,
+    limit: int | None,
+) -> list[dict]:
+    """Select a page of session summaries from a summary table."""
+    column = SUMMARY_SORT_COLUMNS.get(sort_by)
+    if column is None:
+        raise ValueError(
+            f"Cannot sort sessions by {sort_by}. Use one of: {', '.join(SUMMARY_SORT_COLUMNS)}"
+        )
+
+    query = (
+        f"SELECT session_id, created_at, last_updated, game_phase, player_count FROM {table}"
+    )
+    params: list = []
+    if phase is not None:
+        query += " WHERE game_phase = ?"
+        params.append(phase)
+    direction = "DESC" if descending else "ASC"
+    query += f" ORDER BY {column} {direction}, session_id {direction} LIMIT ? OFFSET ?"
+    params += [-1 if limit is None else limit, max(offset, 0)]
+
+    return [
+        {
+            "sessionId": session_id,
+            "createdAt": created_at,
+            "lastUpdated": last_updated,
+            "gamePhase": game_phase,
+            "playerCount": player_count,
+        }
+        for session_id, created_at, last_updated, game_phase, player_count
+        in conn.execute(query, params)
+    ]
+
+
+def _count_summaries(conn: sqlite3.Connection, table: str, phase: str | None) -> int:
+    """Count rows of a summary table, optionally filtered by phase."""
+    if phase is None:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    return conn.execute(
+        f"SELECT COUNT(*) FROM {table} WHERE game_phase = ?", (phase,)
+    ).fetchone()[0]
+
+
+class _SQLiteTransaction:
+    """Context manager for an immediate SQLite write transaction."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.RLock):
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.lock.acquire()
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self.lock.release()
+            raise
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.conn.execute("COMMIT")
+            else:
+                self.conn.execute("ROLLBACK")
+        finally:
+            self.lock.release()
+        return False
+
+
+def create_store(kind: str, directory: Path, codec: str = DEFAULT_CODEC) -> SessionStore:
+    """
+    Create a session store.
+
+    Args:
+        kind: "json" or "sqlite"
+        directory: Directory holding the session files / database
+        codec: Snapshot codec for the JSON file store (see session_codec)
+
+    Returns:
+        The store instance
+    """
+    if kind == "json":
+        return JsonFileStore(directory, codec)
+    if kind == "sqlite":
+        return SQLiteStore(Path(directory) / "sessions.db")
+    raise ValueError(f"Unknown session store: {kind}. Use 'json' or 'sqlite'")
+
+
+def session_summary(state: dict, default_id: str | None = None) -> dict:
+    """Build the list_sessions() entry for a session state."""
+    meta = state.get("meta", {})
+    return {
+        "sessionId": meta.get("sessionId", default_id),
+        "createdAt": meta.get("createdAt"),
+        "lastUpdated": meta.get("lastUpdated"),
+        "gamePhase": meta.get("gamePhase"),
+        "playerCount": len(state.get("players", [])),
+    }
+
+
+# Lock files held by the current thread (makes _file_lock re-entrant)
+_held_locks = threading.local()
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Hold an exclusive fcntl lock on a file, re-entrant within a thread."""
+    held = getattr(_held_locks, "paths", None)
+    if held is None:
+        held = _held_locks.paths = set()
+
+    if fcntl is None or path in held:
+        yield
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        held.add(path)
+        try:
+            yield
+        finally:
+            held.discard(path)
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _dumps(data) -> str:
+    """Serialize a value compactly for storage."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _atomic_write(path: Path, payload: bytes):
+    """
+    Write data to file atomically using temp file + rename.
+
+    This ensures data integrity even if the process crashes mid-write.
+    """
+    # Write to temp file in same directory
+    fd, temp_path = tempfile.mkstemp(
+        dir=path.parent,
+        prefix=".tmp_",
+        suffix=".json"
+    )
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+
+        # Atomic rename (works on same filesystem)
+        temp_path_obj = Path(temp_path)
+        temp_path_obj.replace(path)
+    except Exception:
+        # Clean up temp file on error
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def _read_lines_reversed(path: Path, end: int, block_size: int = 8192):
+    """Yield the non-empty lines of a file before byte ``end``, last first."""
+    with open(path, "rb") as f:
+        pos = end
+        remainder = b""
+        while pos > 0:
+            size = min(block_size, pos)
+            pos -= size
+            f.seek(pos)
+            lines = (f.read(size) + remainder).split(b"\n")
+            # The first piece may be cut off mid-line; finish it next block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line
+        if remainder:
+            yield remainder
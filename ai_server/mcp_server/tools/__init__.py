@@ -2,6 +2,7 @@
 MCP Tools for Betrayal at House on the Hill game data.
 """
 
+from .registry import TOOLS, ToolSpec, tool, dispatch
 from .cards_tools import (
     get_all_items,
     get_item_by_id,
@@ -26,11 +27,13 @@ from .maps_tools import (
 )
 from .rules_tools import (
     translate_term,
+    translate_terms,
     get_trait_translation,
     get_all_translations,
 )
 from .haunt_tools import (
     get_haunt_page,
+    get_haunt_outcomes,
     get_traitor_for_haunt,
     get_all_omens,
 )
@@ -59,6 +62,10 @@ from .movement_tools import (
     calculate_valid_rotations,
     get_door_connections,
     set_pending_room_reveal,
+    get_exploration_frontier,
+    find_path,
+    get_reachable_rooms,
+    move_path,
 )
 from .dice_tools import (
     request_dice_roll,
@@ -89,6 +96,11 @@ from .context_tools import (
 )
 
 __all__ = [
+    # Registry
+    "TOOLS",
+    "ToolSpec",
+    "tool",
+    "dispatch",
     # Cards/Items
     "get_all_items",
     "get_item_by_id",
@@ -110,10 +122,12 @@ __all__ = [
     "get_starting_rooms",
     # Rules/Translation
     "translate_term",
+    "translate_terms",
     "get_trait_translation",
     "get_all_translations",
     # Haunt/Traitor
     "get_haunt_page",
+    "get_haunt_outcomes",
     "get_traitor_for_haunt",
     "get_all_omens",
     # Session Management
@@ -137,6 +151,10 @@ __all__ = [
     "calculate_valid_rotations",
     "get_door_connections",
     "set_pending_room_reveal",
+    "get_exploration_frontier",
+    "find_path",
+    "get_reachable_rooms",
+    "move_path",
     # Dice
     "request_dice_roll",
     "record_dice_result",
@@ -3,9 +3,14 @@ MCP Tools for querying Items/Cards data.
 """
 
 from typing import Any
-from ..data_loader import get_items_data
+from ..data_loader import get_catalog
+from .registry import tool
 
 
+@tool(
+    "Get a list of all items/cards in the game with basic info (id, name, type, usable, consumable).",
+    cacheable=True,
+)
 def get_all_items() -> list[dict]:
     """
     Get a list of all items in the game.
@@ -13,8 +18,7 @@ def get_all_items() -> list[dict]:
     Returns:
         List of all item objects with id, name, type, and basic info.
     """
-    data = get_items_data()
-    items = data.get("ITEMS", [])
+    items = get_catalog().items
     # Return simplified list for overview
     return [
         {
@@ -28,6 +32,18 @@ def get_all_items() -> list[dict]:
     ]
 
 
+@tool(
+    "Get detailed information about a specific item by its unique ID.",
+    properties={
+        "item_id": {
+            "type": "string",
+            "description": "The unique ID of the item (e.g., 'long_vu_thien_than')",
+        },
+    },
+    required=["item_id"],
+    not_found="Item not found",
+    cacheable=True,
+)
 def get_item_by_id(item_id: str) -> dict | None:
     """
     Get detailed information about an item by its ID.
@@ -37,43 +53,48 @@ def get_item_by_id(item_id: str) -> dict | None:
 
     Returns:
         Full item object if found, None otherwise.
+        Events and omens are found too.
     """
-    data = get_items_data()
-    items = data.get("ITEMS", [])
-
-    for item in items:
-        if item.get("id") == item_id:
-            return item
-
-    return None
-
-
+    return get_catalog().cards_by_id.get(item_id)
+
+
+@tool(
+    "Search for items by name (supports Vietnamese, tone marks optional). "
+    "Returns all matching items, best match first.",
+    properties={
+        "name": {
+            "type": "string",
+            "description": "The name or partial name to search (case-insensitive)",
+        },
+    },
+    required=["name"],
+    cacheable=True,
+)
 def get_item_by_name(name: str) -> list[dict]:
     """
     Search for items by name (supports Vietnamese).
 
     Args:
-        name: The name or partial name to search for (case-insensitive).
+        name: The name or partial name to search for (case and diacritic
+            insensitive, small typos tolerated).
 
     Returns:
-        List of matching items.
+        List of matching items, best match first.
     """
-    data = get_items_data()
-    items = data.get("ITEMS", [])
-    name_lower = name.lower()
-
-    results = []
-    for item in items:
-        item_name = item.get("name", {})
-        vi_name = item_name.get("vi", "").lower()
-        en_name = item_name.get("en", "").lower()
-
-        if name_lower in vi_name or name_lower in en_name:
-            results.append(item)
-
-    return results
-
-
+    return get_catalog().item_search.search(name)
+
+
+@tool(
+    "Get all items of a specific type (item, omen, event).",
+    properties={
+        "item_type": {
+            "type": "string",
+            "description": "The type to filter by (e.g., 'item', 'omen', 'event')",
+        },
+    },
+    required=["item_type"],
+    cacheable=True,
+)
 def get_items_by_type(item_type: str) -> list[dict]:
     """
     Get all items of a specific type.
@@ -84,12 +105,10 @@ def get_items_by_type(item_type: str) -> list[dict]:
     Returns:
         List of items matching the specified type.
     """
-    data = get_items_data()
-    items = data.get("ITEMS", [])
-
-    return [item for item in items if item.get("type") == item_type]
+    return list(get_catalog().cards_by_type.get(item_type, ()))
 
 
+@tool("Get all items that can be actively used by players (usable=true).", cacheable=True)
 def get_usable_items() -> list[dict]:
     """
     Get all items that can be actively used by players.
@@ -97,12 +116,20 @@ def get_usable_items() -> list[dict]:
     Returns:
         List of items with usable=True.
     """
-    data = get_items_data()
-    items = data.get("ITEMS", [])
+    items = get_catalog().items
 
     return [item for item in items if item.get("usable", False)]
 
 
+@tool(
+    "Get detailed effect information for a specific item including usage rules and modifiers.",
+    properties={
+        "item_id": {"type": "string", "description": "The unique ID of the item"},
+    },
+    required=["item_id"],
+    not_found="Item not found",
+    cacheable=True,
+)
 def get_item_effect(item_id: str) -> dict | None:
     """
     Get the effect details of a specific item.
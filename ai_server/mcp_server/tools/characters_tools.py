@@ -3,9 +3,11 @@ MCP Tools for querying Characters data.
 """
 
 from typing import Any
-from ..data_loader import get_characters_data
+from ..data_loader import get_catalog
+from .registry import tool
 
 
+@tool("Get a list of all playable characters with id, name (en/vi), and color.", cacheable=True)
 def get_all_characters() -> list[dict]:
     """
     Get a list of all playable characters in the game.
@@ -13,8 +15,7 @@ def get_all_characters() -> list[dict]:
     Returns:
         List of character objects with id, name, and color.
     """
-    data = get_characters_data()
-    characters = data.get("CHARACTERS", [])
+    characters = get_catalog().characters
 
     return [
         {
@@ -26,6 +27,18 @@ def get_all_characters() -> list[dict]:
     ]
 
 
+@tool(
+    "Get full details of a character by ID including traits, bio, and profile.",
+    properties={
+        "character_id": {
+            "type": "string",
+            "description": "The character ID (e.g., 'professor-longfellow')",
+        },
+    },
+    required=["character_id"],
+    not_found="Character not found",
+    cacheable=True,
+)
 def get_character_by_id(character_id: str) -> dict | None:
     """
     Get detailed information about a character by ID.
@@ -36,43 +49,40 @@ def get_character_by_id(character_id: str) -> dict | None:
     Returns:
         Full character object if found, None otherwise.
     """
-    data = get_characters_data()
-    characters = data.get("CHARACTERS", [])
-
-    for char in characters:
-        if char.get("id") == character_id:
-            return char
-
-    return None
+    return get_catalog().characters_by_id.get(character_id)
 
 
+@tool(
+    "Search for characters by name (supports Vietnamese/English/nickname, tone marks optional).",
+    properties={
+        "name": {"type": "string", "description": "The name to search for (case-insensitive)"},
+    },
+    required=["name"],
+    cacheable=True,
+)
 def get_character_by_name(name: str) -> list[dict]:
     """
     Search for characters by name (supports Vietnamese/English).
 
     Args:
-        name: The name or partial name to search for (case-insensitive).
+        name: The name or partial name to search for (case and diacritic
+            insensitive, small typos tolerated).
 
     Returns:
-        List of matching characters.
+        List of matching characters, best match first.
     """
-    data = get_characters_data()
-    characters = data.get("CHARACTERS", [])
-    name_lower = name.lower()
-
-    results = []
-    for char in characters:
-        char_name = char.get("name", {})
-        en_name = char_name.get("en", "").lower()
-        vi_name = char_name.get("vi", "").lower()
-        nickname = char_name.get("nickname", "").lower()
-
-        if name_lower in en_name or name_lower in vi_name or name_lower in nickname:
-            results.append(char)
-
-    return results
-
-
+    return get_catalog().character_search.search(name)
+
+
+@tool(
+    "Get the stat traits (Speed, Might, Knowledge, Sanity) of a character with track values and starting indices.",
+    properties={
+        "character_id": {"type": "string", "description": "The character ID"},
+    },
+    required=["character_id"],
+    not_found="Character not found",
+    cacheable=True,
+)
 def get_character_traits(character_id: str) -> dict | None:
     """
     Get the stat traits of a character (Speed, Might, Knowledge, Sanity).
@@ -111,6 +121,19 @@ def get_character_traits(character_id: str) -> dict | None:
     return result
 
 
+@tool(
+    "Get biographical info (age, height, weight, hobbies, backstory) of a character.",
+    properties={
+        "character_id": {"type": "string", "description": "The character ID"},
+        "lang": {
+            "type": "string",
+            "description": "Language preference: 'vi' or 'en' (default: 'vi')",
+        },
+    },
+    required=["character_id"],
+    not_found="Character not found",
+    cacheable=True,
+)
 def get_character_bio(character_id: str, lang: str = "vi") -> dict | None:
     """
     Get biographical information about a character.
@@ -7,7 +7,8 @@ game context for AI decision-making.
 
 import uuid
 from typing import Any
-from ..history_manager import load_history_file, save_history_file, add_action_to_log
+from ..history_manager import load_history_file, session_transaction
+from .registry import tool
 
 
 def _get_ai_player(state: dict) -> dict | None:
@@ -18,6 +19,19 @@ def _get_ai_player(state: dict) -> dict | None:
     return None
 
 
+@tool(
+    "Request context about another player's turn (AI asks user).",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "player_id": {"type": "string", "description": "Player to ask about"},
+        "questions": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Questions about the player's turn",
+        },
+    },
+    required=["session_id", "player_id", "questions"],
+)
 def request_other_player_context(
     session_id: str,
     player_id: str,
@@ -36,42 +50,45 @@ def request_other_player_context(
     Returns:
         Request ID for tracking the response
     """
-    state = load_history_file(session_id)
-    if state is None:
-        return {"error": f"Session not found: {session_id}"}
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
 
-    # Validate player exists
-    player_exists = any(p.get("id") == player_id for p in state.get("players", []))
-    if not player_exists:
-        return {"error": f"Player not found: {player_id}"}
+        # Validate player exists
+        player_exists = any(p.get("id") == player_id for p in state.get("players", []))
+        if not player_exists:
+            return {"error": f"Player not found: {player_id}"}
 
-    # Get player name
-    player_name = None
-    for p in state.get("players", []):
-        if p.get("id") == player_id:
-            player_name = p.get("name", player_id)
-            break
-
-    # Generate request ID
-    request_id = f"ctx-{str(uuid.uuid4())[:8]}"
-
-    # Create context request
-    context_request = {
-        "requestId": request_id,
-        "playerId": player_id,
-        "playerName": player_name,
-        "questions": questions,
-        "status": "pending",
-        "answers": None,
-        "turn": state.get("turnState", {}).get("currentTurnNumber", 1),
-    }
+        # Get player name
+        player_name = None
+        for p in state.get("players", []):
+            if p.get("id") == player_id:
+                player_name = p.get("name", player_id)
+                break
 
-    # Add to context requests
-    if "contextRequests" not in state:
-        state["contextRequests"] = []
-    state["contextRequests"].append(context_request)
+        # Generate request ID
+        request_id = f"ctx-{str(uuid.uuid4())[:8]}"
+        turn_number = state.get("turnState", {}).get("currentTurnNumber", 1)
 
-    save_history_file(session_id, state)
+        # Add to context requests
+        txn.emit({
+            "turn": turn_number,
+            "playerId": player_id,
+            "action": "request_context",
+            "event": "request_context",
+            "details": {
+                "request": {
+                    "requestId": request_id,
+                    "playerId": player_id,
+                    "playerName": player_name,
+                    "questions": questions,
+                    "status": "pending",
+                    "answers": None,
+                    "turn": turn_number,
+                },
+            },
+        })
 
     return {
         "requestId": request_id,
@@ -84,6 +101,19 @@ def request_other_player_context(
     }
 
 
+@tool(
+    "Record answers to context questions (user responds).",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "request_id": {"type": "string", "description": "Context request ID"},
+        "answers": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Answers to the questions",
+        },
+    },
+    required=["session_id", "request_id", "answers"],
+)
 def record_player_context(
     session_id: str,
     request_id: str,
@@ -102,54 +132,36 @@ def record_player_context(
     Returns:
         Confirmation of recorded context
     """
-    state = load_history_file(session_id)
-    if state is None:
-        return {"error": f"Session not found: {session_id}"}
-
-    # Find the context request
-    context_requests = state.get("contextRequests", [])
-    request_index = None
-    request = None
-
-    for i, req in enumerate(context_requests):
-        if req.get("requestId") == request_id:
-            request_index = i
-            request = req
-            break
-
-    if request is None:
-        return {
-            "error": f"Context request not found: {request_id}",
-            "pendingRequests": [r.get("requestId") for r in context_requests if r.get("status") == "pending"],
-        }
-
-    # Update the request
-    request["answers"] = answers
-    request["status"] = "answered"
-    context_requests[request_index] = request
-
-    # Also add to other players context for long-term tracking
-    if "otherPlayersContext" not in state:
-        state["otherPlayersContext"] = []
-
-    # Build Q&A summary
-    qa_pairs = []
-    questions = request.get("questions", [])
-    for i, q in enumerate(questions):
-        a = answers[i] if i < len(answers) else "No answer"
-        qa_pairs.append({"question": q, "answer": a})
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
+
+        # Find the context request
+        context_requests = state.get("contextRequests", [])
+        request = None
+
+        for req in context_requests:
+            if req.get("requestId") == request_id:
+                request = req
+                break
 
-    context_entry = {
-        "turn": request.get("turn", 1),
-        "playerId": request.get("playerId"),
-        "playerName": request.get("playerName"),
-        "context": qa_pairs,
-        "summary": "; ".join([f"{qa['question']}: {qa['answer']}" for qa in qa_pairs]),
-    }
-    state["otherPlayersContext"].append(context_entry)
+        if request is None:
+            return {
+                "error": f"Context request not found: {request_id}",
+                "pendingRequests": [r.get("requestId") for r in context_requests if r.get("status") == "pending"],
+            }
 
-    state["contextRequests"] = context_requests
-    save_history_file(session_id, state)
+        # Answer the request; this also adds a Q&A summary to other players
+        # context for long-term tracking
+        txn.emit({
+            "turn": state.get("turnState", {}).get("currentTurnNumber", 1),
+            "playerId": request.get("playerId"),
+            "action": "record_context",
+            "event": "record_context",
+            "details": {"requestId": request_id, "answers": answers},
+        })
+        qa_pairs = state["otherPlayersContext"][-1]["context"]
 
     return {
         "success": True,
@@ -161,6 +173,14 @@ def record_player_context(
     }
 
 
+@tool(
+    "Get recorded context for a player or all players.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "player_id": {"type": "string", "description": "Optional player ID"},
+    },
+    required=["session_id"],
+)
 def get_player_context(session_id: str, player_id: str = None) -> dict:
     """
     Get recorded context for a player or all players.
@@ -210,6 +230,16 @@ def get_player_context(session_id: str, player_id: str = None) -> dict:
     }
 
 
+@tool(
+    "Record a specific action taken by another player.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "player_id": {"type": "string", "description": "Player who acted"},
+        "action": {"type": "string", "description": "Action type"},
+        "details": {"type": "object", "description": "Action details"},
+    },
+    required=["session_id", "player_id", "action"],
+)
 def record_other_player_action(
     session_id: str,
     player_id: str,
@@ -230,70 +260,52 @@ def record_other_player_action(
     Returns:
         Confirmation of recorded action
     """
-    state = load_history_file(session_id)
-    if state is None:
-        return {"error": f"Session not found: {session_id}"}
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
 
-    # Get player name
-    player_name = None
-    for p in state.get("players", []):
-        if p.get("id") == player_id:
-            player_name = p.get("name")
-            break
-
-    if player_name is None:
-        return {"error": f"Player not found: {player_id}"}
+        # Get player name
+        player_name = None
+        for p in state.get("players", []):
+            if p.get("id") == player_id:
+                player_name = p.get("name")
+                break
 
-    turn_number = state.get("turnState", {}).get("currentTurnNumber", 1)
+        if player_name is None:
+            return {"error": f"Player not found: {player_id}"}
 
-    # Record in action log
-    action_entry = {
-        "turn": turn_number,
-        "playerId": player_id,
-        "playerName": player_name,
-        "action": action,
-        "details": details or {},
-        "isOtherPlayer": True,
-    }
+        turn_number = state.get("turnState", {}).get("currentTurnNumber", 1)
 
-    add_action_to_log(session_id, action_entry)
-
-    # Also add to other players context
-    if "otherPlayersContext" not in state:
-        state["otherPlayersContext"] = []
-
-    # Find or create entry for this player this turn
-    existing_entry = None
-    for entry in state["otherPlayersContext"]:
-        if entry.get("playerId") == player_id and entry.get("turn") == turn_number:
-            existing_entry = entry
-            break
-
-    if existing_entry:
-        if "actions" not in existing_entry:
-            existing_entry["actions"] = []
-        existing_entry["actions"].append({"action": action, "details": details})
-    else:
-        state["otherPlayersContext"].append({
+        # Record in action log and other players context
+        txn.emit({
             "turn": turn_number,
             "playerId": player_id,
             "playerName": player_name,
-            "actions": [{"action": action, "details": details}],
+            "action": action,
+            "event": "other_player_action",
+            "details": details or {},
+            "isOtherPlayer": True,
         })
 
-    save_history_file(session_id, state)
-
-    return {
-        "success": True,
-        "playerId": player_id,
-        "playerName": player_name,
-        "action": action,
-        "details": details,
-        "turn": turn_number,
-        "message": f"Recorded: {player_name} - {action}",
-    }
+        return {
+            "success": True,
+            "playerId": player_id,
+            "playerName": player_name,
+            "action": action,
+            "details": details,
+            "turn": turn_number,
+            "message": f"Recorded: {player_name} - {action}",
+        }
 
 
+@tool(
+    "Get current positions of all players.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+    },
+    required=["session_id"],
+)
 def get_all_player_positions(session_id: str) -> dict:
     """
     Get current positions of all players.
@@ -357,6 +369,19 @@ def get_all_player_positions(session_id: str) -> dict:
     }
 
 
+@tool(
+    "AI asks a free-form question to the user.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "question": {"type": "string", "description": "The question to ask"},
+        "options": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Optional suggested answers",
+        },
+    },
+    required=["session_id", "question"],
+)
 def ask_question(
     session_id: str,
     question: str,
@@ -373,29 +398,31 @@ def ask_question(
     Returns:
         Question ID for tracking the response
     """
-    state = load_history_file(session_id)
-    if state is None:
-        return {"error": f"Session not found: {session_id}"}
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
 
-    # Generate question ID
-    question_id = f"q-{str(uuid.uuid4())[:8]}"
+        # Generate question ID
+        question_id = f"q-{str(uuid.uuid4())[:8]}"
+        turn_number = state.get("turnState", {}).get("currentTurnNumber", 1)
 
-    # Create pending question
-    pending_question = {
-        "questionId": question_id,
-        "question": question,
-        "options": options,
-        "status": "pending",
-        "answer": None,
-        "turn": state.get("turnState", {}).get("currentTurnNumber", 1),
-    }
-
-    # Add to pending questions
-    if "pendingQuestions" not in state:
-        state["pendingQuestions"] = []
-    state["pendingQuestions"].append(pending_question)
-
-    save_history_file(session_id, state)
+        # Add to pending questions
+        txn.emit({
+            "turn": turn_number,
+            "action": "ask_question",
+            "event": "ask_question",
+            "details": {
+                "question": {
+                    "questionId": question_id,
+                    "question": question,
+                    "options": options,
+                    "status": "pending",
+                    "answer": None,
+                    "turn": turn_number,
+                },
+            },
+        })
 
     response = {
         "questionId": question_id,
@@ -411,6 +438,15 @@ def ask_question(
     return response
 
 
+@tool(
+    "User answers a pending question from AI.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "question_id": {"type": "string", "description": "Question ID"},
+        "answer": {"type": "string", "description": "The answer"},
+    },
+    required=["session_id", "question_id", "answer"],
+)
 def answer_question(session_id: str, question_id: str, answer: str) -> dict:
     """
     User answers a pending question from AI.
@@ -423,34 +459,33 @@ def answer_question(session_id: str, question_id: str, answer: str) -> dict:
     Returns:
         Confirmation with the Q&A
     """
-    state = load_history_file(session_id)
-    if state is None:
-        return {"error": f"Session not found: {session_id}"}
-
-    pending_questions = state.get("pendingQuestions", [])
-
-    # Find the question
-    question_index = None
-    question = None
-    for i, q in enumerate(pending_questions):
-        if q.get("questionId") == question_id:
-            question_index = i
-            question = q
-            break
-
-    if question is None:
-        return {
-            "error": f"Question not found: {question_id}",
-            "pendingQuestions": [q.get("questionId") for q in pending_questions if q.get("status") == "pending"],
-        }
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
+
+        pending_questions = state.get("pendingQuestions", [])
+
+        # Find the question
+        question = None
+        for q in pending_questions:
+            if q.get("questionId") == question_id:
+                question = q
+                break
 
-    # Update the question
-    question["answer"] = answer
-    question["status"] = "answered"
-    pending_questions[question_index] = question
+        if question is None:
+            return {
+                "error": f"Question not found: {question_id}",
+                "pendingQuestions": [q.get("questionId") for q in pending_questions if q.get("status") == "pending"],
+            }
 
-    state["pendingQuestions"] = pending_questions
-    save_history_file(session_id, state)
+        # Update the question
+        txn.emit({
+            "turn": state.get("turnState", {}).get("currentTurnNumber", 1),
+            "action": "answer_question",
+            "event": "answer_question",
+            "details": {"questionId": question_id, "answer": answer},
+        })
 
     return {
         "success": True,
@@ -461,6 +496,13 @@ def answer_question(session_id: str, question_id: str, answer: str) -> dict:
     }
 
 
+@tool(
+    "Get all pending questions that need answers.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+    },
+    required=["session_id"],
+)
 def get_pending_questions(session_id: str) -> dict:
     """
     Get all pending questions that need answers.
@@ -494,6 +536,13 @@ def get_pending_questions(session_id: str) -> dict:
     }
 
 
+@tool(
+    "Get all pending context requests that need answers.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+    },
+    required=["session_id"],
+)
 def get_pending_context_requests(session_id: str) -> dict:
     """
     Get all pending context requests that need answers.
@@ -6,7 +6,16 @@ Handles dice roll requests and recording results from the user.
 
 import uuid
 from typing import Any
-from ..history_manager import load_history_file, save_history_file, add_action_to_log
+from ..history_manager import (
+    load_history_file,
+    session_transaction,
+    iter_actions_reversed,
+    get_map_index,
+    get_action_log,
+    count_actions,
+)
+from ..data_loader import get_catalog, normalize_name
+from .registry import tool
 
 
 def _get_ai_player(state: dict) -> dict | None:
@@ -23,6 +32,20 @@ def _get_stat_value(player: dict, stat: str) -> int:
     return stat_data.get("currentValue", 0)
 
 
+@tool(
+    "Request a dice roll for stat check, attack, or other purpose.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "purpose": {
+            "type": "string",
+            "description": "Reason: stat_check, attack, room_effect, item_use, haunt_roll, event",
+        },
+        "stat": {"type": "string", "description": "Stat to use: speed, might, knowledge, sanity"},
+        "dice_count": {"type": "integer", "description": "Optional override for number of dice"},
+        "target": {"type": "integer", "description": "Optional target number to beat"},
+    },
+    required=["session_id", "purpose"],
+)
 def request_dice_roll(
     session_id: str,
     purpose: str,
@@ -43,70 +66,80 @@ def request_dice_roll(
     Returns:
         Roll request with ID and description
     """
-    state = load_history_file(session_id)
-    if state is None:
-        return {"error": f"Session not found: {session_id}"}
-
-    ai_player = _get_ai_player(state)
-    if ai_player is None:
-        return {"error": "No AI player found in this session"}
-
-    turn_state = state.get("turnState", {})
-
-    # Calculate dice count from stat if not provided
-    actual_dice_count = dice_count
-    stat_value = None
-
-    if stat and actual_dice_count is None:
-        stat_value = _get_stat_value(ai_player, stat)
-        actual_dice_count = stat_value
-
-    if actual_dice_count is None or actual_dice_count <= 0:
-        actual_dice_count = 1  # Minimum 1 die
-
-    # Generate roll request ID
-    roll_id = str(uuid.uuid4())[:8]
-
-    # Create pending roll
-    pending_roll = {
-        "rollId": roll_id,
-        "purpose": purpose,
-        "stat": stat,
-        "statValue": stat_value,
-        "diceCount": actual_dice_count,
-        "target": target,
-        "status": "pending",
-    }
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
+
+        ai_player = _get_ai_player(state)
+        if ai_player is None:
+            return {"error": "No AI player found in this session"}
+
+        turn_state = state.get("turnState", {})
+
+        # Calculate dice count from stat if not provided
+        actual_dice_count = dice_count
+        stat_value = None
+
+        if stat and actual_dice_count is None:
+            stat_value = _get_stat_value(ai_player, stat)
+            actual_dice_count = stat_value
+
+        if actual_dice_count is None or actual_dice_count <= 0:
+            actual_dice_count = 1  # Minimum 1 die
+
+        # Generate roll request ID
+        roll_id = str(uuid.uuid4())[:8]
+
+        # Create pending roll
+        pending_roll = {
+            "rollId": roll_id,
+            "purpose": purpose,
+            "stat": stat,
+            "statValue": stat_value,
+            "diceCount": actual_dice_count,
+            "target": target,
+            "status": "pending",
+        }
 
-    # Add to pending rolls
-    if "pendingRolls" not in turn_state:
-        turn_state["pendingRolls"] = []
-    turn_state["pendingRolls"].append(pending_roll)
+        # Add to pending rolls
+        if "pendingRolls" not in turn_state:
+            turn_state["pendingRolls"] = []
+        turn_state["pendingRolls"].append(pending_roll)
 
-    state["turnState"] = turn_state
-    save_history_file(session_id, state)
+        state["turnState"] = turn_state
+        txn.save()
 
-    # Build description
-    description_parts = [f"Roll {actual_dice_count} dice"]
-    if stat:
-        description_parts.append(f"for {stat.capitalize()}")
-    if purpose:
-        description_parts.append(f"({purpose})")
-    if target:
-        description_parts.append(f"- need {target}+")
+        # Build description
+        description_parts = [f"Roll {actual_dice_count} dice"]
+        if stat:
+            description_parts.append(f"for {stat.capitalize()}")
+        if purpose:
+            description_parts.append(f"({purpose})")
+        if target:
+            description_parts.append(f"- need {target}+")
 
-    return {
-        "rollId": roll_id,
-        "diceCount": actual_dice_count,
-        "stat": stat,
-        "statValue": stat_value,
-        "purpose": purpose,
-        "target": target,
-        "description": " ".join(description_parts),
-        "message": f"Please roll {actual_dice_count} dice and report the result using 'record_dice_result'",
-    }
+        return {
+            "rollId": roll_id,
+            "diceCount": actual_dice_count,
+            "stat": stat,
+            "statValue": stat_value,
+            "purpose": purpose,
+            "target": target,
+            "description": " ".join(description_parts),
+            "message": f"Please roll {actual_dice_count} dice and report the result using 'record_dice_result'",
+        }
 
 
+@tool(
+    "Record the result of a dice roll from the user.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "roll_id": {"type": "string", "description": "The roll request ID"},
+        "result": {"type": "integer", "description": "The total roll result"},
+    },
+    required=["session_id", "roll_id", "result"],
+)
 def record_dice_result(session_id: str, roll_id: str, result: int) -> dict:
     """
     Record the result of a dice roll.
@@ -119,87 +152,88 @@ def record_dice_result(session_id: str, roll_id: str, result: int) -> dict:
     Returns:
         Interpretation of the result (success/fail, effects)
     """
-    state = load_history_file(session_id)
-    if state is None:
-        return {"error": f"Session not found: {session_id}"}
-
-    ai_player = _get_ai_player(state)
-    if ai_player is None:
-        return {"error": "No AI player found in this session"}
-
-    turn_state = state.get("turnState", {})
-    pending_rolls = turn_state.get("pendingRolls", [])
-
-    # Find the pending roll
-    roll_index = None
-    roll_request = None
-    for i, roll in enumerate(pending_rolls):
-        if roll.get("rollId") == roll_id:
-            roll_index = i
-            roll_request = roll
-            break
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
+
+        ai_player = _get_ai_player(state)
+        if ai_player is None:
+            return {"error": "No AI player found in this session"}
+
+        turn_state = state.get("turnState", {})
+        pending_rolls = turn_state.get("pendingRolls", [])
+
+        # Find the pending roll
+        roll_request = None
+        for roll in pending_rolls:
+            if roll.get("rollId") == roll_id:
+                roll_request = roll
+                break
 
-    if roll_request is None:
-        return {
-            "error": f"Roll request not found: {roll_id}",
-            "pendingRolls": [r.get("rollId") for r in pending_rolls],
+        if roll_request is None:
+            return {
+                "error": f"Roll request not found: {roll_id}",
+                "pendingRolls": [r.get("rollId") for r in pending_rolls],
+            }
+
+        # Determine success/fail
+        target = roll_request.get("target")
+        success = None
+        if target is not None:
+            success = result >= target
+
+        # Record the result; applying it removes the roll from pending
+        action_details = {
+            "rollId": roll_id,
+            "purpose": roll_request.get("purpose"),
+            "stat": roll_request.get("stat"),
+            "statValue": roll_request.get("statValue"),
+            "diceCount": roll_request.get("diceCount"),
+            "result": result,
+            "target": target,
+            "success": success,
         }
 
-    # Determine success/fail
-    target = roll_request.get("target")
-    success = None
-    if target is not None:
-        success = result >= target
-
-    # Remove from pending
-    pending_rolls.pop(roll_index)
-    turn_state["pendingRolls"] = pending_rolls
-
-    # Record in action log
-    action_details = {
-        "rollId": roll_id,
-        "purpose": roll_request.get("purpose"),
-        "stat": roll_request.get("stat"),
-        "statValue": roll_request.get("statValue"),
-        "diceCount": roll_request.get("diceCount"),
-        "result": result,
-        "target": target,
-        "success": success,
-    }
-
-    state["turnState"] = turn_state
-    save_history_file(session_id, state)
-
-    add_action_to_log(session_id, {
-        "turn": turn_state.get("currentTurnNumber", 1),
-        "playerId": ai_player.get("id"),
-        "action": "dice_roll",
-        "details": action_details,
-    })
-
-    # Build response
-    response = {
-        "rollId": roll_id,
-        "result": result,
-        "purpose": roll_request.get("purpose"),
-        "stat": roll_request.get("stat"),
-        "diceCount": roll_request.get("diceCount"),
-    }
+        txn.emit({
+            "turn": turn_state.get("currentTurnNumber", 1),
+            "playerId": ai_player.get("id"),
+            "action": "dice_roll",
+            "event": "dice_roll",
+            "details": action_details,
+        })
+        pending_rolls = state["turnState"]["pendingRolls"]
+
+        # Build response
+        response = {
+            "rollId": roll_id,
+            "result": result,
+            "purpose": roll_request.get("purpose"),
+            "stat": roll_request.get("stat"),
+            "diceCount": roll_request.get("diceCount"),
+        }
 
-    if target is not None:
-        response["target"] = target
-        response["success"] = success
-        response["message"] = f"Rolled {result} vs target {target}: {'SUCCESS' if success else 'FAIL'}"
-    else:
-        response["message"] = f"Rolled {result}"
+        if target is not None:
+            response["target"] = target
+            response["success"] = success
+            response["message"] = f"Rolled {result} vs target {target}: {'SUCCESS' if success else 'FAIL'}"
+        else:
+            response["message"] = f"Rolled {result}"
 
-    # Add any remaining pending rolls
-    if pending_rolls:
-        response["remainingPendingRolls"] = len(pending_rolls)
+        # Add any remaining pending rolls
+        if pending_rolls:
+            response["remainingPendingRolls"] = len(pending_rolls)
 
-    return response
+        return response
 
 
+@tool(
+    "Get all pending dice rolls that need results.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+    },
+    required=["session_id"],
+)
 def get_pending_rolls(session_id: str) -> dict:
     """
     Get all pending dice rolls.
@@ -232,6 +266,14 @@ def get_pending_rolls(session_id: str) -> dict:
     }
 
 
+@tool(
+    "Cancel a pending dice roll that was requested but will not be made.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "roll_id": {"type": "string", "description": "The roll ID from request_dice_roll"},
+    },
+    required=["session_id", "roll_id"],
+)
 def cancel_pending_roll(session_id: str, roll_id: str) -> dict:
     """
     Cancel a pending dice roll.
@@ -243,30 +285,40 @@ def cancel_pending_roll(session_id: str, roll_id: str) -> dict:
     Returns:
         Cancellation result
     """
-    state = load_history_file(session_id)
-    if state is None:
-        return {"error": f"Session not found: {session_id}"}
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
 
-    turn_state = state.get("turnState", {})
-    pending_rolls = turn_state.get("pendingRolls", [])
+        turn_state = state.get("turnState", {})
+        pending_rolls = turn_state.get("pendingRolls", [])
 
-    # Find and remove the roll
-    new_pending = [r for r in pending_rolls if r.get("rollId") != roll_id]
+        # Find and remove the roll
+        new_pending = [r for r in pending_rolls if r.get("rollId") != roll_id]
 
-    if len(new_pending) == len(pending_rolls):
-        return {"error": f"Roll request not found: {roll_id}"}
+        if len(new_pending) == len(pending_rolls):
+            return {"error": f"Roll request not found: {roll_id}"}
 
-    turn_state["pendingRolls"] = new_pending
-    state["turnState"] = turn_state
-    save_history_file(session_id, state)
+        turn_state["pendingRolls"] = new_pending
+        state["turnState"] = turn_state
+        txn.save()
 
-    return {
-        "success": True,
-        "cancelledRollId": roll_id,
-        "remainingPendingRolls": len(new_pending),
-    }
+        return {
+            "success": True,
+            "cancelledRollId": roll_id,
+            "remainingPendingRolls": len(new_pending),
+        }
 
 
+@tool(
+    "Get dice roll requirements for a room or item.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "room_id": {"type": "string", "description": "Optional room ID"},
+        "item_id": {"type": "string", "description": "Optional item ID"},
+    },
+    required=["session_id"],
+)
 def get_roll_requirements(
     session_id: str,
     room_id: str = None,
@@ -283,8 +335,6 @@ def get_roll_requirements(
     Returns:
         Roll requirements including stat, dice count, and target
     """
-    from ..data_loader import get_maps_data, get_cards_data
-
     state = load_history_file(session_id)
     if state is None:
         return {"error": f"Session not found: {session_id}"}
@@ -301,70 +351,61 @@ def get_roll_requirements(
             room_id = ai_player.get("currentPosition", {}).get("roomId")
 
         # Find room in placed rooms
-        room = None
-        for r in state.get("map", {}).get("placedRooms", []):
-            if r.get("instanceId") == room_id:
-                room = r
-                break
+        room = get_map_index(state).room_by_id(room_id)
 
         if room:
             room_name_en = room.get("roomName", {}).get("en", "")
-            maps_data = get_maps_data()
-
-            # Find room data
-            for room_data in maps_data.get("ROOMS", []):
-                if room_data.get("name", {}).get("en", "").lower() == room_name_en.lower():
-                    text = room_data.get("text", {})
-
-                    # Parse room text for roll requirements
-                    # Common patterns: "roll X dice", "make a X roll"
-                    en_text = text.get("en", "").lower()
-                    vi_text = text.get("vi", "").lower()
-
-                    # Check for stat-based rolls
-                    for stat in ["speed", "might", "knowledge", "sanity"]:
-                        if stat in en_text:
-                            requirements.append({
-                                "source": "room",
-                                "roomId": room_id,
-                                "roomName": room.get("roomName"),
-                                "stat": stat,
-                                "description": text.get("en", ""),
-                            })
-
-                    # Check for token types that trigger draws
-                    tokens = room.get("tokens", [])
-                    if tokens and not room.get("tokenCollected"):
+            room_data = get_catalog().rooms_by_name.get(normalize_name(room_name_en))
+
+            if room_data:
+                text = room_data.get("text", {})
+
+                # Parse room text for roll requirements
+                # Common patterns: "roll X dice", "make a X roll"
+                en_text = text.get("en", "").lower()
+                vi_text = text.get("vi", "").lower()
+
+                # Check for stat-based rolls
+                for stat in ["speed", "might", "knowledge", "sanity"]:
+                    if stat in en_text:
                         requirements.append({
-                            "source": "token",
+                            "source": "room",
                             "roomId": room_id,
-                            "tokenTypes": tokens,
-                            "description": f"Draw {', '.join(tokens)} card(s)",
+                            "roomName": room.get("roomName"),
+                            "stat": stat,
+                            "description": text.get("en", ""),
                         })
 
-                    break
+                # Check for token types that trigger draws
+                tokens = room.get("tokens", [])
+                if tokens and not room.get("tokenCollected"):
+                    requirements.append({
+                        "source": "token",
+                        "roomId": room_id,
+                        "tokenTypes": tokens,
+                        "description": f"Draw {', '.join(tokens)} card(s)",
+                    })
 
     # Check item requirements
     if item_id:
-        cards_data = get_cards_data()
-
-        for card in cards_data.get("CARDS", []):
-            if card.get("id") == item_id:
-                effect = card.get("effect", {})
-
-                if effect.get("usage"):
-                    usage = effect.get("usage", {})
-                    if usage.get("roll"):
-                        roll_info = usage.get("roll", {})
-                        requirements.append({
-                            "source": "item",
-                            "itemId": item_id,
-                            "itemName": card.get("name"),
-                            "stat": roll_info.get("stat"),
-                            "diceCount": roll_info.get("dice"),
-                            "description": card.get("text", {}).get("en", ""),
-                        })
-                break
+        card = get_catalog().cards_by_id.get(item_id)
+
+        if card:
+            effect = card.get("effect", {})
+
+            # Some cards name their effect with a plain string
+            if isinstance(effect, dict) and effect.get("usage"):
+                usage = effect.get("usage", {})
+                if usage.get("roll"):
+                    roll_info = usage.get("roll", {})
+                    requirements.append({
+                        "source": "item",
+                        "itemId": item_id,
+                        "itemName": card.get("name"),
+                        "stat": roll_info.get("stat"),
+                        "diceCount": roll_info.get("dice"),
+                        "description": card.get("text", {}).get("en", ""),
+                    })
 
     if not requirements:
         return {
@@ -380,6 +421,16 @@ def get_roll_requirements(
     }
 
 
+@tool(
+    "Interpret the result of a dice roll based on game rules.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "roll_id": {"type": "string", "description": "Optional roll ID"},
+        "result": {"type": "integer", "description": "Roll result"},
+        "context": {"type": "string", "description": "Roll context"},
+    },
+    required=["session_id"],
+)
 def interpret_roll_result(
     session_id: str,
     roll_id: str = None,
@@ -405,14 +456,12 @@ def interpret_roll_result(
     # Get roll info from action log if roll_id provided
     roll_info = None
     if roll_id:
-        action_log = state.get("actionLog", [])
-        for action in reversed(action_log):
-            if action.get("action") == "dice_roll":
-                details = action.get("details", {})
-                if details.get("rollId") == roll_id:
-                    roll_info = details
-                    result = details.get("result")
-                    break
+        for action in iter_actions_reversed(session_id, "dice_roll"):
+            details = action.get("details", {})
+            if details.get("rollId") == roll_id:
+                roll_info = details
+                result = details.get("result")
+                break
 
     if result is None:
         return {"error": "No result provided and roll not found in log"}
@@ -482,6 +531,14 @@ def interpret_roll_result(
     return interpretation
 
 
+@tool(
+    "Get recent dice roll history.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "limit": {"type": "integer", "description": "Max rolls to return"},
+    },
+    required=["session_id"],
+)
 def get_dice_roll_history(session_id: str, limit: int = 10) -> dict:
     """
     Get recent dice roll history.
@@ -497,19 +554,13 @@ def get_dice_roll_history(session_id: str, limit: int = 10) -> dict:
     if state is None:
         return {"error": f"Session not found: {session_id}"}
 
-    action_log = state.get("actionLog", [])
-
-    # Filter for dice rolls
-    dice_rolls = [
-        action for action in action_log
-        if action.get("action") == "dice_roll"
-    ]
-
-    # Get most recent
-    recent_rolls = dice_rolls[-limit:] if len(dice_rolls) > limit else dice_rolls
+    # Read the log backwards until enough dice rolls are found
+    recent_rolls = []
+    if limit > 0:
+        recent_rolls = get_action_log(session_id, limit, "dice_roll")
 
     return {
         "rolls": recent_rolls,
         "count": len(recent_rolls),
-        "totalRolls": len(dice_rolls),
+        "totalRolls": count_actions(session_id, "dice_roll"),
     }
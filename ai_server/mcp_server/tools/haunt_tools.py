@@ -3,60 +3,154 @@ MCP Tools for querying Haunt/Traitor data.
 """
 
 from typing import Any
-from ..data_loader import get_haunt_reference_data, get_traitor_map_data
-
-
+from ..data_loader import (
+    fold_name,
+    get_catalog,
+    get_haunt_reference_data,
+    get_traitor_map_data,
+    room_key,
+)
+from ..history_manager import load_history_file
+from .registry import tool
+
+
+@tool(
+    "Look up the haunt number based on omen and room combination from the traitor's tome.",
+    properties={
+        "omen": {
+            "type": "string",
+            "description": "Omen name/key (e.g., 'skull', 'bite', 'Đầu Lâu')",
+        },
+        "room": {"type": "string", "description": "Room name (Vietnamese)"},
+    },
+    required=["omen", "room"],
+    cacheable=True,
+)
 def get_haunt_page(omen: str, room: str) -> dict | None:
     """
     Look up the haunt page number based on omen and room combination.
 
     Args:
         omen: The omen name/key (e.g., "skull", "bite", "Đầu Lâu").
-        room: The room name (Vietnamese).
+        room: The room name (Vietnamese or English, tone marks optional).
 
     Returns:
         Dict with haunt number and lookup details if found.
     """
-    data = get_haunt_reference_data()
-    rows = data.get("REFERENCE_ROWS", [])
-    omen_defs = data.get("OMEN_DEFS", [])
-
-    # Normalize omen input to key
-    omen_key = None
-    omen_lower = omen.lower()
-
-    for omen_def in omen_defs:
-        if omen_def.get("key") == omen_lower:
-            omen_key = omen_def.get("key")
-            break
-        # Check aliases
-        for alias in omen_def.get("aliases", []):
-            if alias.lower() == omen_lower:
-                omen_key = omen_def.get("key")
-                break
-        if omen_key:
-            break
-
-    if not omen_key:
-        return {"error": f"Omen '{omen}' not found", "available_omens": get_all_omens()}
+    catalog = get_catalog()
 
-    # Find room
-    room_lower = room.lower()
-    for row in rows:
-        row_room = row.get("room", "").lower()
-        if room_lower in row_room or row_room in room_lower:
-            haunt_number = row.get(omen_key)
-            if haunt_number:
-                return {
-                    "omen": omen,
-                    "omenKey": omen_key,
-                    "room": row.get("room"),
-                    "hauntNumber": haunt_number,
-                }
+    # Omen key or alias -> matrix column
+    omen_index = catalog.haunt_omen_index.get(fold_name(omen))
+    if omen_index is None:
+        return {"error": f"Omen '{omen}' not found", "available_omens": get_all_omens()}
 
-    return {"error": f"Room '{room}' not found in haunt reference table"}
+    room_index = catalog.haunt_room_index.get(room_key(room))
+    haunt_number = None
+    if room_index is not None:
+        haunt_number = catalog.haunt_matrix[omen_index][room_index]
+    if haunt_number is None:
+        return {"error": f"Room '{room}' not found in haunt reference table"}
+
+    return {
+        "omen": omen,
+        "omenKey": catalog.haunt_omens[omen_index].get("key"),
+        "room": catalog.haunt_rooms[room_index],
+        "hauntNumber": haunt_number,
+    }
+
+
+@tool(
+    "Get the haunt outcome of every revealed omen room in a session: the haunt number "
+    "and traitor rule for each omen that could be drawn there.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "omen": {
+            "type": "string",
+            "description": "Optional omen name/key to only report that omen",
+        },
+    },
+    required=["session_id"],
+)
+def get_haunt_outcomes(session_id: str, omen: str | None = None) -> dict:
+    """
+    Get the haunt outcomes of all revealed omen rooms in a session.
 
+    Args:
+        session_id: The game session ID.
+        omen: Optional omen name/key (e.g., "skull", "Đầu Lâu") to report
+            only that omen's haunt.
 
+    Returns:
+        Dict with one entry per revealed room on the haunt table, each
+        listing the haunt number and traitor rule per omen.
+    """
+    catalog = get_catalog()
+
+    omen_indexes = range(len(catalog.haunt_omens))
+    if omen is not None:
+        omen_index = catalog.haunt_omen_index.get(fold_name(omen))
+        if omen_index is None:
+            return {"error": f"Omen '{omen}' not found", "available_omens": get_all_omens()}
+        omen_indexes = [omen_index]
+
+    state = load_history_file(session_id)
+    if state is None:
+        return {"error": f"Session not found: {session_id}"}
+
+    traitor_map = get_traitor_map_data().get("TRAITOR_BY_HAUNT_NUMBER", {})
+
+    outcomes = []
+    for room in state.get("map", {}).get("placedRooms", []):
+        if "omen" not in room.get("tokens", []):
+            continue
+        names = room.get("roomName") or {}
+        room_index = next(
+            (
+                catalog.haunt_room_index[key]
+                for key in map(room_key, names.values())
+                if key in catalog.haunt_room_index
+            ),
+            None,
+        )
+        if room_index is None:
+            continue
+
+        haunts = []
+        for omen_index in omen_indexes:
+            haunt_number = catalog.haunt_matrix[omen_index][room_index]
+            if haunt_number is None:
+                continue
+            omen_def = catalog.haunt_omens[omen_index]
+            haunts.append({
+                "omenKey": omen_def.get("key"),
+                "omenLabel": omen_def.get("label"),
+                "hauntNumber": haunt_number,
+                "traitorRule": traitor_map.get(str(haunt_number)),
+            })
+
+        outcomes.append({
+            "roomId": room.get("instanceId"),
+            "roomName": names,
+            "hauntRoom": catalog.haunt_rooms[room_index],
+            "tokenCollected": room.get("tokenCollected", True),
+            "haunts": haunts,
+        })
+
+    return {
+        "sessionId": session_id,
+        "omensRevealed": state.get("tokenDecks", {}).get("omensRevealed", 0),
+        "rooms": outcomes,
+    }
+
+
+@tool(
+    "Determine who becomes the traitor for a specific haunt number (1-50).",
+    properties={
+        "haunt_number": {"type": "integer", "description": "The haunt number (1-50)"},
+    },
+    required=["haunt_number"],
+    cacheable=True,
+)
 def get_traitor_for_haunt(haunt_number: int) -> dict | None:
     """
     Determine who becomes the traitor for a specific haunt.
@@ -80,6 +174,7 @@ def get_traitor_for_haunt(haunt_number: int) -> dict | None:
     return {"error": f"Haunt number {haunt_number} not found (valid range: 1-50)"}
 
 
+@tool("Get a list of all omens with their keys, Vietnamese labels, and aliases.", cacheable=True)
 def get_all_omens() -> list[dict]:
     """
     Get a list of all omens with their keys and labels.
@@ -98,10 +193,7 @@ def get_all_haunt_rooms() -> list[str]:
     Returns:
         List of room names (Vietnamese).
     """
-    data = get_haunt_reference_data()
-    rows = data.get("REFERENCE_ROWS", [])
-
-    return [row.get("room") for row in rows if row.get("room")]
+    return list(get_catalog().haunt_rooms)
 
 
 def get_haunt_table_for_room(room: str) -> dict | None:
@@ -109,26 +201,19 @@ def get_haunt_table_for_room(room: str) -> dict | None:
     Get the full haunt lookup table for a specific room.
 
     Args:
-        room: The room name (Vietnamese).
+        room: The room name (Vietnamese or English, tone marks optional).
 
     Returns:
         Dict with all omen -> haunt number mappings for that room.
     """
-    data = get_haunt_reference_data()
-    rows = data.get("REFERENCE_ROWS", [])
-    omen_defs = data.get("OMEN_DEFS", [])
-
-    room_lower = room.lower()
-    for row in rows:
-        row_room = row.get("room", "").lower()
-        if room_lower in row_room or row_room in room_lower:
-            result = {"room": row.get("room"), "haunts": {}}
-            for omen_def in omen_defs:
-                key = omen_def.get("key")
-                label = omen_def.get("label")
-                haunt_num = row.get(key)
-                if haunt_num:
-                    result["haunts"][label] = haunt_num
-            return result
-
-    return None
+    catalog = get_catalog()
+    room_index = catalog.haunt_room_index.get(room_key(room))
+    if room_index is None:
+        return None
+
+    result = {"room": catalog.haunt_rooms[room_index], "haunts": {}}
+    for omen_def, column in zip(catalog.haunt_omens, catalog.haunt_matrix):
+        haunt_num = column[room_index]
+        if haunt_num:
+            result["haunts"][omen_def.get("label")] = haunt_num
+    return result
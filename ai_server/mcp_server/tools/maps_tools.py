@@ -3,9 +3,14 @@ MCP Tools for querying Rooms/Maps data.
 """
 
 from typing import Any
-from ..data_loader import get_maps_data
+from ..data_loader import get_catalog
+from .registry import tool
 
 
+@tool(
+    "Get a list of all rooms/tiles with name, allowed floors, tokens, and starting room status.",
+    cacheable=True,
+)
 def get_all_rooms() -> list[dict]:
     """
     Get a list of all rooms/tiles in the game.
@@ -13,8 +18,7 @@ def get_all_rooms() -> list[dict]:
     Returns:
         List of room objects with name, floors allowed, and basic info.
     """
-    data = get_maps_data()
-    rooms = data.get("ROOMS", [])
+    rooms = get_catalog().rooms
 
     return [
         {
@@ -27,32 +31,36 @@ def get_all_rooms() -> list[dict]:
     ]
 
 
+@tool(
+    "Search for rooms by name (supports Vietnamese/English, tone marks optional).",
+    properties={
+        "name": {"type": "string", "description": "The room name to search for"},
+    },
+    required=["name"],
+    cacheable=True,
+)
 def get_room_by_name(name: str) -> list[dict]:
     """
     Search for rooms by name (supports Vietnamese/English).
 
     Args:
-        name: The name or partial name to search for (case-insensitive).
+        name: The name or partial name to search for (case and diacritic
+            insensitive, small typos tolerated).
 
     Returns:
-        List of matching rooms with full details.
+        List of matching rooms with full details, best match first.
     """
-    data = get_maps_data()
-    rooms = data.get("ROOMS", [])
-    name_lower = name.lower()
-
-    results = []
-    for room in rooms:
-        room_name = room.get("name", {})
-        en_name = room_name.get("en", "").lower()
-        vi_name = room_name.get("vi", "").lower()
-
-        if name_lower in en_name or name_lower in vi_name:
-            results.append(room)
-
-    return results
+    return get_catalog().room_search.search(name)
 
 
+@tool(
+    "Get all rooms that can be placed on a specific floor.",
+    properties={
+        "floor": {"type": "string", "description": "Floor name: 'ground', 'upper', or 'basement'"},
+    },
+    required=["floor"],
+    cacheable=True,
+)
 def get_rooms_by_floor(floor: str) -> list[dict]:
     """
     Get all rooms that can be placed on a specific floor.
@@ -63,12 +71,18 @@ def get_rooms_by_floor(floor: str) -> list[dict]:
     Returns:
         List of rooms allowed on the specified floor.
     """
-    data = get_maps_data()
-    rooms = data.get("ROOMS", [])
-
-    return [room for room in rooms if floor in room.get("floorsAllowed", [])]
-
-
+    return list(get_catalog().rooms_by_floor.get(floor, ()))
+
+
+@tool(
+    "Get door configuration for a specific room (sides and types).",
+    properties={
+        "room_name": {"type": "string", "description": "The room name (Vietnamese or English)"},
+    },
+    required=["room_name"],
+    not_found="Room not found",
+    cacheable=True,
+)
 def get_room_doors(room_name: str) -> dict | None:
     """
     Get door information for a specific room.
@@ -84,6 +98,7 @@ def get_room_doors(room_name: str) -> dict | None:
         return None
 
     room = matches[0]
+
     return {
         "name": room.get("name"),
         "doors": room.get("doors", []),
@@ -92,6 +107,7 @@ def get_room_doors(room_name: str) -> dict | None:
     }
 
 
+@tool("Get all starting room tiles (Entrance Hall, Foyer, Grand Staircase).", cacheable=True)
 def get_starting_rooms() -> list[dict]:
     """
     Get all starting room tiles.
@@ -99,10 +115,7 @@ def get_starting_rooms() -> list[dict]:
     Returns:
         List of rooms that are starting tiles (Entrance Hall, Foyer, etc.).
     """
-    data = get_maps_data()
-    rooms = data.get("ROOMS", [])
-
-    return [room for room in rooms if room.get("isStartingRoom", False)]
+    return list(get_catalog().starting_rooms)
 
 
 def get_rooms_with_tokens(token_type: str | None = None) -> list[dict]:
@@ -115,10 +128,8 @@ def get_rooms_with_tokens(token_type: str | None = None) -> list[dict]:
     Returns:
         List of rooms with the specified tokens.
     """
-    data = get_maps_data()
-    rooms = data.get("ROOMS", [])
-
+    catalog = get_catalog()
     if token_type:
-        return [room for room in rooms if token_type in room.get("tokens", [])]
+        return list(catalog.rooms_by_token.get(token_type, ()))
     else:
-        return [room for room in rooms if room.get("tokens", [])]
+        return [room for room in catalog.rooms if room.get("tokens", [])]
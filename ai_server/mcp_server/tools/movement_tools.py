@@ -4,9 +4,17 @@ Movement tools for navigating the house.
 Handles player movement, room discovery, and stairs traversal.
 """
 
+from collections import deque
 from typing import Any
-from ..history_manager import load_history_file, save_history_file, add_action_to_log
-from ..data_loader import get_maps_data
+from ..history_manager import (
+    SessionTransaction,
+    get_map_index,
+    load_history_file,
+    session_transaction,
+)
+from ..data_loader import get_catalog, normalize_name, thaw
+from ..doors import SIDE_BITS, SIDE_INDEX, DoorLayout, kind_mask, rotation_turns
+from .registry import tool
 
 
 # Direction to coordinate offset mapping
@@ -37,6 +45,19 @@ OPPOSITE_SIDE = {
     "right": "left",
 }
 
+# Stair connections: room (English name) -> {target floor: target room}
+# Grand Staircase -> Upper Landing
+# Stairs From Basement -> Foyer (and vice versa)
+STAIR_TRANSITIONS = {
+    "Grand Staircase": {"upper": "Upper Landing"},
+    "Upper Landing": {"ground": "Grand Staircase"},
+    "Foyer": {"basement": "Stairs From Basement"},
+    "Stairs From Basement": {"ground": "Foyer"},
+}
+
+# Floors reachable by stairs; move_path steps naming one of them use the stairs
+STAIR_FLOORS = {floor for targets in STAIR_TRANSITIONS.values() for floor in targets}
+
 
 def _get_ai_player(state: dict) -> dict | None:
     """Get the AI player from game state."""
@@ -48,43 +69,161 @@ def _get_ai_player(state: dict) -> dict | None:
 
 def _get_room_at_position(state: dict, floor: str, x: int, y: int) -> dict | None:
     """Find a room at the given position."""
-    for room in state.get("map", {}).get("placedRooms", []):
-        if (room.get("floor") == floor and
-            room.get("x") == x and
-            room.get("y") == y):
-            return room
-    return None
+    return get_map_index(state).room_at(floor, x, y)
 
 
 def _get_room_by_id(state: dict, room_id: str) -> dict | None:
     """Get a room by its instance ID."""
+    return get_map_index(state).room_by_id(room_id)
+
+
+def _get_placed_room_by_name(state: dict, room_name: str) -> dict | None:
+    """Find a placed room whose English name contains room_name."""
     for room in state.get("map", {}).get("placedRooms", []):
-        if room.get("instanceId") == room_id:
+        if room_name in room.get("roomName", {}).get("en", ""):
             return room
     return None
 
 
 def _get_room_data_by_name(room_name: str) -> dict | None:
-    """Get room template data by name."""
-    data = get_maps_data()
-    room_name_lower = room_name.lower()
-
-    for room in data.get("ROOMS", []):
-        en_name = room.get("name", {}).get("en", "").lower()
-        vi_name = room.get("name", {}).get("vi", "").lower()
-        if room_name_lower in en_name or room_name_lower in vi_name:
-            return room
-    return None
+    """Get room template data by name (best exact, prefix or partial match)."""
+    # No typo tolerance: placing the wrong tile would corrupt the map
+    matches = get_catalog().room_search.search(room_name, fuzzy=False)
+    return matches[0] if matches else None
 
 
-def _update_player_position(state: dict, player_id: str, new_pos: dict) -> None:
-    """Update a player's position in the state."""
-    for player in state.get("players", []):
-        if player.get("id") == player_id:
-            player["currentPosition"] = new_pos
-            break
+def _get_door_layout(room_data: dict) -> DoorLayout:
+    """Get the precomputed door layout of a room template."""
+    name = normalize_name(room_data.get("name", {}).get("en", ""))
+    return get_catalog().door_layouts[name]
+
+
+def _room_exits(state: dict, room: dict) -> list[tuple[dict, dict]]:
+    """
+    Get the moves out of a room into explored rooms.
 
+    Args:
+        state: The game state
+        room: A placed room
 
+    Returns:
+        List of (step, target room) pairs. A step is a move through a
+        connected door, {"action": "move", "direction": side}, or a stair
+        transition to a placed room, {"action": "use_stairs",
+        "targetFloor": floor}: the moves move_direction and use_stairs
+        accept. Each costs one movement point.
+    """
+    exits = []
+    has_stairs = False
+
+    for side, door_info in room.get("doors", {}).items():
+        if door_info is None:
+            continue
+        kind = door_info.get("kind")
+        if kind == "stairs":
+            has_stairs = True
+            continue
+        connected_to = door_info.get("connectedTo")
+        if kind == "front-door" or not connected_to:
+            continue
+        target_room = _get_room_by_id(state, connected_to)
+        if target_room is not None:
+            exits.append(({"action": "move", "direction": side}, target_room))
+
+    if has_stairs:
+        room_name = room.get("roomName", {}).get("en", "")
+        for floor, target_name in STAIR_TRANSITIONS.get(room_name, {}).items():
+            target_room = _get_placed_room_by_name(state, target_name)
+            if target_room is not None:
+                exits.append(({"action": "use_stairs", "targetFloor": floor}, target_room))
+
+    return exits
+
+
+def _pending_reveal_side(turn_state: dict, room_id: str) -> str | None:
+    """Get the pending reveal direction if it was set in the given room."""
+    if turn_state.get("pendingRevealRoomId") != room_id:
+        return None
+    return turn_state.get("pendingRevealDirection")
+
+
+def _room_effect_text(room: dict) -> dict | None:
+    """
+    Get the rules text of a placed room, if entering it has an effect.
+
+    The text of the stair rooms only says where the stairs lead.
+    """
+    room_name = room.get("roomName", {}).get("en", "")
+    if room_name in STAIR_TRANSITIONS:
+        return None
+    room_data = get_catalog().rooms_by_name.get(normalize_name(room_name))
+    return (room_data or {}).get("text") or None
+
+
+def _room_summary(room: dict) -> dict:
+    """Describe a placed room for path results."""
+    return {
+        "id": room.get("instanceId"),
+        "name": room.get("roomName"),
+        "floor": room.get("floor"),
+    }
+
+
+def _route_tree(
+    state: dict, start: dict, max_moves: int | None = None
+) -> dict[str, tuple[int, str | None, dict | None, dict]]:
+    """
+    Find the fewest moves from a room to every explored room reachable from it.
+
+    Breadth-first search over _room_exits(); every move costs the same.
+
+    Args:
+        state: The game state
+        start: The room to start from
+        max_moves: Stop at rooms this many moves away (None = no limit)
+
+    Returns:
+        Dict of room ID -> (moves, previous room ID, step from it, room) in
+        order of increasing moves, starting with the start room itself
+    """
+    start_id = start.get("instanceId")
+    tree = {start_id: (0, None, None, start)}
+    queue = deque([start])
+
+    while queue:
+        room = queue.popleft()
+        room_id = room.get("instanceId")
+        moves = tree[room_id][0]
+        if max_moves is not None and moves >= max_moves:
+            continue
+
+        for step, target_room in _room_exits(state, room):
+            target_id = target_room.get("instanceId")
+            if target_id not in tree:
+                tree[target_id] = (moves + 1, room_id, step, target_room)
+                queue.append(target_room)
+
+    return tree
+
+
+def _route_steps(tree: dict, room_id: str) -> list[dict]:
+    """Get the steps from the start of a _route_tree() to a room in it."""
+    steps = []
+    _, previous_id, step, room = tree[room_id]
+    while previous_id is not None:
+        steps.append({**step, "to": _room_summary(room)})
+        _, previous_id, step, room = tree[previous_id]
+    steps.reverse()
+    return steps
+
+
+@tool(
+    "Get available movement directions from current room.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+    },
+    required=["session_id"],
+)
 def get_movement_options(session_id: str) -> dict:
     """
     Get available movement directions for the AI player.
@@ -193,25 +332,9 @@ def get_movement_options(session_id: str) -> dict:
     }
 
 
-def move_direction(session_id: str, direction: str) -> dict:
-    """
-    Move the AI player in a direction.
-
-    Args:
-        session_id: The game session ID
-        direction: Direction to move (up/down/left/right or top/bottom)
-
-    Returns:
-        Result of movement, or request to reveal room if unexplored
-    """
-    state = load_history_file(session_id)
-    if state is None:
-        return {"error": f"Session not found: {session_id}"}
-
-    ai_player = _get_ai_player(state)
-    if ai_player is None:
-        return {"error": "No AI player found in this session"}
-
+def _move_direction(txn: SessionTransaction, ai_player: dict, direction: str) -> dict:
+    """Move the AI player through a door, inside a session transaction."""
+    state = txn.state
     turn_state = state.get("turnState", {})
     if turn_state.get("currentPlayerId") != ai_player.get("id"):
         return {"error": "Not AI's turn"}
@@ -260,38 +383,27 @@ def move_direction(session_id: str, direction: str) -> dict:
         if target_room is None:
             return {"error": "Connected room not found"}
 
-        # Update position
+        # Move there, spending one movement point
         new_pos = {
             "floor": target_room.get("floor"),
             "roomId": connected_to,
             "x": target_room.get("x"),
             "y": target_room.get("y"),
         }
-        _update_player_position(state, ai_player.get("id"), new_pos)
-
-        # Decrease movement
-        turn_state["movementRemaining"] = movement_remaining - 1
-        state["turnState"] = turn_state
-
-        save_history_file(session_id, state)
-
-        # Log action
-        add_action_to_log(session_id, {
+        txn.emit({
             "turn": turn_state.get("currentTurnNumber", 1),
             "playerId": ai_player.get("id"),
             "action": "move",
+            "event": "move",
             "details": {
                 "from": current_pos,
                 "to": new_pos,
                 "direction": side,
                 "targetRoom": target_room.get("roomName"),
+                "movementRemaining": movement_remaining - 1,
             },
         })
 
-        # Check for room effects
-        room_data = _get_room_data_by_name(
-            target_room.get("roomName", {}).get("en", "")
-        )
         tokens = target_room.get("tokens", [])
         token_collected = target_room.get("tokenCollected", True)
 
@@ -308,13 +420,22 @@ def move_direction(session_id: str, direction: str) -> dict:
             "message": f"Moved to {target_room.get('roomName', {}).get('en', 'room')}",
         }
 
-    # Unexplored door - need to reveal a room
+    # Unexplored door - need to reveal a room. Remember the side so that
+    # reveal_room places the room behind this door
     current_x = current_room.get("x", 0)
     current_y = current_room.get("y", 0)
     dx, dy = DIRECTION_OFFSETS.get(side, (0, 0))
     target_x = current_x + dx
     target_y = current_y + dy
 
+    txn.emit({
+        "turn": turn_state.get("currentTurnNumber", 1),
+        "playerId": ai_player.get("id"),
+        "action": "set_pending_reveal",
+        "event": "set_pending_reveal",
+        "details": {"direction": side, "roomId": current_room_id},
+    })
+
     return {
         "awaitingRoomReveal": True,
         "direction": side,
@@ -327,6 +448,48 @@ def move_direction(session_id: str, direction: str) -> dict:
     }
 
 
+@tool(
+    "Move the AI player in a direction (up/down/left/right).",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "direction": {"type": "string", "description": "Direction: up, down, left, right"},
+    },
+    required=["session_id", "direction"],
+)
+def move_direction(session_id: str, direction: str) -> dict:
+    """
+    Move the AI player in a direction.
+
+    Args:
+        session_id: The game session ID
+        direction: Direction to move (up/down/left/right or top/bottom)
+
+    Returns:
+        Result of movement, or request to reveal room if unexplored
+    """
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
+
+        ai_player = _get_ai_player(state)
+        if ai_player is None:
+            return {"error": "No AI player found in this session"}
+
+        return _move_direction(txn, ai_player, direction)
+
+
+@tool(
+    "Place a revealed room tile on the map when entering unexplored area. The room is "
+    "placed behind the door set with set_pending_room_reveal, or else behind the current "
+    "room's first unexplored door.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "room_name": {"type": "string", "description": "Name of the room tile drawn"},
+        "rotation": {"type": "integer", "description": "Rotation in degrees: 0, 90, 180, 270"},
+    },
+    required=["session_id", "room_name"],
+)
 def reveal_room(session_id: str, room_name: str, rotation: int = 0) -> dict:
     """
     Place a revealed room on the map.
@@ -337,191 +500,151 @@ def reveal_room(session_id: str, room_name: str, rotation: int = 0) -> dict:
         rotation: Rotation in degrees (0, 90, 180, 270)
 
     Returns:
-        Room placement result
+        Room placement result, or an error if the pending reveal direction
+        is not an unexplored door of the current room
     """
-    state = load_history_file(session_id)
-    if state is None:
-        return {"error": f"Session not found: {session_id}"}
-
-    ai_player = _get_ai_player(state)
-    if ai_player is None:
-        return {"error": "No AI player found in this session"}
-
-    # Get room template data
-    room_data = _get_room_data_by_name(room_name)
-    if room_data is None:
-        return {"error": f"Room not found: {room_name}"}
-
-    current_pos = ai_player.get("currentPosition", {})
-    current_room_id = current_pos.get("roomId")
-    current_room = _get_room_by_id(state, current_room_id)
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
 
-    if current_room is None:
-        return {"error": "Current room not found"}
-
-    turn_state = state.get("turnState", {})
-    current_floor = current_room.get("floor", "ground")
+        ai_player = _get_ai_player(state)
+        if ai_player is None:
+            return {"error": "No AI player found in this session"}
+
+        # Get room template data
+        room_data = _get_room_data_by_name(room_name)
+        if room_data is None:
+            return {"error": f"Room not found: {room_name}"}
+        # Parts of the template go into the session state and log
+        room_data = thaw(room_data)
+
+        current_pos = ai_player.get("currentPosition", {})
+        current_room_id = current_pos.get("roomId")
+        current_room = _get_room_by_id(state, current_room_id)
+
+        if current_room is None:
+            return {"error": "Current room not found"}
+
+        turn_state = state.get("turnState", {})
+        current_floor = current_room.get("floor", "ground")
+
+        # Check if room can be placed on this floor
+        allowed_floors = room_data.get("floorsAllowed", [])
+        if current_floor not in allowed_floors:
+            return {
+                "error": f"Room '{room_name}' cannot be placed on {current_floor} floor",
+                "allowedFloors": allowed_floors,
+            }
 
-    # Check if room can be placed on this floor
-    allowed_floors = room_data.get("floorsAllowed", [])
-    if current_floor not in allowed_floors:
-        return {
-            "error": f"Room '{room_name}' cannot be placed on {current_floor} floor",
-            "allowedFloors": allowed_floors,
+        # Place the room behind the door set by set_pending_room_reveal, or
+        # behind the current room's first unexplored door
+        index = get_map_index(state)
+        pending_side = _pending_reveal_side(turn_state, current_room_id)
+        if pending_side is not None:
+            frontier_door = index.frontier_door(current_room_id, pending_side)
+            if frontier_door is None:
+                return {
+                    "error": f"No unexplored door to the {pending_side} of the current room",
+                    "pendingDirection": pending_side,
+                    "frontierDoors": [
+                        door.side for door in index.frontier_doors(current_room_id)
+                    ],
+                }
+        else:
+            frontier_doors = index.frontier_doors(current_room_id)
+            if not frontier_doors:
+                return {"error": "No unexplored door to place room"}
+            frontier_door = frontier_doors[0]
+
+        reveal_direction = frontier_door.side
+        target_x = frontier_door.x
+        target_y = frontier_door.y
+
+        # Generate new room ID
+        map_data = state.get("map", {})
+        next_id = map_data.get("nextRoomId", 4)
+        new_room_id = f"room-{next_id:03d}"
+
+        # Build doors dict with rotation applied
+        layout = _get_door_layout(room_data)
+        turns = rotation_turns(rotation)
+        rotated_doors = {
+            side: {"kind": kind, "connectedTo": None}
+            for side, kind in layout.doors[turns]
         }
 
-    # Find the pending reveal direction (last attempted move through unexplored door)
-    # For now, we need to determine where to place based on last movement attempt
-    # This should be tracked in turn state, but for simplicity we'll calculate from doors
-
-    # Find an unexplored door direction
-    reveal_direction = None
-    for side, door_info in current_room.get("doors", {}).items():
-        if door_info and door_info.get("connectedTo") is None and door_info.get("kind") == "door":
-            reveal_direction = side
-            break
-
-    if reveal_direction is None:
-        return {"error": "No unexplored door to place room"}
-
-    # Calculate target position
-    current_x = current_room.get("x", 0)
-    current_y = current_room.get("y", 0)
-    dx, dy = DIRECTION_OFFSETS.get(reveal_direction, (0, 0))
-    target_x = current_x + dx
-    target_y = current_y + dy
-
-    # Check if position is already occupied
-    existing = _get_room_at_position(state, current_floor, target_x, target_y)
-    if existing:
-        return {"error": f"Position ({target_x}, {target_y}) already has a room"}
-
-    # Generate new room ID
-    map_data = state.get("map", {})
-    next_id = map_data.get("nextRoomId", 4)
-    new_room_id = f"room-{next_id:03d}"
-
-    # Build doors dict with rotation applied
-    base_doors = room_data.get("doors", [])
-    rotated_doors = _rotate_doors(base_doors, rotation)
-
-    # Connect the new room to current room
-    opposite_side = OPPOSITE_SIDE.get(reveal_direction)
-    for side in rotated_doors:
-        if side == opposite_side:
-            rotated_doors[side]["connectedTo"] = current_room_id
-
-    # Update current room's door to connect to new room
-    current_room["doors"][reveal_direction]["connectedTo"] = new_room_id
-
-    # Create new room entry
-    new_room = {
-        "instanceId": new_room_id,
-        "roomName": room_data.get("name"),
-        "floor": current_floor,
-        "x": target_x,
-        "y": target_y,
-        "rotation": rotation,
-        "doors": rotated_doors,
-        "tokens": room_data.get("tokens", []),
-        "tokenCollected": len(room_data.get("tokens", [])) == 0,
-        "roomBonusUsed": False,
-    }
-
-    # Add to map
-    map_data["placedRooms"].append(new_room)
-    map_data["nextRoomId"] = next_id + 1
-    state["map"] = map_data
-
-    # Move player to new room
-    new_pos = {
-        "floor": current_floor,
-        "roomId": new_room_id,
-        "x": target_x,
-        "y": target_y,
-    }
-    _update_player_position(state, ai_player.get("id"), new_pos)
-
-    # Decrease movement
-    turn_state["movementRemaining"] = turn_state.get("movementRemaining", 1) - 1
-    state["turnState"] = turn_state
-
-    save_history_file(session_id, state)
+        # Connect the new room to current room
+        opposite_side = OPPOSITE_SIDE.get(reveal_direction)
+        if opposite_side in rotated_doors:
+            rotated_doors[opposite_side]["connectedTo"] = current_room_id
+
+        # And to the other rooms around it whose doors face its doors
+        connected_neighbours = []
+        open_mask = kind_mask(layout.kinds[turns]) & ~SIDE_BITS.get(opposite_side, 0)
+        for side, neighbour in index.facing_doors(current_floor, target_x, target_y, open_mask):
+            rotated_doors[side]["connectedTo"] = neighbour.get("instanceId")
+            connected_neighbours.append({
+                "roomId": neighbour.get("instanceId"),
+                "side": OPPOSITE_SIDE[side],
+            })
 
-    # Log action
-    add_action_to_log(session_id, {
-        "turn": turn_state.get("currentTurnNumber", 1),
-        "playerId": ai_player.get("id"),
-        "action": "reveal_room",
-        "details": {
+        # Create new room entry
+        new_room = {
+            "instanceId": new_room_id,
             "roomName": room_data.get("name"),
-            "position": {"x": target_x, "y": target_y, "floor": current_floor},
+            "floor": current_floor,
+            "x": target_x,
+            "y": target_y,
             "rotation": rotation,
+            "doors": rotated_doors,
             "tokens": room_data.get("tokens", []),
-        },
-    })
-
-    tokens = room_data.get("tokens", [])
-    return {
-        "success": True,
-        "room": {
-            "id": new_room_id,
-            "name": room_data.get("name"),
-            "floor": current_floor,
-            "position": {"x": target_x, "y": target_y},
-        },
-        "newPosition": new_pos,
-        "movementRemaining": turn_state.get("movementRemaining", 0),
-        "hasToken": bool(tokens),
-        "tokenTypes": tokens,
-        "roomText": room_data.get("text", {}),
-        "message": f"Revealed {room_data.get('name', {}).get('en', room_name)}",
-    }
-
-
-def _rotate_doors(base_doors: list[dict], rotation: int) -> dict:
-    """Rotate door positions by given degrees."""
-    # Rotation order: top -> right -> bottom -> left -> top
-    rotation_map = {
-        0: {"top": "top", "right": "right", "bottom": "bottom", "left": "left"},
-        90: {"top": "right", "right": "bottom", "bottom": "left", "left": "top"},
-        180: {"top": "bottom", "right": "left", "bottom": "top", "left": "right"},
-        270: {"top": "left", "right": "top", "bottom": "right", "left": "bottom"},
-    }
-
-    mapping = rotation_map.get(rotation % 360, rotation_map[0])
-    result = {}
-
-    for door in base_doors:
-        original_side = door.get("side")
-        new_side = mapping.get(original_side, original_side)
-        result[new_side] = {
-            "kind": door.get("kind"),
-            "connectedTo": None,
+            "tokenCollected": len(room_data.get("tokens", [])) == 0,
+            "roomBonusUsed": False,
         }
 
-    return result
-
-
-def use_stairs(session_id: str, target_floor: str) -> dict:
-    """
-    Use stairs to move between floors.
-
-    Args:
-        session_id: The game session ID
-        target_floor: Target floor (upper, ground, basement)
+        # Place the room, connect the door it was entered through and move
+        # the player into it
+        txn.emit({
+            "turn": turn_state.get("currentTurnNumber", 1),
+            "playerId": ai_player.get("id"),
+            "action": "reveal_room",
+            "event": "reveal_room",
+            "details": {
+                "roomName": room_data.get("name"),
+                "position": {"x": target_x, "y": target_y, "floor": current_floor},
+                "rotation": rotation,
+                "tokens": room_data.get("tokens", []),
+                "room": new_room,
+                "connectedFrom": {"roomId": current_room_id, "side": reveal_direction},
+                "connectedNeighbours": connected_neighbours,
+                "nextRoomId": next_id + 1,
+                "movementRemaining": turn_state.get("movementRemaining", 1) - 1,
+            },
+        })
+        new_pos = ai_player.get("currentPosition")
 
-    Returns:
-        Result of stair traversal
-    """
-    state = load_history_file(session_id)
-    if state is None:
-        return {"error": f"Session not found: {session_id}"}
+        tokens = room_data.get("tokens", [])
+        return {
+            "success": True,
+            "room": {
+                "id": new_room_id,
+                "name": room_data.get("name"),
+                "floor": current_floor,
+                "position": {"x": target_x, "y": target_y},
+            },
+            "newPosition": new_pos,
+            "movementRemaining": turn_state.get("movementRemaining", 0),
+            "hasToken": bool(tokens),
+            "tokenTypes": tokens,
+            "roomText": room_data.get("text", {}),
+            "message": f"Revealed {room_data.get('name', {}).get('en', room_name)}",
+        }
 
-    ai_player = _get_ai_player(state)
-    if ai_player is None:
-        return {"error": "No AI player found in this session"}
 
+def _use_stairs(txn: SessionTransaction, ai_player: dict, target_floor: str) -> dict:
+    """Move the AI player up or down stairs, inside a session transaction."""
+    state = txn.state
     turn_state = state.get("turnState", {})
     if turn_state.get("currentPlayerId") != ai_player.get("id"):
         return {"error": "Not AI's turn"}
@@ -546,16 +669,7 @@ def use_stairs(session_id: str, target_floor: str) -> dict:
     room_name = current_room.get("roomName", {}).get("en", "")
 
     # Handle specific stair connections
-    # Grand Staircase -> Upper Landing
-    # Stairs From Basement -> Foyer (and vice versa)
-    valid_transitions = {
-        "Grand Staircase": {"upper": "Upper Landing"},
-        "Upper Landing": {"ground": "Grand Staircase"},
-        "Foyer": {"basement": "Stairs From Basement"},
-        "Stairs From Basement": {"ground": "Foyer"},
-    }
-
-    transitions = valid_transitions.get(room_name, {})
+    transitions = STAIR_TRANSITIONS.get(room_name, {})
     if target_floor not in transitions:
         return {
             "error": f"Cannot go to {target_floor} from {room_name}",
@@ -565,11 +679,7 @@ def use_stairs(session_id: str, target_floor: str) -> dict:
     target_room_name = transitions[target_floor]
 
     # Find or create target room
-    target_room = None
-    for room in state.get("map", {}).get("placedRooms", []):
-        if target_room_name in room.get("roomName", {}).get("en", ""):
-            target_room = room
-            break
+    target_room = _get_placed_room_by_name(state, target_room_name)
 
     if target_room is None:
         return {
@@ -577,31 +687,24 @@ def use_stairs(session_id: str, target_floor: str) -> dict:
             "needsReveal": True,
         }
 
-    # Move to target room
+    # Move to target room; stairs use 1 movement
     new_pos = {
         "floor": target_floor,
         "roomId": target_room.get("instanceId"),
         "x": target_room.get("x"),
         "y": target_room.get("y"),
     }
-    _update_player_position(state, ai_player.get("id"), new_pos)
-
-    # Stairs use 1 movement
     movement = turn_state.get("movementRemaining", 1) - 1
-    turn_state["movementRemaining"] = max(0, movement)
-    state["turnState"] = turn_state
-
-    save_history_file(session_id, state)
-
-    # Log action
-    add_action_to_log(session_id, {
+    txn.emit({
         "turn": turn_state.get("currentTurnNumber", 1),
         "playerId": ai_player.get("id"),
         "action": "use_stairs",
+        "event": "use_stairs",
         "details": {
             "from": current_pos,
             "to": new_pos,
             "targetFloor": target_floor,
+            "movementRemaining": max(0, movement),
         },
     })
 
@@ -618,6 +721,45 @@ def use_stairs(session_id: str, target_floor: str) -> dict:
     }
 
 
+@tool(
+    "Use stairs to move between floors.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "target_floor": {"type": "string", "description": "Target floor: upper, ground, basement"},
+    },
+    required=["session_id", "target_floor"],
+)
+def use_stairs(session_id: str, target_floor: str) -> dict:
+    """
+    Use stairs to move between floors.
+
+    Args:
+        session_id: The game session ID
+        target_floor: Target floor (upper, ground, basement)
+
+    Returns:
+        Result of stair traversal
+    """
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
+
+        ai_player = _get_ai_player(state)
+        if ai_player is None:
+            return {"error": "No AI player found in this session"}
+
+        return _use_stairs(txn, ai_player, target_floor)
+
+
+@tool(
+    "Get effects/rules for current or specified room.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "room_id": {"type": "string", "description": "Optional room ID (defaults to current room)"},
+    },
+    required=["session_id"],
+)
 def get_room_effects(session_id: str, room_id: str = None) -> dict:
     """
     Get effects/rules for a room.
@@ -670,6 +812,15 @@ def get_room_effects(session_id: str, room_id: str = None) -> dict:
     }
 
 
+@tool(
+    "Get detailed door information for a room.",
+    name="get_room_doors_detailed",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "room_id": {"type": "string", "description": "Optional room ID"},
+    },
+    required=["session_id"],
+)
 def get_room_doors(session_id: str, room_id: str = None) -> dict:
     """
     Get detailed door information for a room.
@@ -730,6 +881,15 @@ def get_room_doors(session_id: str, room_id: str = None) -> dict:
     }
 
 
+@tool(
+    "Calculate valid rotations for placing a new room (door-to-door rule).",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "room_name": {"type": "string", "description": "Room to place"},
+        "entry_direction": {"type": "string", "description": "Direction entering from"},
+    },
+    required=["session_id", "room_name", "entry_direction"],
+)
 def calculate_valid_rotations(
     session_id: str,
     room_name: str,
@@ -768,8 +928,8 @@ def calculate_valid_rotations(
     required_door = OPPOSITE_SIDE.get(entry_side)
 
     # Get base doors from room data
-    base_doors = room_data.get("doors", [])
-    base_door_sides = [d.get("side") for d in base_doors]
+    base_door_sides = [d.get("side") for d in room_data.get("doors", [])]
+    layout = _get_door_layout(room_data)
 
     valid_rotations = []
     rotation_descriptions = {
@@ -779,19 +939,14 @@ def calculate_valid_rotations(
         270: "270° clockwise (90° counter-clockwise)",
     }
 
-    for rotation in [0, 90, 180, 270]:
-        # Calculate where doors end up after rotation
-        rotated_doors = _rotate_doors(base_doors, rotation)
-        rotated_sides = list(rotated_doors.keys())
-
-        # Check if required door exists after rotation
-        if required_door in rotated_sides:
-            valid_rotations.append({
-                "rotation": rotation,
-                "description": rotation_descriptions[rotation],
-                "resultingDoors": rotated_sides,
-                "connectionDoor": required_door,
-            })
+    # Rotations that leave a door on the required side
+    for rotation in layout.rotations_by_side[SIDE_INDEX[required_door]]:
+        valid_rotations.append({
+            "rotation": rotation,
+            "description": rotation_descriptions[rotation],
+            "resultingDoors": [side for side, _ in layout.doors[rotation_turns(rotation)]],
+            "connectionDoor": required_door,
+        })
 
     if not valid_rotations:
         return {
@@ -811,6 +966,14 @@ def calculate_valid_rotations(
     }
 
 
+@tool(
+    "Get detailed connection info for all doors in a room.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "room_id": {"type": "string", "description": "Optional room ID"},
+    },
+    required=["session_id"],
+)
 def get_door_connections(session_id: str, room_id: str = None) -> dict:
     """
     Get detailed connection information for all doors in a room.
@@ -894,11 +1057,21 @@ def get_door_connections(session_id: str, room_id: str = None) -> dict:
     }
 
 
+@tool(
+    "Set direction for pending room reveal.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "direction": {"type": "string", "description": "Direction to reveal"},
+    },
+    required=["session_id", "direction"],
+)
 def set_pending_room_reveal(session_id: str, direction: str) -> dict:
     """
     Set the pending direction for room reveal.
 
     Called before reveal_room to specify which direction the room is being placed.
+    The direction only applies in the AI player's current room: it is cleared
+    when the player moves, uses stairs, or a turn starts or ends.
 
     Args:
         session_id: The game session ID
@@ -907,23 +1080,414 @@ def set_pending_room_reveal(session_id: str, direction: str) -> dict:
     Returns:
         Confirmation of pending reveal direction
     """
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
+
+        side = DIRECTION_TO_SIDE.get(direction.lower())
+        if side is None:
+            return {"error": f"Invalid direction: {direction}"}
+
+        ai_player = _get_ai_player(state)
+        if ai_player is None:
+            return {"error": "No AI player found in this session"}
+
+        # Only used by reveal_room while the player is still in this room
+        turn_state = state.get("turnState", {})
+        txn.emit({
+            "turn": turn_state.get("currentTurnNumber", 1),
+            "playerId": ai_player.get("id"),
+            "action": "set_pending_reveal",
+            "event": "set_pending_reveal",
+            "details": {
+                "direction": side,
+                "roomId": ai_player.get("currentPosition", {}).get("roomId"),
+            },
+        })
+
+        return {
+            "success": True,
+            "pendingDirection": side,
+            "requiredDoor": OPPOSITE_SIDE.get(side),
+            "message": f"Ready to reveal room in {side} direction",
+        }
+
+
+@tool(
+    "Get the exploration frontier: every unexplored door on the map that leads to an "
+    "empty cell, with the cell a revealed room would be placed in and the route to it.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+    },
+    required=["session_id"],
+)
+def get_exploration_frontier(session_id: str) -> dict:
+    """
+    Get the unexplored doors where a new room can be placed.
+
+    Args:
+        session_id: The game session ID
+
+    Returns:
+        Frontier doors in the order they were revealed, with the moves to
+        reach them from the AI player's room (None if not reachable), and
+        the pending reveal direction
+    """
     state = load_history_file(session_id)
     if state is None:
         return {"error": f"Session not found: {session_id}"}
 
-    side = DIRECTION_TO_SIDE.get(direction.lower())
-    if side is None:
-        return {"error": f"Invalid direction: {direction}"}
+    ai_player = _get_ai_player(state)
+    if ai_player is None:
+        return {"error": "No AI player found in this session"}
 
-    turn_state = state.get("turnState", {})
-    turn_state["pendingRevealDirection"] = side
+    current_room = _get_room_by_id(state, ai_player.get("currentPosition", {}).get("roomId"))
+    if current_room is None:
+        return {"error": "Current room not found"}
+
+    tree = _route_tree(state, current_room)
+
+    frontier = []
+    for door in get_map_index(state).frontier_doors():
+        room = _get_room_by_id(state, door.room_id)
+        route = tree.get(door.room_id)
+        frontier.append({
+            "room": _room_summary(room),
+            "direction": door.side,
+            "targetPosition": {"floor": door.floor, "x": door.x, "y": door.y},
+            # Moving through the door costs one more move
+            "distance": route[0] + 1 if route is not None else None,
+            "steps": _route_steps(tree, door.room_id) if route is not None else None,
+        })
+
+    return {
+        "from": _room_summary(current_room),
+        "pendingRevealDirection": _pending_reveal_side(
+            state.get("turnState", {}), current_room.get("instanceId")
+        ),
+        "frontier": frontier,
+        "count": len(frontier),
+        "message": f"{len(frontier)} unexplored door(s) lead to empty cells",
+    }
+
+
+@tool(
+    "Plan the shortest route through explored rooms (doors and stairs) from the AI "
+    "player's room to a target room. Returns the moves to make and their movement cost.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "target": {
+            "type": "string",
+            "description": "Target room instance ID (e.g. 'room-004') or room name",
+        },
+    },
+    required=["session_id", "target"],
+)
+def find_path(session_id: str, target: str) -> dict:
+    """
+    Find the shortest route to a placed room.
+
+    Args:
+        session_id: The game session ID
+        target: Instance ID or name (English or Vietnamese) of a placed room
+
+    Returns:
+        The steps (move_direction directions and use_stairs floors) from
+        the AI player's room to the target, with the movement cost
+    """
+    state = load_history_file(session_id)
+    if state is None:
+        return {"error": f"Session not found: {session_id}"}
+
+    ai_player = _get_ai_player(state)
+    if ai_player is None:
+        return {"error": "No AI player found in this session"}
+
+    current_room = _get_room_by_id(state, ai_player.get("currentPosition", {}).get("roomId"))
+    if current_room is None:
+        return {"error": "Current room not found"}
+
+    # Resolve the target to placed rooms
+    target_room = _get_room_by_id(state, target)
+    if target_room is not None:
+        target_rooms = [target_room]
+    else:
+        room_data = _get_room_data_by_name(target)
+        if room_data is None:
+            return {"error": f"Room not found: {target}"}
+        target_name = room_data.get("name", {}).get("en")
+        target_rooms = [
+            room for room in state.get("map", {}).get("placedRooms", [])
+            if room.get("roomName", {}).get("en") == target_name
+        ]
+        if not target_rooms:
+            return {
+                "error": f"Room '{target_name}' is not placed on the map yet",
+                "needsReveal": True,
+            }
+
+    # Rooms come out of the search nearest first
+    target_ids = {room.get("instanceId") for room in target_rooms}
+    tree = _route_tree(state, current_room)
+    reached = next((room_id for room_id in tree if room_id in target_ids), None)
+    if reached is None:
+        return {
+            "error": f"No explored route from {current_room.get('instanceId')} to {target}",
+            "from": _room_summary(current_room),
+        }
+
+    steps = _route_steps(tree, reached)
+
+    movement_remaining = state.get("turnState", {}).get("movementRemaining", 0)
+    destination = steps[-1]["to"] if steps else _room_summary(current_room)
+    return {
+        "from": _room_summary(current_room),
+        "target": destination,
+        "cost": len(steps),
+        "steps": steps,
+        "movementRemaining": movement_remaining,
+        "reachableThisTurn": len(steps) <= movement_remaining,
+        "message": (
+            f"{len(steps)} move(s) to "
+            f"{(destination.get('name') or {}).get('en', destination.get('id'))}"
+        ),
+    }
+
+
+@tool(
+    "List every explored room the AI player can reach with the movement left this turn, "
+    "and the unexplored doors within reach where a new room can be revealed.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "max_moves": {
+            "type": "integer",
+            "description": "Optional movement budget (default: movement remaining this turn)",
+        },
+    },
+    required=["session_id"],
+)
+def get_reachable_rooms(session_id: str, max_moves: int = None) -> dict:
+    """
+    Get the rooms and reveal candidates within the AI player's movement.
+
+    Args:
+        session_id: The game session ID
+        max_moves: Optional movement budget (defaults to the movement
+            remaining this turn)
 
-    state["turnState"] = turn_state
-    save_history_file(session_id, state)
+    Returns:
+        Reachable rooms with their distance and route, and unexplored doors
+        that can be moved through, nearest first
+    """
+    state = load_history_file(session_id)
+    if state is None:
+        return {"error": f"Session not found: {session_id}"}
+
+    ai_player = _get_ai_player(state)
+    if ai_player is None:
+        return {"error": "No AI player found in this session"}
+
+    current_room = _get_room_by_id(state, ai_player.get("currentPosition", {}).get("roomId"))
+    if current_room is None:
+        return {"error": "Current room not found"}
+
+    movement_remaining = state.get("turnState", {}).get("movementRemaining", 0)
+    budget = movement_remaining if max_moves is None else max_moves
+
+    tree = _route_tree(state, current_room, max(budget, 0))
+    index = get_map_index(state)
+
+    rooms = []
+    reveal_candidates = []
+    for room_id, (moves, _, _, room) in tree.items():
+        steps = _route_steps(tree, room_id)
+        uses_stairs = any(step["action"] == "use_stairs" for step in steps)
+        if moves > 0:
+            rooms.append({
+                "room": _room_summary(room),
+                "distance": moves,
+                "usesStairs": uses_stairs,
+                "steps": steps,
+            })
+
+        # Moving through an unexplored door costs one more move
+        if moves >= budget:
+            continue
+        for door in index.frontier_doors(room_id):
+            reveal_candidates.append({
+                "roomId": room_id,
+                "direction": door.side,
+                "targetPosition": {"floor": door.floor, "x": door.x, "y": door.y},
+                "distance": moves + 1,
+                "usesStairs": uses_stairs,
+                "steps": steps,
+            })
+
+    return {
+        "from": _room_summary(current_room),
+        "movementRemaining": movement_remaining,
+        "maxMoves": budget,
+        "rooms": rooms,
+        "revealCandidates": reveal_candidates,
+        "message": (
+            f"{len(rooms)} room(s) and {len(reveal_candidates)} unexplored door(s) "
+            f"within {budget} move(s)"
+        ),
+    }
 
+
+def _parse_step(step: str | dict) -> tuple[str, str] | None:
+    """
+    Read a move_path step as ("move", direction) or ("use_stairs", floor).
+
+    A step is a direction or stair floor name, or a step dict as returned
+    by find_path and get_reachable_rooms. Returns None if it is neither.
+    """
+    if isinstance(step, dict):
+        action = step.get("action")
+        if action == "move" and isinstance(step.get("direction"), str):
+            return "move", step["direction"]
+        if action == "use_stairs" and isinstance(step.get("targetFloor"), str):
+            return "use_stairs", step["targetFloor"].lower()
+        return None
+
+    if not isinstance(step, str):
+        return None
+    if step.lower() in STAIR_FLOORS:
+        return "use_stairs", step.lower()
+    return "move", step
+
+
+@tool(
+    "Move the AI player along a path of several steps in one call. Each step is a "
+    "direction (up/down/left/right), a floor (upper/ground/basement) to take the stairs, "
+    "or a step object from find_path / get_reachable_rooms, so a planned route can be "
+    "passed as is. Stops after a step that needs a room reveal, enters a room with a "
+    "token to draw, or enters a room with an effect. If a step is invalid, no step is "
+    "applied.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "steps": {
+            "type": "array",
+            "items": {
+                "anyOf": [
+                    {"type": "string"},
+                    {
+                        "type": "object",
+                        "properties": {
+                            "action": {"type": "string", "enum": ["move", "use_stairs"]},
+                            "direction": {"type": "string"},
+                            "targetFloor": {"type": "string"},
+                        },
+                        "required": ["action"],
+                    },
+                ],
+            },
+            "description": (
+                "Steps in order: directions and stair floors (e.g. ['up', 'left', 'upper']) "
+                "or the 'steps' of a find_path result"
+            ),
+        },
+    },
+    required=["session_id", "steps"],
+)
+def move_path(session_id: str, steps: list[str | dict]) -> dict:
+    """
+    Apply a sequence of move_direction / use_stairs steps in one transaction.
+
+    Args:
+        session_id: The game session ID
+        steps: Directions (up/down/left/right) and stair target floors
+            (upper/ground/basement), or the step dicts of find_path
+
+    Returns:
+        Per-step results, where and why the path stopped, and the new
+        position. If any step fails, nothing is applied and the failing
+        step's error is returned.
+    """
+    if not steps:
+        return {"error": "At least one step is required"}
+
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
+
+        ai_player = _get_ai_player(state)
+        if ai_player is None:
+            return {"error": "No AI player found in this session"}
+
+        turn_state = state.get("turnState", {})
+        if turn_state.get("currentPlayerId") != ai_player.get("id"):
+            return {"error": "Not AI's turn"}
+
+        movement_remaining = turn_state.get("movementRemaining", 0)
+        if len(steps) > movement_remaining:
+            return {
+                "error": f"Path has {len(steps)} steps but only {movement_remaining} "
+                         "movement remaining",
+                "movementRemaining": movement_remaining,
+            }
+
+        # Move and stairs events only change the position and the turn
+        # state; they are put back, and the queued events dropped, if a
+        # later step fails
+        start_position = ai_player.get("currentPosition")
+        start_turn_state = dict(turn_state)
+        queued = len(txn.actions)
+
+        results = []
+        stop_reason = None
+        for index, step in enumerate(steps):
+            parsed = _parse_step(step)
+            if parsed is None:
+                result = {"error": f"Invalid step: {step!r}"}
+            elif parsed[0] == "use_stairs":
+                result = _use_stairs(txn, ai_player, parsed[1])
+            else:
+                result = _move_direction(txn, ai_player, parsed[1])
+
+            if "error" in result:
+                ai_player["currentPosition"] = start_position
+                turn_state.clear()
+                turn_state.update(start_turn_state)
+                del txn.actions[queued:]
+                return {
+                    "error": f"Step {index + 1} ({parsed[1] if parsed else step!r}) failed: "
+                             f"{result['error']}",
+                    "failedStep": index,
+                    "stepResult": result,
+                    "message": "No steps were applied",
+                }
+            results.append({"step": step, **result})
+
+            if result.get("awaitingRoomReveal"):
+                stop_reason = "reveal"
+            elif result.get("hasToken"):
+                stop_reason = "token"
+            else:
+                room_id = ai_player.get("currentPosition", {}).get("roomId")
+                room = _get_room_by_id(state, room_id)
+                room_text = _room_effect_text(room) if room is not None else None
+                if room_text:
+                    results[-1]["roomText"] = room_text
+                    stop_reason = "roomEffect"
+            if stop_reason:
+                break
+
+    stop_messages = {
+        "reveal": "A new room needs to be revealed. Use 'reveal_room' with the drawn room name.",
+        "token": "Entered a room with a token to draw",
+        "roomEffect": "Entered a room with an effect",
+    }
     return {
         "success": True,
-        "pendingDirection": side,
-        "requiredDoor": OPPOSITE_SIDE.get(side),
-        "message": f"Ready to reveal room in {side} direction",
+        "stepsTaken": len(results),
+        "stepsRequested": len(steps),
+        "stopReason": stop_reason,
+        "results": results,
+        "newPosition": ai_player.get("currentPosition"),
+        "movementRemaining": turn_state.get("movementRemaining", 0),
+        "message": stop_messages.get(stop_reason, f"Moved {len(results)} step(s)"),
     }
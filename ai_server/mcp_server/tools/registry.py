@@ -0,0 +1,111 @@
+"""
+Registry of the tools exposed by the MCP server.
+
+Each tool function declares its MCP name, description and input schema with
+the @tool decorator. Schema properties map one-to-one onto keyword arguments
+of the function, so dispatching a call is a dict lookup plus a keyword call.
+"""
+
+import inspect
+from typing import Any, Callable, NamedTuple
+
+
+class ToolSpec(NamedTuple):
+    """A registered tool."""
+
+    name: str
+    description: str
+    input_schema: dict
+    func: Callable[..., Any]
+    not_found: str | None
+    cacheable: bool
+
+
+# Tool name -> spec, in registration order
+TOOLS: dict[str, ToolSpec] = {}
+
+
+def tool(
+    description: str,
+    *,
+    name: str | None = None,
+    properties: dict | None = None,
+    required: list[str] | None = None,
+    not_found: str | None = None,
+    cacheable: bool = False,
+):
+    """
+    Register a function as an MCP tool.
+
+    Args:
+        description: Tool description shown to the client
+        name: Tool name (defaults to the function name)
+        properties: JSON schema properties, one per function argument
+        required: Names of the required properties
+        not_found: Error message returned when the function returns nothing
+        cacheable: Whether the result depends only on the arguments and the
+            static game data, so the response can be cached
+
+    Returns:
+        Decorator that registers the function and returns it unchanged
+
+    Raises:
+        ValueError: If the name is taken or a property is not an argument
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        tool_name = name or func.__name__
+        if tool_name in TOOLS:
+            raise ValueError(f"Tool already registered: {tool_name}")
+
+        schema_properties = properties or {}
+        parameters = inspect.signature(func).parameters
+        unknown = [p for p in schema_properties if p not in parameters]
+        if unknown:
+            raise ValueError(f"Tool {tool_name} has no argument(s): {', '.join(unknown)}")
+
+        TOOLS[tool_name] = ToolSpec(
+            name=tool_name,
+            description=description,
+            input_schema={
+                "type": "object",
+                "properties": schema_properties,
+                "required": list(required or []),
+            },
+            func=func,
+            not_found=not_found,
+            cacheable=cacheable,
+        )
+        return func
+
+    return decorator
+
+
+def dispatch(name: str, arguments: dict) -> Any:
+    """
+    Call a registered tool.
+
+    Arguments that are not in the tool's schema are ignored.
+
+    Args:
+        name: The tool name
+        arguments: Tool arguments from the client
+
+    Returns:
+        The tool result, or an error dict for unknown tools, missing
+        arguments and empty not-found results
+    """
+    spec = TOOLS.get(name)
+    if spec is None:
+        return {"error": f"Unknown tool: {name}"}
+
+    missing = [r for r in spec.input_schema["required"] if r not in arguments]
+    if missing:
+        return {"error": f"Missing required argument(s): {', '.join(missing)}"}
+
+    schema_properties = spec.input_schema["properties"]
+    result = spec.func(**{k: v for k, v in arguments.items() if k in schema_properties})
+
+    if not result and spec.not_found:
+        return {"error": spec.not_found}
+    return result
@@ -3,41 +3,118 @@ MCP Tools for querying translation/rules data.
 """
 
 from typing import Any
-from ..data_loader import get_translations_data
+from ..data_loader import fold_name, get_catalog, normalize_name
+from .registry import tool
 
 
+def _translation_matches(term: str) -> tuple:
+    """
+    Find the (section, entry) pairs whose Vietnamese or English name is term.
+
+    Exact (case-insensitive) matches win; tone marks are ignored only when
+    there is no exact match.
+    """
+    catalog = get_catalog()
+    return (
+        catalog.translations_by_term.get(normalize_name(term))
+        or catalog.translations_by_folded_term.get(fold_name(term))
+        or ()
+    )
+
+
+def _translation_result(term: str, section: Any, entry: Any, to_lang: str) -> dict:
+    return {
+        "original": term,
+        "vi": entry.get("vi"),
+        "en": entry.get("en"),
+        "translation": entry.get(to_lang),
+        "category": section.get("title"),
+        "categoryId": section.get("id"),
+    }
+
+
+@tool(
+    "Translate a game term between Vietnamese and English.",
+    properties={
+        "term": {"type": "string", "description": "The term to translate"},
+        "to_lang": {
+            "type": "string",
+            "description": "Target language: 'en' or 'vi' (default: 'en')",
+        },
+    },
+    required=["term"],
+    not_found="Term not found",
+    cacheable=True,
+)
 def translate_term(term: str, to_lang: str = "en") -> dict | None:
     """
     Translate a game term between Vietnamese and English.
 
     Args:
-        term: The term to translate (case-insensitive).
+        term: The term to translate (case-insensitive, tone marks optional).
         to_lang: Target language ("en" for English, "vi" for Vietnamese).
 
     Returns:
         Dict with original term, translation, and category if found.
     """
-    data = get_translations_data()
-    sections = data.get("TRANSLATION_SECTIONS", [])
-    term_lower = term.lower()
-
-    for section in sections:
-        for entry in section.get("entries", []):
-            vi_term = entry.get("vi", "").lower()
-            en_term = entry.get("en", "").lower()
-
-            if term_lower == vi_term or term_lower == en_term:
-                return {
-                    "original": term,
-                    "vi": entry.get("vi"),
-                    "en": entry.get("en"),
-                    "category": section.get("title"),
-                    "categoryId": section.get("id"),
-                }
-
-    return None
+    matches = _translation_matches(term)
+    if not matches:
+        return None
+
+    section, entry = matches[0]
+    return _translation_result(term, section, entry, to_lang)
+
+
+@tool(
+    "Translate many game terms between Vietnamese and English in one call.",
+    properties={
+        "terms": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "The terms to translate",
+        },
+        "to_lang": {
+            "type": "string",
+            "description": "Target language: 'en' or 'vi' (default: 'en')",
+        },
+    },
+    required=["terms"],
+    cacheable=True,
+)
+def translate_terms(terms: list[str], to_lang: str = "en") -> dict:
+    """
+    Translate a batch of game terms between Vietnamese and English.
 
+    Args:
+        terms: The terms to translate (case-insensitive, tone marks optional).
+        to_lang: Target language ("en" for English, "vi" for Vietnamese).
 
+    Returns:
+        Dict with the translations found, in request order, and the terms
+        that were not found.
+    """
+    translations = []
+    not_found = []
+    for term in terms:
+        matches = _translation_matches(term)
+        if matches:
+            section, entry = matches[0]
+            translations.append(_translation_result(term, section, entry, to_lang))
+        else:
+            not_found.append(term)
+
+    return {"translations": translations, "notFound": not_found}
+
+
+@tool(
+    "Get translation for a specific trait name (Speed, Might, Sanity, Knowledge).",
+    properties={
+        "trait": {"type": "string", "description": "Trait name in any language"},
+    },
+    required=["trait"],
+    not_found="Trait not found",
+    cacheable=True,
+)
 def get_trait_translation(trait: str) -> dict | None:
     """
     Get translation for a trait name specifically.
@@ -48,26 +125,21 @@ def get_trait_translation(trait: str) -> dict | None:
     Returns:
         Dict with Vietnamese and English names.
     """
-    data = get_translations_data()
-    sections = data.get("TRANSLATION_SECTIONS", [])
-
-    # Find traits section
-    for section in sections:
+    # Only entries from the traits section
+    for section, entry in _translation_matches(trait):
         if section.get("id") == "traits":
-            trait_lower = trait.lower()
-            for entry in section.get("entries", []):
-                vi_term = entry.get("vi", "").lower()
-                en_term = entry.get("en", "").lower()
-
-                if trait_lower == vi_term or trait_lower == en_term:
-                    return {
-                        "vi": entry.get("vi"),
-                        "en": entry.get("en"),
-                    }
+            return {
+                "vi": entry.get("vi"),
+                "en": entry.get("en"),
+            }
 
     return None
 
 
+@tool(
+    "Get all translation sections (traits, items, omens, rooms) with their entries.",
+    cacheable=True,
+)
 def get_all_translations() -> dict:
     """
     Get all translation sections and entries.
@@ -75,18 +147,13 @@ def get_all_translations() -> dict:
     Returns:
         Dict with all translation categories and their entries.
     """
-    data = get_translations_data()
-    sections = data.get("TRANSLATION_SECTIONS", [])
-
-    result = {}
-    for section in sections:
-        section_id = section.get("id")
-        result[section_id] = {
+    return {
+        section_id: {
             "title": section.get("title"),
             "entries": section.get("entries", []),
         }
-
-    return result
+        for section_id, section in get_catalog().translation_sections.items()
+    }
 
 
 def get_translations_by_category(category_id: str) -> list[dict]:
@@ -99,11 +166,7 @@ def get_translations_by_category(category_id: str) -> list[dict]:
     Returns:
         List of translation entries in that category.
     """
-    data = get_translations_data()
-    sections = data.get("TRANSLATION_SECTIONS", [])
-
-    for section in sections:
-        if section.get("id") == category_id:
-            return section.get("entries", [])
-
-    return []
+    section = get_catalog().translation_sections.get(category_id)
+    if section is None:
+        return []
+    return list(section.get("entries", []))
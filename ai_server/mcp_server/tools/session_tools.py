@@ -12,24 +12,22 @@ from ..history_manager import (
     save_history_file,
     delete_history_file,
     list_sessions,
+    count_sessions,
     session_exists,
+    get_action_log,
 )
-from ..data_loader import get_characters_data, get_maps_data
+from ..data_loader import get_catalog, thaw
+from .registry import tool
 
 
 def _get_character_by_id(character_id: str) -> dict | None:
-    """Get character data by ID."""
-    data = get_characters_data()
-    for char in data.get("CHARACTERS", []):
-        if char.get("id") == character_id:
-            return char
-    return None
+    """Get a mutable copy of character data by ID, for building session state."""
+    return thaw(get_catalog().characters_by_id.get(character_id))
 
 
 def _get_starting_rooms() -> list[dict]:
-    """Get the three starting room tiles."""
-    data = get_maps_data()
-    return [room for room in data.get("ROOMS", []) if room.get("isStartingRoom")]
+    """Get mutable copies of the starting room tiles, for building session state."""
+    return thaw(get_catalog().starting_rooms)
 
 
 def _init_player_stats(character: dict) -> dict:
@@ -108,6 +106,25 @@ def _create_initial_map() -> dict:
     }
 
 
+@tool(
+    "Create a new game session with specified players. AI will be one of the players.",
+    properties={
+        "players": {
+            "type": "array",
+            "description": "List of players with characterId, name (optional), isAI (boolean)",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "characterId": {"type": "string"},
+                    "name": {"type": "string"},
+                    "isAI": {"type": "boolean"},
+                },
+                "required": ["characterId"],
+            },
+        },
+    },
+    required=["players"],
+)
 def create_game_session(players: list[dict]) -> dict:
     """
     Create a new game session.
@@ -172,8 +189,18 @@ def create_game_session(players: list[dict]) -> dict:
         "tokenDecks": {
             "omensRevealed": 0,
         },
-        "actionLog": [],
         "otherPlayersContext": [],
+        # First action log entry; the state it creates is the first snapshot
+        "actionLog": [{
+            "turn": 1,
+            "action": "create_session",
+            "details": {
+                "players": [
+                    {"id": p["id"], "characterId": p["characterId"], "isAI": p["isAI"]}
+                    for p in initialized_players
+                ],
+            },
+        }],
     }
 
     try:
@@ -193,6 +220,13 @@ def create_game_session(players: list[dict]) -> dict:
     }
 
 
+@tool(
+    "Load an existing game session by its ID.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID to load"},
+    },
+    required=["session_id"],
+)
 def load_game_session(session_id: str) -> dict | None:
     """
     Load an existing game session.
@@ -208,9 +242,21 @@ def load_game_session(session_id: str) -> dict | None:
     if state is None:
         return {"error": f"Session not found: {session_id}"}
 
-    return state
+    return {**state, "actionLog": get_action_log(session_id)}
 
 
+@tool(
+    "Get current game state summary or specific sections.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "include": {
+            "type": "array",
+            "description": "Sections to include: players, map, turnState, inventory, actionLog",
+            "items": {"type": "string"},
+        },
+    },
+    required=["session_id"],
+)
 def get_game_state(session_id: str, include: list[str] = None) -> dict:
     """
     Get current game state summary.
@@ -261,11 +307,18 @@ def get_game_state(session_id: str, include: list[str] = None) -> dict:
                 break
 
     if "actionLog" in include:
-        result["actionLog"] = state.get("actionLog", [])[-10:]  # Last 10 actions
+        result["actionLog"] = get_action_log(session_id, 10)  # Last 10 actions
 
     return result
 
 
+@tool(
+    "Delete a game session.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID to delete"},
+    },
+    required=["session_id"],
+)
 def delete_game_session(session_id: str) -> dict:
     """
     Delete a game session.
@@ -282,11 +335,56 @@ def delete_game_session(session_id: str) -> dict:
     return {"success": False, "error": f"Session not found: {session_id}"}
 
 
-def list_game_sessions() -> list[dict]:
+@tool(
+    "List game sessions with optional phase filter and sorting. Pass offset and/or "
+    "limit to get a page of sessions together with the total count instead of the "
+    "full list.",
+    properties={
+        "phase": {"type": "string", "description": "Only sessions in this game phase"},
+        "sort_by": {
+            "type": "string",
+            "enum": ["lastUpdated", "createdAt", "gamePhase", "playerCount", "sessionId"],
+            "description": "Field to sort by (default lastUpdated)",
+        },
+        "descending": {"type": "boolean", "description": "Sort descending (default true)"},
+        "offset": {"type": "integer", "description": "Number of sessions to skip (paged result)"},
+        "limit": {"type": "integer", "description": "Max sessions to return (paged result)"},
+    },
+)
+def list_game_sessions(
+    phase: str | None = None,
+    sort_by: str = "lastUpdated",
+    descending: bool = True,
+    offset: int | None = None,
+    limit: int | None = None,
+) -> list[dict] | dict:
     """
-    List all available game sessions.
+    List game sessions from the session index.
+
+    Args:
+        phase: Only include sessions in this game phase (e.g. "exploration")
+        sort_by: sessionId, createdAt, lastUpdated, gamePhase or playerCount
+        descending: Sort in descending order
+        offset: Number of sessions to skip
+        limit: Maximum number of sessions to return (None = all)
 
     Returns:
-        List of session summaries
+        List of session summaries. If offset or limit is given, a dict with
+        the page of summaries ("sessions"), the total matching count, offset
+        and limit.
     """
-    return list_sessions()
+    paged = offset is not None or limit is not None
+    try:
+        sessions = list_sessions(phase, sort_by, descending, offset or 0, limit)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    if not paged:
+        return sessions
+
+    return {
+        "sessions": sessions,
+        "total": count_sessions(phase),
+        "offset": offset or 0,
+        "limit": limit,
+    }
@@ -5,7 +5,8 @@ Handles player turn sequence, AI position tracking, and turn advancement.
 """
 
 from typing import Any
-from ..history_manager import load_history_file, save_history_file
+from ..history_manager import load_history_file, session_transaction
+from .registry import tool
 
 
 def _get_ai_player(state: dict) -> dict | None:
@@ -22,6 +23,18 @@ def _get_ai_player_id(state: dict) -> str | None:
     return ai_player.get("id") if ai_player else None
 
 
+@tool(
+    "Set the turn order for the game. User provides player sequence.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+        "player_order": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "List of player IDs in turn order",
+        },
+    },
+    required=["session_id", "player_order"],
+)
 def set_turn_order(session_id: str, player_order: list[str]) -> dict:
     """
     Set the turn order for the game.
@@ -33,52 +46,60 @@ def set_turn_order(session_id: str, player_order: list[str]) -> dict:
     Returns:
         Turn order configuration with AI position
     """
-    state = load_history_file(session_id)
-    if state is None:
-        return {"error": f"Session not found: {session_id}"}
-
-    # Validate all players exist
-    player_ids = {p.get("id") for p in state.get("players", [])}
-    for pid in player_order:
-        if pid not in player_ids:
-            return {"error": f"Player not found: {pid}"}
-
-    # Find AI player index in the order
-    ai_player_id = _get_ai_player_id(state)
-    ai_index = None
-    if ai_player_id and ai_player_id in player_order:
-        ai_index = player_order.index(ai_player_id)
-
-    # Create turn order structure
-    turn_order = {
-        "playerSequence": player_order,
-        "aiPlayerIndex": ai_index,
-        "currentTurnIndex": 0,
-    }
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
+
+        # Validate all players exist
+        player_ids = {p.get("id") for p in state.get("players", [])}
+        for pid in player_order:
+            if pid not in player_ids:
+                return {"error": f"Player not found: {pid}"}
+
+        # Find AI player index in the order
+        ai_player_id = _get_ai_player_id(state)
+        ai_index = None
+        if ai_player_id and ai_player_id in player_order:
+            ai_index = player_order.index(ai_player_id)
+
+        # Create turn order structure
+        turn_order = {
+            "playerSequence": player_order,
+            "aiPlayerIndex": ai_index,
+            "currentTurnIndex": 0,
+        }
 
-    state["turnOrder"] = turn_order
+        state["turnOrder"] = turn_order
 
-    # Update turnState to match
-    if player_order:
-        state["turnState"] = state.get("turnState", {})
-        state["turnState"]["currentPlayerId"] = player_order[0]
+        # Update turnState to match
+        if player_order:
+            state["turnState"] = state.get("turnState", {})
+            state["turnState"]["currentPlayerId"] = player_order[0]
 
-    save_history_file(session_id, state)
+        txn.save()
 
-    # Get player names for readability
-    player_names = {p.get("id"): p.get("name") for p in state.get("players", [])}
+        # Get player names for readability
+        player_names = {p.get("id"): p.get("name") for p in state.get("players", [])}
 
-    return {
-        "success": True,
-        "turnOrder": turn_order,
-        "playerNames": [player_names.get(pid, pid) for pid in player_order],
-        "aiPosition": ai_index + 1 if ai_index is not None else None,
-        "totalPlayers": len(player_order),
-        "firstPlayer": player_names.get(player_order[0], player_order[0]),
-        "isAIFirst": ai_index == 0 if ai_index is not None else False,
-    }
+        return {
+            "success": True,
+            "turnOrder": turn_order,
+            "playerNames": [player_names.get(pid, pid) for pid in player_order],
+            "aiPosition": ai_index + 1 if ai_index is not None else None,
+            "totalPlayers": len(player_order),
+            "firstPlayer": player_names.get(player_order[0], player_order[0]),
+            "isAIFirst": ai_index == 0 if ai_index is not None else False,
+        }
 
 
+@tool(
+    "Get current turn order and AI's position in sequence.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+    },
+    required=["session_id"],
+)
 def get_turn_order(session_id: str) -> dict:
     """
     Get the current turn order and AI's position.
@@ -125,6 +146,13 @@ def get_turn_order(session_id: str) -> dict:
     }
 
 
+@tool(
+    "Advance to the next player's turn.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+    },
+    required=["session_id"],
+)
 def advance_turn(session_id: str) -> dict:
     """
     Advance to the next player's turn.
@@ -135,62 +163,70 @@ def advance_turn(session_id: str) -> dict:
     Returns:
         Next player info and whether it's AI's turn
     """
-    state = load_history_file(session_id)
-    if state is None:
-        return {"error": f"Session not found: {session_id}"}
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
 
-    turn_order = state.get("turnOrder")
-    if not turn_order:
-        return {"error": "Turn order not set. Use set_turn_order first."}
+        turn_order = state.get("turnOrder")
+        if not turn_order:
+            return {"error": "Turn order not set. Use set_turn_order first."}
 
-    player_sequence = turn_order.get("playerSequence", [])
-    if not player_sequence:
-        return {"error": "No players in turn order"}
+        player_sequence = turn_order.get("playerSequence", [])
+        if not player_sequence:
+            return {"error": "No players in turn order"}
 
-    current_index = turn_order.get("currentTurnIndex", 0)
-    ai_index = turn_order.get("aiPlayerIndex")
+        current_index = turn_order.get("currentTurnIndex", 0)
+        ai_index = turn_order.get("aiPlayerIndex")
 
-    # Calculate next index
-    next_index = (current_index + 1) % len(player_sequence)
+        # Calculate next index
+        next_index = (current_index + 1) % len(player_sequence)
 
-    # Check if we completed a full round
-    completed_round = next_index == 0
-    turn_state = state.get("turnState", {})
+        # Check if we completed a full round
+        completed_round = next_index == 0
+        turn_state = state.get("turnState", {})
 
-    if completed_round:
-        # Increment turn number
-        turn_state["currentTurnNumber"] = turn_state.get("currentTurnNumber", 1) + 1
+        if completed_round:
+            # Increment turn number
+            turn_state["currentTurnNumber"] = turn_state.get("currentTurnNumber", 1) + 1
 
-    # Update turn order
-    turn_order["currentTurnIndex"] = next_index
-    state["turnOrder"] = turn_order
+        # Update turn order
+        turn_order["currentTurnIndex"] = next_index
+        state["turnOrder"] = turn_order
 
-    # Update turn state
-    next_player_id = player_sequence[next_index]
-    turn_state["currentPlayerId"] = next_player_id
-    turn_state["phase"] = "waiting"  # Reset phase for new player
-    state["turnState"] = turn_state
+        # Update turn state
+        next_player_id = player_sequence[next_index]
+        turn_state["currentPlayerId"] = next_player_id
+        turn_state["phase"] = "waiting"  # Reset phase for new player
+        state["turnState"] = turn_state
 
-    save_history_file(session_id, state)
+        txn.save()
 
-    # Get player names
-    player_names = {p.get("id"): p.get("name") for p in state.get("players", [])}
-    ai_player_id = _get_ai_player_id(state)
+        # Get player names
+        player_names = {p.get("id"): p.get("name") for p in state.get("players", [])}
+        ai_player_id = _get_ai_player_id(state)
 
-    return {
-        "success": True,
-        "previousPlayerIndex": current_index,
-        "currentTurnIndex": next_index,
-        "currentPlayerId": next_player_id,
-        "currentPlayerName": player_names.get(next_player_id, next_player_id),
-        "isAITurn": next_player_id == ai_player_id,
-        "completedRound": completed_round,
-        "turnNumber": turn_state.get("currentTurnNumber", 1),
-        "message": f"Now {player_names.get(next_player_id, next_player_id)}'s turn"
-        + (" (AI)" if next_player_id == ai_player_id else ""),
-    }
+        return {
+            "success": True,
+            "previousPlayerIndex": current_index,
+            "currentTurnIndex": next_index,
+            "currentPlayerId": next_player_id,
+            "currentPlayerName": player_names.get(next_player_id, next_player_id),
+            "isAITurn": next_player_id == ai_player_id,
+            "completedRound": completed_round,
+            "turnNumber": turn_state.get("currentTurnNumber", 1),
+            "message": f"Now {player_names.get(next_player_id, next_player_id)}'s turn"
+            + (" (AI)" if next_player_id == ai_player_id else ""),
+        }
 
 
+@tool(
+    "Get list of players who play before AI in current round.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+    },
+    required=["session_id"],
+)
 def get_players_before_ai(session_id: str) -> dict:
     """
     Get list of players who play before AI in the current round.
@@ -253,6 +289,13 @@ def get_players_before_ai(session_id: str) -> dict:
     }
 
 
+@tool(
+    "Get detailed info about whose turn it currently is.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+    },
+    required=["session_id"],
+)
 def get_current_player_info(session_id: str) -> dict:
     """
     Get detailed info about whose turn it currently is.
@@ -5,7 +5,8 @@ Handles turn phases, movement calculation, and available actions.
 """
 
 from typing import Any
-from ..history_manager import load_history_file, save_history_file, add_action_to_log
+from ..history_manager import get_map_index, load_history_file, session_transaction
+from .registry import tool
 
 
 def _get_ai_player(state: dict) -> dict | None:
@@ -30,6 +31,13 @@ def _get_current_speed(player: dict) -> int:
     return speed_stat.get("currentValue", 4)
 
 
+@tool(
+    "Start the AI player's turn. Calculates movement points from Speed stat.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+    },
+    required=["session_id"],
+)
 def start_turn(session_id: str) -> dict:
     """
     Start the AI player's turn.
@@ -42,70 +50,66 @@ def start_turn(session_id: str) -> dict:
     Returns:
         Turn info including movement points, current position, and available actions
     """
-    state = load_history_file(session_id)
-    if state is None:
-        return {"error": f"Session not found: {session_id}"}
-
-    ai_player = _get_ai_player(state)
-    if ai_player is None:
-        return {"error": "No AI player found in this session"}
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
+
+        ai_player = _get_ai_player(state)
+        if ai_player is None:
+            return {"error": "No AI player found in this session"}
+
+        turn_state = state.get("turnState", {})
+        current_player_id = turn_state.get("currentPlayerId")
+
+        # Check if it's AI's turn
+        if current_player_id != ai_player.get("id"):
+            current_player = _get_player_by_id(state, current_player_id)
+            return {
+                "error": "Not AI's turn",
+                "currentPlayer": current_player.get("name") if current_player else current_player_id,
+                "aiPlayerId": ai_player.get("id"),
+            }
+
+        # Calculate movement from Speed
+        movement = _get_current_speed(ai_player)
+
+        # Enter the movement phase
+        txn.emit({
+            "turn": turn_state.get("currentTurnNumber", 1),
+            "playerId": ai_player.get("id"),
+            "action": "start_turn",
+            "event": "start_turn",
+            "details": {
+                "movementPoints": movement,
+                "position": ai_player.get("currentPosition"),
+            },
+        })
 
-    turn_state = state.get("turnState", {})
-    current_player_id = turn_state.get("currentPlayerId")
+        # Get current room info
+        current_pos = ai_player.get("currentPosition", {})
+        current_room = get_map_index(state).room_by_id(current_pos.get("roomId"))
 
-    # Check if it's AI's turn
-    if current_player_id != ai_player.get("id"):
-        current_player = _get_player_by_id(state, current_player_id)
         return {
-            "error": "Not AI's turn",
-            "currentPlayer": current_player.get("name") if current_player else current_player_id,
-            "aiPlayerId": ai_player.get("id"),
+            "turnNumber": turn_state.get("currentTurnNumber", 1),
+            "phase": "movement",
+            "movementRemaining": movement,
+            "currentPosition": current_pos,
+            "currentRoom": {
+                "name": current_room.get("roomName") if current_room else None,
+                "floor": current_pos.get("floor"),
+            },
+            "message": f"Turn {turn_state.get('currentTurnNumber', 1)} started. You have {movement} movement points.",
         }
 
-    # Calculate movement from Speed
-    movement = _get_current_speed(ai_player)
-
-    # Update turn state
-    turn_state["phase"] = "movement"
-    turn_state["movementRemaining"] = movement
-    turn_state["actionsThisTurn"] = []
-
-    state["turnState"] = turn_state
-    save_history_file(session_id, state)
-
-    # Log action
-    add_action_to_log(session_id, {
-        "turn": turn_state.get("currentTurnNumber", 1),
-        "playerId": ai_player.get("id"),
-        "action": "start_turn",
-        "details": {
-            "movementPoints": movement,
-            "position": ai_player.get("currentPosition"),
-        },
-    })
-
-    # Get current room info
-    current_pos = ai_player.get("currentPosition", {})
-    current_room_id = current_pos.get("roomId")
-    current_room = None
-    for room in state.get("map", {}).get("placedRooms", []):
-        if room.get("instanceId") == current_room_id:
-            current_room = room
-            break
-
-    return {
-        "turnNumber": turn_state.get("currentTurnNumber", 1),
-        "phase": "movement",
-        "movementRemaining": movement,
-        "currentPosition": current_pos,
-        "currentRoom": {
-            "name": current_room.get("roomName") if current_room else None,
-            "floor": current_pos.get("floor"),
-        },
-        "message": f"Turn {turn_state.get('currentTurnNumber', 1)} started. You have {movement} movement points.",
-    }
-
 
+@tool(
+    "End the AI player's turn and advance to next player.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+    },
+    required=["session_id"],
+)
 def end_turn(session_id: str) -> dict:
     """
     End the AI player's turn.
@@ -118,69 +122,69 @@ def end_turn(session_id: str) -> dict:
     Returns:
         Turn summary and next player info
     """
-    state = load_history_file(session_id)
-    if state is None:
-        return {"error": f"Session not found: {session_id}"}
-
-    ai_player = _get_ai_player(state)
-    if ai_player is None:
-        return {"error": "No AI player found in this session"}
-
-    turn_state = state.get("turnState", {})
-    players = state.get("players", [])
-
-    # Get current turn info for summary
-    turn_number = turn_state.get("currentTurnNumber", 1)
-    actions_this_turn = turn_state.get("actionsThisTurn", [])
-
-    # Find next player
-    current_player_id = turn_state.get("currentPlayerId")
-    current_index = next(
-        (i for i, p in enumerate(players) if p.get("id") == current_player_id),
-        0
-    )
-    next_index = (current_index + 1) % len(players)
-    next_player = players[next_index]
-
-    # If we wrapped around to first player, increment turn number
-    new_turn_number = turn_number
-    if next_index == 0:
-        new_turn_number = turn_number + 1
-
-    # Update turn state
-    turn_state["currentPlayerId"] = next_player.get("id")
-    turn_state["currentTurnNumber"] = new_turn_number
-    turn_state["phase"] = "waiting"
-    turn_state["movementRemaining"] = 0
-    turn_state["actionsThisTurn"] = []
-
-    state["turnState"] = turn_state
-    save_history_file(session_id, state)
-
-    # Log action
-    add_action_to_log(session_id, {
-        "turn": turn_number,
-        "playerId": ai_player.get("id"),
-        "action": "end_turn",
-        "details": {
-            "actionsCount": len(actions_this_turn),
-            "nextPlayer": next_player.get("id"),
-        },
-    })
+    with session_transaction(session_id) as txn:
+        state = txn.state
+        if state is None:
+            return {"error": f"Session not found: {session_id}"}
+
+        ai_player = _get_ai_player(state)
+        if ai_player is None:
+            return {"error": "No AI player found in this session"}
+
+        turn_state = state.get("turnState", {})
+        players = state.get("players", [])
+
+        # Get current turn info for summary
+        turn_number = turn_state.get("currentTurnNumber", 1)
+        actions_this_turn = turn_state.get("actionsThisTurn", [])
+
+        # Find next player
+        current_player_id = turn_state.get("currentPlayerId")
+        current_index = next(
+            (i for i, p in enumerate(players) if p.get("id") == current_player_id),
+            0
+        )
+        next_index = (current_index + 1) % len(players)
+        next_player = players[next_index]
+
+        # If we wrapped around to first player, increment turn number
+        new_turn_number = turn_number
+        if next_index == 0:
+            new_turn_number = turn_number + 1
+
+        # Hand the turn to the next player
+        txn.emit({
+            "turn": turn_number,
+            "playerId": ai_player.get("id"),
+            "action": "end_turn",
+            "event": "end_turn",
+            "details": {
+                "actionsCount": len(actions_this_turn),
+                "nextPlayer": next_player.get("id"),
+                "nextTurnNumber": new_turn_number,
+            },
+        })
 
-    return {
-        "turnEnded": turn_number,
-        "actionsThisTurn": len(actions_this_turn),
-        "nextPlayer": {
-            "id": next_player.get("id"),
-            "name": next_player.get("name"),
-            "isAI": next_player.get("isAI"),
-        },
-        "nextTurnNumber": new_turn_number,
-        "message": f"Turn {turn_number} ended. Next: {next_player.get('name')}",
-    }
+        return {
+            "turnEnded": turn_number,
+            "actionsThisTurn": len(actions_this_turn),
+            "nextPlayer": {
+                "id": next_player.get("id"),
+                "name": next_player.get("name"),
+                "isAI": next_player.get("isAI"),
+            },
+            "nextTurnNumber": new_turn_number,
+            "message": f"Turn {turn_number} ended. Next: {next_player.get('name')}",
+        }
 
 
+@tool(
+    "Get current turn state: whose turn, phase, movement remaining.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+    },
+    required=["session_id"],
+)
 def get_turn_state(session_id: str) -> dict:
     """
     Get current turn state.
@@ -216,6 +220,13 @@ def get_turn_state(session_id: str) -> dict:
     }
 
 
+@tool(
+    "Get list of actions the AI player can currently take.",
+    properties={
+        "session_id": {"type": "string", "description": "The session ID"},
+    },
+    required=["session_id"],
+)
 def get_available_actions(session_id: str) -> dict:
     """
     Get list of available actions for the AI player.
@@ -290,16 +301,13 @@ def get_available_actions(session_id: str) -> dict:
 
         # Check if in room with uncollected token
         current_pos = ai_player.get("currentPosition", {})
-        current_room_id = current_pos.get("roomId")
-        for room in state.get("map", {}).get("placedRooms", []):
-            if room.get("instanceId") == current_room_id:
-                if not room.get("tokenCollected") and room.get("tokens"):
-                    actions.append({
-                        "action": "collect_token",
-                        "description": f"Draw a token from this room",
-                        "availableTokens": room.get("tokens", []),
-                    })
-                break
+        room = get_map_index(state).room_by_id(current_pos.get("roomId"))
+        if room is not None and not room.get("tokenCollected") and room.get("tokens"):
+            actions.append({
+                "action": "collect_token",
+                "description": f"Draw a token from this room",
+                "availableTokens": room.get("tokens", []),
+            })
 
     return {
         "isAITurn": True,
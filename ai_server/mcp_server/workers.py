@@ -0,0 +1,55 @@
+"""
+Thread pool for blocking tool work.
+
+Tool implementations are plain synchronous functions that read and write
+session files and serialize JSON. The server awaits them through
+run_blocking() so a slow save never stalls the asyncio event loop that
+serves every other client.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+# Maximum number of tool calls running at the same time
+TOOL_WORKERS = int(os.environ.get("BAHOTH_TOOL_WORKERS", "8"))
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the shared worker pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(TOOL_WORKERS, 1),
+            thread_name_prefix="bahoth-tool",
+        )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a blocking function on the worker pool and await its result.
+
+    The caller's context variables (e.g. history_manager.expected_version)
+    are visible inside the function.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_executor(),
+        functools.partial(context.run, func, *args),
+    )
+
+
+def shutdown(wait: bool = True) -> None:
+    """Stop the worker pool, by default after the running calls finish."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
@@ -5,9 +5,13 @@ Entry point for the BAHOTH Game Info MCP Server.
 Run with:
     python run_mcp_server.py
 
+Rebuild the session index (e.g. after copying session files by hand):
+    python run_mcp_server.py --rebuild-session-index
+
 Or configure in Claude Desktop/Code as an MCP server.
 """
 
+import argparse
 import asyncio
 import sys
 from pathlib import Path
@@ -15,11 +19,26 @@ from pathlib import Path
 # Add the ai_server directory to Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from mcp_server.server import run_server
-
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="BAHOTH Game Info MCP Server")
+    parser.add_argument(
+        "--rebuild-session-index",
+        action="store_true",
+        help="Rebuild the session index from the stored sessions and exit",
+    )
+    args = parser.parse_args()
+
+    if args.rebuild_session_index:
+        from mcp_server import history_manager
+
+        count = history_manager.rebuild_session_index()
+        print(f"Indexed {count} sessions in {history_manager.HISTORY_DIR}")
+        return
+
+    from mcp_server.server import run_server
+
     try:
         asyncio.run(run_server())
     except KeyboardInterrupt:
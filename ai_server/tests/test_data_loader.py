@@ -0,0 +1,154 @@
+"""
+Tests for the game data loader: read-only data, name search and reloading.
+
+Run with:
+    python -m pytest tests
+"""
+
+import pickle
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp_server import data_loader
+from mcp_server.data_loader import SearchIndex, fold_name, get_catalog, thaw
+from mcp_server.tools import cards_tools, characters_tools, maps_tools
+
+
+def test_item_is_read_only():
+    item = cards_tools.get_item_by_id("long_vu_thien_than")
+
+    with pytest.raises(TypeError):
+        item["usable"] = False
+    with pytest.raises(TypeError):
+        item["name"]["vi"] = "changed"
+    with pytest.raises(TypeError):
+        del item["effect"]
+
+
+def test_nested_lists_are_tuples():
+    room = maps_tools.get_rooms_by_floor("ground")[0]
+
+    with pytest.raises(AttributeError):
+        room["doors"].append({"side": "left", "kind": "door"})
+    with pytest.raises(TypeError):
+        room["doors"][0]["side"] = "left"
+
+    traits = characters_tools.get_character_by_id("ox-bellows")["traits"]
+    with pytest.raises(TypeError):
+        traits["might"]["track"][0] = 8
+
+
+def test_catalog_indexes_are_read_only():
+    catalog = get_catalog()
+
+    with pytest.raises(TypeError):
+        catalog.cards_by_id["fake"] = {}
+    with pytest.raises(AttributeError):
+        catalog.items.append({})
+
+
+def test_results_share_cached_records():
+    item = cards_tools.get_item_by_id("long_vu_thien_than")
+
+    assert item is get_catalog().cards_by_id["long_vu_thien_than"]
+    assert item in cards_tools.get_item_by_name("long vu")
+
+
+def test_thaw_returns_independent_copy():
+    item = cards_tools.get_item_by_id("long_vu_thien_than")
+    copy = thaw(item)
+
+    copy["name"]["vi"] = "changed"
+
+    assert isinstance(copy["name"], dict)
+    assert item["name"]["vi"] != "changed"
+
+
+def test_fold_name_drops_diacritics():
+    assert fold_name("Hầm Mộ") == "ham mo"
+    assert fold_name("  Đèn   LỒNG ") == "den long"
+
+
+def test_search_without_diacritics():
+    rooms = maps_tools.get_room_by_name("ham mo")
+    assert [room["name"]["en"] for room in rooms] == ["Catacombs", "Crypt"]
+    assert rooms[0]["name"]["vi"] == "Hầm mộ (Catacombs)"
+    assert maps_tools.get_room_by_name("Hầm mộ") == rooms
+    assert maps_tools.get_room_by_name("HAM MO (crypt)")[0]["name"]["en"] == "Crypt"
+
+
+def _search_index(*names: str) -> SearchIndex:
+    return SearchIndex(tuple({"name": name} for name in names), [[name] for name in names])
+
+
+def _search(index: SearchIndex, query: str, fuzzy: bool = True) -> list[str]:
+    return [record["name"] for record in index.search(query, fuzzy)]
+
+
+def test_search_ranking():
+    index = _search_index("Old Library", "Libary", "Library Annex", "Library")
+
+    # Exact, prefix, substring, then one typo
+    assert _search(index, "library") == ["Library", "Library Annex", "Old Library", "Libary"]
+    assert _search(index, "library", fuzzy=False) == ["Library", "Library Annex", "Old Library"]
+    # Same rank: data order
+    assert _search(index, "libr") == ["Library Annex", "Library", "Old Library"]
+
+
+def test_search_fuzzy_cutoff():
+    index = _search_index("Old Library", "Libary", "Library Annex", "Library")
+
+    # Queries under 5 characters must match exactly
+    assert _search(index, "libx") == []
+    # One edit allowed from 5 to 8 characters, two from 9
+    assert _search(index, "librery") == ["Old Library", "Library Annex", "Library"]
+    assert _search(index, "lbrery") == []
+    assert _search(index, "old librry") == ["Old Library"]
+    assert _search(index, "old lbrry") == ["Old Library"]
+    assert _search(index, "librery", fuzzy=False) == []
+
+
+def test_failed_cache_write_still_loads(monkeypatch, capsys):
+    def fail(*args, **kwargs):
+        raise pickle.PicklingError("cannot pickle")
+
+    monkeypatch.setattr(data_loader, "_read_data_cache", lambda stamps: None)
+    monkeypatch.setattr(data_loader.pickle, "dump", fail)
+    data_loader.clear_cache()
+    try:
+        assert "long_vu_thien_than" in get_catalog().cards_by_id
+        assert "cache not written" in capsys.readouterr().err
+    finally:
+        monkeypatch.undo()
+        data_loader.clear_cache()
+
+
+def test_malformed_data_file_keeps_the_current_catalog(tmp_path, monkeypatch, capsys):
+    for filename in data_loader.DATA_FILES:
+        shutil.copy(data_loader._get_data_dir() / filename, tmp_path / filename)
+    monkeypatch.setattr(data_loader, "_get_data_dir", lambda: tmp_path)
+    monkeypatch.setattr(data_loader, "DATA_CACHE", False)
+    data_loader.clear_cache()
+    try:
+        catalog = get_catalog()
+        maps_path = tmp_path / data_loader.MAPS_FILE
+        original = maps_path.read_bytes()
+
+        # Valid JSON, but not a list of room dicts
+        maps_path.write_text('{"ROOMS": [5]}', encoding="utf-8")
+        assert not data_loader.reload_if_changed()
+        assert "reload failed" in capsys.readouterr().err
+        assert get_catalog() is catalog
+
+        maps_path.write_bytes(original)
+        assert data_loader.reload_if_changed()
+        assert get_catalog() is not catalog
+        assert get_catalog().rooms_by_name.keys() == catalog.rooms_by_name.keys()
+    finally:
+        monkeypatch.undo()
+        data_loader.clear_cache()
@@ -0,0 +1,91 @@
+"""
+Tests for the haunt lookups.
+
+Run with:
+    python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp_server import history_manager
+from mcp_server.session_store import create_store
+from mcp_server.tools.haunt_tools import get_haunt_outcomes, get_haunt_page
+
+
+@pytest.mark.parametrize("omen", ["skull", "Đầu Lâu", "dau lau", "SKULL"])
+@pytest.mark.parametrize("room", ["Hầm mộ", "Catacombs", "ham mo", "Hầm mộ (Catacombs)"])
+def test_haunt_page_by_any_name(omen, room):
+    result = get_haunt_page(omen, room)
+    assert result["hauntNumber"] == 37
+    assert result["omenKey"] == "skull"
+
+
+def test_haunt_page_errors():
+    result = get_haunt_page("no such omen", "Catacombs")
+    assert result["error"] == "Omen 'no such omen' not found"
+    assert any(omen["key"] == "skull" for omen in result["available_omens"])
+
+    assert get_haunt_page("skull", "Foyer") == {
+        "error": "Room 'Foyer' not found in haunt reference table",
+    }
+
+
+def _omen_room(room_id: str, name: dict) -> dict:
+    return {
+        "instanceId": room_id,
+        "roomName": name,
+        "floor": "basement",
+        "x": 0,
+        "y": 0,
+        "doors": {},
+        "tokens": ["omen"],
+        "tokenCollected": False,
+    }
+
+
+@pytest.fixture
+def session_id(tmp_path, monkeypatch):
+    """A session with the Catacombs placed under three spellings, and the Foyer."""
+    monkeypatch.setattr(history_manager, "SESSION_FLUSH_INTERVAL", 0)
+    history_manager.set_store(create_store("json", tmp_path))
+    state = {
+        "players": [],
+        "map": {
+            "placedRooms": [
+                _omen_room("room-001", {"en": "Catacombs", "vi": "Hầm mộ (Catacombs)"}),
+                _omen_room("room-002", {"vi": "Hầm Mộ"}),
+                _omen_room("room-003", {"en": "catacombs"}),
+                _omen_room("room-004", {"en": "Foyer"}),
+            ],
+        },
+        "turnState": {},
+    }
+    yield history_manager.create_history_file("s-1", state)
+    history_manager.set_store(None)
+
+
+def test_haunt_outcomes_by_any_name(session_id):
+    for omen in ("skull", "Đầu Lâu", "dau lau"):
+        result = get_haunt_outcomes(session_id, omen)
+        # The Foyer is not on the haunt table
+        assert [room["roomId"] for room in result["rooms"]] == ["room-001", "room-002", "room-003"]
+        for room in result["rooms"]:
+            assert [(h["omenKey"], h["hauntNumber"]) for h in room["haunts"]] == [("skull", 37)]
+
+    result = get_haunt_outcomes(session_id)
+    skull = [h for h in result["rooms"][0]["haunts"] if h["omenKey"] == "skull"]
+    assert skull[0]["hauntNumber"] == 37
+    assert skull[0]["traitorRule"]
+
+
+def test_haunt_outcomes_errors(session_id):
+    result = get_haunt_outcomes(session_id, "no such omen")
+    assert result["error"] == "Omen 'no such omen' not found"
+    assert result["available_omens"]
+
+    assert get_haunt_outcomes("missing", "skull") == {"error": "Session not found: missing"}
@@ -0,0 +1,257 @@
+"""
+Tests for session persistence: transactions, event replay and versions.
+
+Run with:
+    python -m pytest tests
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp_server import history_manager
+from mcp_server.session_store import create_store
+
+
+INITIAL_STATE = {
+    "players": [
+        {"id": "player-1", "name": "Ox Bellows", "isAI": True, "currentPosition": {}},
+    ],
+    "map": {"placedRooms": [], "nextRoomId": 1},
+    "turnState": {"currentPlayerId": "player-1", "movementRemaining": 0, "pendingRolls": []},
+}
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path, monkeypatch):
+    """Use a fresh store in a temporary directory, with write-behind on."""
+    monkeypatch.setattr(history_manager, "SESSION_FLUSH_INTERVAL", 60.0)
+    store = create_store(request.param, tmp_path)
+    history_manager.set_store(store)
+    yield store
+    history_manager.set_store(None)
+
+
+def _create_session(session_id: str = "s-1") -> str:
+    return history_manager.create_history_file(session_id, copy.deepcopy(INITIAL_STATE))
+
+
+def test_failed_transaction_keeps_unflushed_changes(store):
+    session_id = _create_session()
+    with history_manager.session_transaction(session_id) as txn:
+        txn.state["turnState"]["pendingRevealDirection"] = "left"
+        txn.save()
+
+    with pytest.raises(RuntimeError):
+        with history_manager.session_transaction(session_id) as txn:
+            txn.state["turnState"]["movementRemaining"] = 99
+            raise RuntimeError("tool failed")
+
+    state = history_manager.load_history_file(session_id)
+    assert state["turnState"]["pendingRevealDirection"] == "left"
+    assert state["turnState"]["movementRemaining"] == 0
+
+    history_manager.flush_sessions()
+    assert store.read(session_id)["turnState"]["pendingRevealDirection"] == "left"
+
+
+def test_failed_commit_keeps_the_cached_state(store, monkeypatch):
+    session_id = _create_session()
+    _play(session_id, 1)
+    with history_manager.session_transaction(session_id) as txn:
+        txn.state["turnState"]["pendingRevealDirection"] = "left"
+        txn.save()
+    before = copy.deepcopy(history_manager.load_history_file(session_id))
+
+    def fail(session_id, state, actions):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store, "append_actions", fail)
+    with pytest.raises(OSError):
+        _play(session_id, 1)
+    monkeypatch.undo()
+
+    assert history_manager.load_history_file(session_id) == before
+    history_manager.flush_sessions()
+    assert _reload(session_id) == before
+
+
+def _play(session_id: str, moves: int) -> None:
+    """Emit a start_turn event and one move event per transaction."""
+    with history_manager.session_transaction(session_id) as txn:
+        txn.emit({
+            "turn": 1,
+            "playerId": "player-1",
+            "action": "start_turn",
+            "event": "start_turn",
+            "details": {"movementPoints": moves},
+        })
+    for i in range(moves):
+        with history_manager.session_transaction(session_id) as txn:
+            txn.emit({
+                "turn": 1,
+                "playerId": "player-1",
+                "action": "move",
+                "event": "move",
+                "details": {
+                    "to": {"floor": "ground", "roomId": f"room-{i:03d}", "x": i, "y": 0},
+                    "movementRemaining": moves - i - 1,
+                },
+            })
+
+
+def _reload(session_id: str) -> dict:
+    """Forget the cached copy without writing it (like a restart) and load again."""
+    history_manager._evict_session(session_id)
+    return history_manager.load_history_file(session_id)
+
+
+def test_events_replay_to_the_same_state(store):
+    session_id = _create_session()
+    _play(session_id, 4)
+
+    state = copy.deepcopy(history_manager.load_history_file(session_id))
+    # Events are only logged; the snapshot is the one from creation
+    assert store.read(session_id)["actionLogOffset"] == 0
+
+    assert _reload(session_id) == state
+    assert state["actionCounts"] == {"start_turn": 1, "move": 4}
+    assert state["players"][0]["currentPosition"]["roomId"] == "room-003"
+    assert [a["action"] for a in history_manager.get_action_log(session_id)] == (
+        ["start_turn"] + ["move"] * 4
+    )
+
+
+def test_snapshot_every_n_events(store, monkeypatch):
+    monkeypatch.setattr(history_manager, "SESSION_SNAPSHOT_EVERY", 3)
+    monkeypatch.setattr(history_manager, "SESSION_FLUSH_INTERVAL", 0)
+    session_id = _create_session()
+
+    _play(session_id, 1)
+    assert store.read(session_id)["actionLogOffset"] == 0
+    _play(session_id, 2)
+    saved = store.read(session_id)
+    assert saved["actionLogOffset"] > 0
+    assert saved["actionCounts"] == {"start_turn": 2, "move": 1}
+
+    state = copy.deepcopy(history_manager.load_history_file(session_id))
+    assert _reload(session_id) == state
+
+
+def test_crash_between_append_and_snapshot(store, monkeypatch):
+    monkeypatch.setattr(history_manager, "SESSION_SNAPSHOT_EVERY", 3)
+    monkeypatch.setattr(history_manager, "SESSION_FLUSH_INTERVAL", 0)
+    session_id = _create_session()
+    _play(session_id, 1)
+    in_memory = copy.deepcopy(history_manager.load_history_file(session_id))
+
+    def crash(session_id, state):
+        raise OSError("disk full")
+
+    # The snapshot due after the second event never gets written
+    monkeypatch.setattr(store, "write", crash)
+    with pytest.raises(OSError):
+        _play(session_id, 0)
+    monkeypatch.undo()
+
+    with history_manager._cache_lock:
+        history_manager._session_cache.clear()
+    state = history_manager.load_history_file(session_id)
+    assert state["actionCounts"] == {"start_turn": 2, "move": 1}
+    assert state["turnState"]["movementRemaining"] == 0
+    assert state["players"] == in_memory["players"]
+    assert state["actionLogOffset"] > in_memory["actionLogOffset"]
+
+
+def test_partially_written_entry_is_truncated(tmp_path, monkeypatch):
+    monkeypatch.setattr(history_manager, "SESSION_FLUSH_INTERVAL", 0)
+    history_manager.set_store(create_store("json", tmp_path))
+    try:
+        session_id = _create_session()
+        _play(session_id, 1)
+        log_path = tmp_path / f"{session_id}.actions.jsonl"
+        with open(log_path, "ab") as f:
+            f.write(b'{"action":"move","event":"mo')
+
+        state = _reload(session_id)
+        assert state["actionCounts"] == {"start_turn": 1, "move": 1}
+
+        _play(session_id, 1)
+        assert _reload(session_id)["actionCounts"] == {"start_turn": 2, "move": 2}
+        assert b'"event":"mo\n' not in log_path.read_bytes()
+        assert log_path.read_bytes().endswith(b"}\n")
+    finally:
+        history_manager.set_store(None)
+
+
+def test_embedded_action_log_is_migrated(store):
+    legacy = copy.deepcopy(INITIAL_STATE)
+    legacy["meta"] = {"sessionId": "old", "version": 0, "gamePhase": "exploration"}
+    legacy["actionLog"] = [
+        {"turn": 1, "playerId": "player-1", "action": "move", "timestamp": "2025-01-01T00:00:00Z"},
+        {"turn": 1, "playerId": "player-1", "action": "end_turn", "timestamp": "2025-01-01T00:01:00Z"},
+    ]
+    store.create("old", legacy)
+
+    state = history_manager.load_history_file("old")
+    assert "actionLog" not in state
+    assert state["actionCounts"] == {"move": 1, "end_turn": 1}
+    assert [a["action"] for a in history_manager.get_action_log("old")] == ["move", "end_turn"]
+
+    history_manager.flush_sessions()
+    assert "actionLog" not in store.read("old")
+    assert _reload("old") == state
+
+
+def test_version_counts_log_entries_and_snapshots(store):
+    session_id = _create_session()
+    assert history_manager.load_history_file(session_id)["meta"]["version"] == 0
+
+    _play(session_id, 2)  # three events
+    assert history_manager.load_history_file(session_id)["meta"]["version"] == 3
+
+    with history_manager.session_transaction(session_id) as txn:
+        txn.state["turnState"]["pendingRevealDirection"] = "left"
+        txn.save()
+    assert history_manager.load_history_file(session_id)["meta"]["version"] == 4
+
+    # One log entry plus a snapshot: log() also marks the state as changed
+    with history_manager.session_transaction(session_id) as txn:
+        txn.log({"action": "note"})
+    assert history_manager.load_history_file(session_id)["meta"]["version"] == 6
+
+
+def _write_based_on(session_id: str, version: int, direction: str) -> None:
+    token = history_manager.expected_version.set(version)
+    try:
+        with history_manager.session_transaction(session_id) as txn:
+            txn.state["turnState"]["pendingRevealDirection"] = direction
+            txn.save()
+    finally:
+        history_manager.expected_version.reset(token)
+
+
+def test_second_writer_of_a_version_conflicts(store):
+    session_id = _create_session()
+    _play(session_id, 1)
+    version = history_manager.load_history_file(session_id)["meta"]["version"]
+
+    # Both clients read the same version; the first write wins
+    _write_based_on(session_id, version, "left")
+    with pytest.raises(history_manager.SessionConflictError) as conflict:
+        _write_based_on(session_id, version, "right")
+
+    assert conflict.value.expected == version
+    assert conflict.value.current == version + 1
+    state = history_manager.load_history_file(session_id)
+    assert state["turnState"]["pendingRevealDirection"] == "left"
+    assert state["meta"]["version"] == version + 1
+
+    # Retrying from the current version succeeds
+    _write_based_on(session_id, version + 1, "right")
+    state = history_manager.load_history_file(session_id)
+    assert state["turnState"]["pendingRevealDirection"] == "right"
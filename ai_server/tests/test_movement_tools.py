@@ -0,0 +1,441 @@
+"""
+Tests for the movement tools: moving, pending reveals and placing rooms.
+
+Run with:
+    python -m pytest tests
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp_server import history_manager
+from mcp_server.data_loader import get_catalog
+from mcp_server.doors import ALL_SIDES, side_mask
+from mcp_server.map_index import MapIndex
+from mcp_server.session_store import create_store
+from mcp_server.tools.movement_tools import (
+    OPPOSITE_SIDE,
+    _get_door_layout,
+    _get_room_data_by_name,
+    calculate_valid_rotations,
+    find_path,
+    get_reachable_rooms,
+    get_exploration_frontier,
+    move_direction,
+    move_path,
+    reveal_room,
+    set_pending_room_reveal,
+)
+
+
+def _door(kind: str = "door", connected_to: str | None = None) -> dict:
+    return {"kind": kind, "connectedTo": connected_to}
+
+
+def _room(room_id: str, name: str, x: int, y: int, doors: dict, floor: str = "ground") -> dict:
+    return {
+        "instanceId": room_id,
+        "roomName": {"en": name},
+        "floor": floor,
+        "x": x,
+        "y": y,
+        "rotation": 0,
+        "doors": doors,
+        "tokens": [],
+        "tokenCollected": True,
+    }
+
+
+# Foyer at (0, 0) with the Entrance Hall below it and a hallway up-left
+INITIAL_STATE = {
+    "players": [
+        {
+            "id": "player-1",
+            "name": "Ox Bellows",
+            "isAI": True,
+            "currentPosition": {"floor": "ground", "roomId": "room-002", "x": 0, "y": 0},
+        },
+    ],
+    "map": {
+        "placedRooms": [
+            _room("room-001", "Entrance Hall", 0, -1, {
+                "top": _door(connected_to="room-002"),
+                "bottom": _door("front-door"),
+            }),
+            _room("room-002", "Foyer", 0, 0, {
+                "top": _door(),
+                "right": _door(),
+                "bottom": _door(connected_to="room-001"),
+                "left": _door(),
+            }),
+            _room("room-003", "Dusty Hallway", -1, 1, {
+                "bottom": _door(),
+                "right": _door(),
+            }),
+        ],
+        "nextRoomId": 4,
+    },
+    "turnState": {
+        "currentPlayerId": "player-1",
+        "currentTurnNumber": 1,
+        "movementRemaining": 4,
+        "pendingRolls": [],
+    },
+}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Use a fresh store in a temporary directory."""
+    monkeypatch.setattr(history_manager, "SESSION_FLUSH_INTERVAL", 0)
+    history_manager.set_store(create_store("json", tmp_path))
+    yield
+    history_manager.set_store(None)
+
+
+@pytest.fixture
+def session_id(store):
+    return history_manager.create_history_file("s-1", copy.deepcopy(INITIAL_STATE))
+
+
+def _turn_state(session_id: str) -> dict:
+    return history_manager.load_history_file(session_id)["turnState"]
+
+
+def test_pending_reveal_only_applies_in_its_room(session_id):
+    assert set_pending_room_reveal(session_id, "right")["success"]
+    assert get_exploration_frontier(session_id)["pendingRevealDirection"] == "right"
+
+    # Leaving the room forgets it
+    assert move_direction(session_id, "down")["success"]
+    assert "pendingRevealDirection" not in _turn_state(session_id)
+    assert move_direction(session_id, "up")["success"]
+
+    result = reveal_room(session_id, "Creaky Hallway")
+    assert result["success"]
+    assert result["room"]["position"] == {"x": 0, "y": 1}
+
+
+def test_pending_reveal_set_in_another_room_is_ignored(session_id):
+    set_pending_room_reveal(session_id, "right")
+    with history_manager.session_transaction(session_id) as txn:
+        txn.state["turnState"]["pendingRevealRoomId"] = "room-001"
+        txn.save()
+
+    assert get_exploration_frontier(session_id)["pendingRevealDirection"] is None
+    result = reveal_room(session_id, "Creaky Hallway")
+    assert result["room"]["position"] == {"x": 0, "y": 1}
+    assert "pendingRevealDirection" not in _turn_state(session_id)
+
+
+def test_move_into_unexplored_door_sets_the_reveal_direction(session_id):
+    result = move_direction(session_id, "left")
+    assert result["awaitingRoomReveal"]
+    turn_state = _turn_state(session_id)
+    assert turn_state["pendingRevealDirection"] == "left"
+    assert turn_state["pendingRevealRoomId"] == "room-002"
+
+    # Placed behind the left door, not the first unexplored one (top)
+    result = reveal_room(session_id, "Creaky Hallway")
+    assert result["room"]["position"] == {"x": -1, "y": 0}
+
+
+def test_move_path_stopping_at_a_reveal_sets_the_reveal_direction(session_id):
+    result = move_path(session_id, ["down", "up", "left", "up"])
+    assert result["stopReason"] == "reveal"
+    assert result["stepsTaken"] == 3
+    assert _turn_state(session_id)["pendingRevealDirection"] == "left"
+    assert reveal_room(session_id, "Creaky Hallway")["room"]["position"] == {"x": -1, "y": 0}
+
+
+def _doors(state: dict, room_id: str) -> dict:
+    room = next(r for r in state["map"]["placedRooms"] if r["instanceId"] == room_id)
+    return {side: door["connectedTo"] for side, door in room["doors"].items()}
+
+
+def test_revealed_room_connects_to_facing_doors(session_id):
+    move_direction(session_id, "left")
+    assert reveal_room(session_id, "Creaky Hallway")["room"]["id"] == "room-004"
+
+    state = copy.deepcopy(history_manager.load_history_file(session_id))
+    # The hallway above had a door facing the new room's top door
+    assert _doors(state, "room-004") == {
+        "top": "room-003", "right": "room-002", "bottom": None, "left": None,
+    }
+    assert _doors(state, "room-003") == {"bottom": "room-004", "right": None}
+    assert _doors(state, "room-002")["left"] == "room-004"
+
+    frontier = {
+        (door["room"]["id"], door["direction"])
+        for door in get_exploration_frontier(session_id)["frontier"]
+    }
+    assert frontier == {
+        ("room-002", "top"), ("room-002", "right"), ("room-003", "right"),
+        ("room-004", "bottom"), ("room-004", "left"),
+    }
+
+    # The connections are replayed from the log
+    history_manager._evict_session(session_id)
+    assert history_manager.load_history_file(session_id) == state
+
+    assert move_direction(session_id, "up")["room"]["id"] == "room-003"
+
+
+def test_map_index_frontier():
+    rooms = copy.deepcopy(INITIAL_STATE["map"]["placedRooms"])
+    index = MapIndex(rooms)
+    assert [(door.room_id, door.side) for door in index.frontier_doors()] == [
+        ("room-002", "top"), ("room-002", "right"), ("room-002", "left"),
+        ("room-003", "bottom"), ("room-003", "right"),
+    ]
+    assert index.frontier_door("room-002", "left") == ("room-002", "left", "ground", -1, 0)
+    assert index.frontier_door("room-002", "bottom") is None
+
+    # Only open doors facing the cell count: the Foyer's top door does not
+    # face (-1, 0), and the Entrance Hall has no door towards it
+    facing = index.facing_doors("ground", -1, 0, ALL_SIDES)
+    assert [(side, room["instanceId"]) for side, room in facing] == [
+        ("top", "room-003"), ("right", "room-002"),
+    ]
+    assert index.facing_doors("ground", -1, 0, side_mask(["bottom", "left"])) == []
+
+    # Placing a room closes every frontier door into its cell
+    rooms.append(_room("room-004", "Creaky Hallway", -1, 0, {
+        "top": _door(connected_to="room-003"),
+        "right": _door(connected_to="room-002"),
+        "left": _door(),
+    }))
+    assert index.frontier_doors("room-003") == [("room-003", "right", "ground", 0, 1)]
+    assert index.frontier_doors("room-004") == [("room-004", "left", "ground", -2, 0)]
+    assert index.room_at("ground", -1, 0) is rooms[-1]
+
+
+def _rotate_doors(base_doors: list[dict], rotation: int) -> dict:
+    """The dict-based rotation the door layouts replaced."""
+    rotation_map = {
+        0: {"top": "top", "right": "right", "bottom": "bottom", "left": "left"},
+        90: {"top": "right", "right": "bottom", "bottom": "left", "left": "top"},
+        180: {"top": "bottom", "right": "left", "bottom": "top", "left": "right"},
+        270: {"top": "left", "right": "top", "bottom": "right", "left": "bottom"},
+    }
+    mapping = rotation_map.get(rotation % 360, rotation_map[0])
+    return {
+        mapping.get(door.get("side"), door.get("side")): {
+            "kind": door.get("kind"),
+            "connectedTo": None,
+        }
+        for door in base_doors
+    }
+
+
+def test_door_layouts_match_dict_rotation(session_id):
+    names = {room["name"]["en"] for room in get_catalog().rooms}
+    for name in sorted(names):
+        room_data = _get_room_data_by_name(name)
+        layout = _get_door_layout(room_data)
+        for turns, rotation in enumerate((0, 90, 180, 270)):
+            rotated = _rotate_doors(room_data["doors"], rotation)
+            # Same sides and kinds, in the same order
+            assert list(layout.doors[turns]) == [
+                (side, door["kind"]) for side, door in rotated.items()
+            ], (name, rotation)
+
+        for entry_side in ("top", "right", "bottom", "left"):
+            required = OPPOSITE_SIDE[entry_side]
+            expected = [
+                (rotation, list(_rotate_doors(room_data["doors"], rotation)))
+                for rotation in (0, 90, 180, 270)
+                if required in _rotate_doors(room_data["doors"], rotation)
+            ]
+            result = calculate_valid_rotations(session_id, name, entry_side)
+            actual = [
+                (option["rotation"], option["resultingDoors"])
+                for option in result.get("validRotations", [])
+            ]
+            assert actual == expected, (name, entry_side)
+            assert ("error" in result) == (not expected)
+
+
+def _path_state() -> dict:
+    """
+    Explored rooms on two floors, with the AI player in the Entrance Hall.
+
+    Ground floor (x, y):     Upper floor:
+      (0, 1) Staircase         (-1, 0) Bedroom - (0, 0) Upper Landing
+      (0, 0) Foyer - (1, 0) Dusty - (2, 0) Kitchen
+      (-1, -1) Creaky - (0, -1) Entrance - (1, -1) Ballroom - (2, -1) Gardens
+    and a Vault at (5, 5) that no door leads to.
+    """
+    state = copy.deepcopy(INITIAL_STATE)
+    state["players"][0]["currentPosition"] = {
+        "floor": "ground", "roomId": "room-001", "x": 0, "y": -1,
+    }
+    state["map"] = {
+        "placedRooms": [
+            _room("room-001", "Entrance Hall", 0, -1, {
+                "top": _door(connected_to="room-002"),
+                "left": _door(connected_to="room-004"),
+                "right": _door(connected_to="room-007"),
+                "bottom": _door("front-door"),
+            }),
+            _room("room-002", "Foyer", 0, 0, {
+                "top": _door(connected_to="room-003"),
+                "right": _door(connected_to="room-005"),
+                "bottom": _door(connected_to="room-001"),
+            }),
+            _room("room-003", "Grand Staircase", 0, 1, {
+                "bottom": _door(connected_to="room-002"),
+                "top": _door("stairs"),
+            }),
+            _room("room-004", "Creaky Hallway", -1, -1, {
+                "right": _door(connected_to="room-001"),
+                "top": _door(),
+            }),
+            _room("room-005", "Dusty Hallway", 1, 0, {
+                "left": _door(connected_to="room-002"),
+                "right": _door(connected_to="room-006"),
+            }),
+            _room("room-006", "Kitchen", 2, 0, {
+                "left": _door(connected_to="room-005"),
+                "bottom": _door(connected_to="room-008"),
+                "top": _door(),
+            }),
+            _room("room-007", "Ballroom", 1, -1, {
+                "left": _door(connected_to="room-001"),
+                "right": _door(connected_to="room-008"),
+            }),
+            _room("room-008", "Gardens", 2, -1, {
+                "left": _door(connected_to="room-007"),
+                "top": _door(connected_to="room-006"),
+            }),
+            _room("room-009", "Upper Landing", 0, 0, {
+                "bottom": _door("stairs"),
+                "left": _door(connected_to="room-010"),
+                "top": _door(),
+            }, floor="upper"),
+            _room("room-010", "Bedroom", -1, 0, {
+                "right": _door(connected_to="room-009"),
+                "left": _door(),
+            }, floor="upper"),
+            _room("room-011", "Vault", 5, 5, {"top": _door()}),
+        ],
+        "nextRoomId": 12,
+    }
+    return state
+
+
+@pytest.fixture
+def path_session_id(store):
+    return history_manager.create_history_file("s-2", _path_state())
+
+
+def _moves(steps: list[dict]) -> list[tuple[str, str]]:
+    return [(step["action"], step.get("direction") or step.get("targetFloor")) for step in steps]
+
+
+def test_find_path_takes_the_fewest_moves(path_session_id):
+    # Through the Ballroom, not round by the Foyer and the Kitchen
+    result = find_path(path_session_id, "Gardens")
+    assert result["cost"] == 2
+    assert _moves(result["steps"]) == [("move", "right"), ("move", "right")]
+    assert [step["to"]["id"] for step in result["steps"]] == ["room-007", "room-008"]
+
+    result = find_path(path_session_id, "room-006")
+    assert result["cost"] == 3
+    assert result["target"]["id"] == "room-006"
+    assert result["reachableThisTurn"]
+
+
+def test_find_path_uses_stairs(path_session_id):
+    result = find_path(path_session_id, "Bedroom")
+    assert _moves(result["steps"]) == [
+        ("move", "top"), ("move", "top"), ("use_stairs", "upper"), ("move", "left"),
+    ]
+    assert result["target"] == {"id": "room-010", "name": {"en": "Bedroom"}, "floor": "upper"}
+    assert result["reachableThisTurn"]
+
+
+def test_find_path_errors(path_session_id):
+    result = find_path(path_session_id, "room-011")
+    assert result["error"].startswith("No explored route")
+    assert result["from"]["id"] == "room-001"
+
+    result = find_path(path_session_id, "Chapel")
+    assert result["needsReveal"]
+    assert "error" in find_path(path_session_id, "No Such Room")
+
+
+def test_find_path_to_the_current_room(path_session_id):
+    result = find_path(path_session_id, "Entrance Hall")
+    assert result["cost"] == 0
+    assert result["steps"] == []
+    assert result["target"] == result["from"]
+
+
+def test_move_path_follows_find_path_steps(path_session_id):
+    steps = find_path(path_session_id, "Bedroom")["steps"]
+    result = move_path(path_session_id, steps)
+    assert result["success"]
+    assert result["stepsTaken"] == 4
+    assert result["stopReason"] is None
+    assert result["newPosition"]["roomId"] == "room-010"
+    assert result["movementRemaining"] == 0
+
+    state = history_manager.load_history_file(path_session_id)
+    assert state["players"][0]["currentPosition"]["roomId"] == "room-010"
+    assert state["actionCounts"] == {"move": 3, "use_stairs": 1}
+
+
+def _distances(result: dict) -> dict[str, int]:
+    return {entry["room"]["id"]: entry["distance"] for entry in result["rooms"]}
+
+
+def test_reachable_rooms_within_the_movement_left(path_session_id):
+    result = get_reachable_rooms(path_session_id)
+    assert result["maxMoves"] == 4
+    assert _distances(result) == {
+        "room-002": 1, "room-004": 1, "room-007": 1,
+        "room-003": 2, "room-005": 2, "room-008": 2,
+        "room-006": 3, "room-009": 3,
+        "room-010": 4,
+    }
+    stairs = {entry["room"]["id"] for entry in result["rooms"] if entry["usesStairs"]}
+    assert stairs == {"room-009", "room-010"}
+    bedroom = next(entry for entry in result["rooms"] if entry["room"]["id"] == "room-010")
+    assert _moves(bedroom["steps"]) == [
+        ("move", "top"), ("move", "top"), ("use_stairs", "upper"), ("move", "left"),
+    ]
+
+
+def test_reachable_rooms_budget(path_session_id):
+    result = get_reachable_rooms(path_session_id, max_moves=1)
+    assert _distances(result) == {"room-002": 1, "room-004": 1, "room-007": 1}
+    assert result["revealCandidates"] == []
+
+    # The stairs cost a move like a door
+    assert "room-009" not in _distances(get_reachable_rooms(path_session_id, max_moves=2))
+    assert _distances(get_reachable_rooms(path_session_id, max_moves=3))["room-009"] == 3
+
+    assert get_reachable_rooms(path_session_id, max_moves=0)["rooms"] == []
+
+
+def test_reachable_reveal_candidates(path_session_id):
+    candidates = get_reachable_rooms(path_session_id)["revealCandidates"]
+    # The Bedroom's left door would take a fifth move; the Vault is cut off
+    assert [
+        (c["roomId"], c["direction"], c["distance"], c["usesStairs"]) for c in candidates
+    ] == [
+        ("room-004", "top", 2, False),
+        ("room-009", "top", 4, True),
+        ("room-006", "top", 4, False),
+    ]
+    assert candidates[0]["targetPosition"] == {"floor": "ground", "x": -1, "y": 0}
+    assert _moves(candidates[0]["steps"]) == [("move", "left")]
+
+    candidates = get_reachable_rooms(path_session_id, max_moves=2)["revealCandidates"]
+    assert [(c["roomId"], c["direction"]) for c in candidates] == [("room-004", "top")]
@@ -0,0 +1,71 @@
+"""
+Tests for the tool registry and the tool list the server publishes.
+
+Run with:
+    python -m pytest tests
+"""
+
+import inspect
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp_server import server
+from mcp_server.tools import registry
+
+
+def test_unknown_tool():
+    assert registry.dispatch("no_such_tool", {}) == {"error": "Unknown tool: no_such_tool"}
+
+
+def test_missing_required_argument():
+    assert registry.dispatch("get_haunt_page", {"omen": "skull"}) == {
+        "error": "Missing required argument(s): room",
+    }
+    assert registry.dispatch("get_haunt_page", {}) == {
+        "error": "Missing required argument(s): omen, room",
+    }
+
+
+def test_unknown_arguments_are_ignored():
+    result = registry.dispatch("get_haunt_page", {"omen": "skull", "room": "Catacombs", "x": 1})
+    assert result["hauntNumber"] == 37
+
+
+def test_every_tool_is_listed_once():
+    counts = Counter(tool.name for tool in server.TOOL_LIST)
+    assert [name for name, count in counts.items() if count > 1] == []
+    assert set(counts) == set(registry.TOOLS)
+
+
+@pytest.mark.parametrize("name", list(registry.TOOLS))
+def test_schema_matches_signature(name):
+    spec = registry.TOOLS[name]
+    listed = next(tool for tool in server.TOOL_LIST if tool.name == name)
+    parameters = inspect.signature(spec.func).parameters
+    properties = dict(listed.inputSchema["properties"])
+
+    # Session tools also accept the version the call is based on
+    if "session_id" in parameters:
+        assert properties.pop("expected_version") == server.EXPECTED_VERSION_SCHEMA
+    assert list(properties) == list(parameters)
+    assert listed.inputSchema["required"] == [
+        p for p, parameter in parameters.items() if parameter.default is inspect.Parameter.empty
+    ]
+    assert listed.description == spec.description
+
+
+def test_registering_a_bad_tool_fails():
+    with pytest.raises(ValueError, match="already registered"):
+        registry.tool("Duplicate", name="get_haunt_page")(lambda: None)
+
+    def lookup(name: str) -> dict:
+        return {}
+
+    with pytest.raises(ValueError, match="no argument"):
+        registry.tool("Bad schema", properties={"nmae": {"type": "string"}})(lookup)
+    assert "lookup" not in registry.TOOLS
@@ -0,0 +1,76 @@
+"""
+Tests for the translation tools.
+
+Run with:
+    python -m pytest tests
+"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp_server import data_loader
+from mcp_server.tools import registry
+from mcp_server.tools.rules_tools import get_trait_translation, translate_term, translate_terms
+
+
+def test_folded_lookup():
+    result = translate_term("suc manh")
+    assert result["en"] == "Might"
+    assert result["vi"] == "Sức Mạnh"
+    assert result["categoryId"] == "traits"
+
+    assert translate_term("  SỨC   mạnh ")["en"] == "Might"
+    assert translate_term("Might", "vi")["translation"] == "Sức Mạnh"
+
+
+def test_translate_terms_keeps_request_order():
+    result = translate_terms(["tri tue", "Crypt", "no such term", "Tốc Độ"])
+    assert [t["en"] for t in result["translations"]] == ["Knowledge", "Crypt", "Speed"]
+    assert [t["original"] for t in result["translations"]] == ["tri tue", "Crypt", "Tốc Độ"]
+    assert result["notFound"] == ["no such term"]
+
+
+@pytest.fixture
+def near_homograph(tmp_path, monkeypatch):
+    """Game data with an extra term that only differs from 'Sức Mạnh' in its tone marks."""
+    for filename in data_loader.DATA_FILES:
+        shutil.copy(data_loader._get_data_dir() / filename, tmp_path / filename)
+    path = tmp_path / data_loader.TRANSLATIONS_FILE
+    data = json.loads(path.read_text(encoding="utf-8"))
+    tokens = next(s for s in data["TRANSLATION_SECTIONS"] if s["id"] == "tokens")
+    tokens["entries"].append({"vi": "Súc Mành", "en": "Test Term"})
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    monkeypatch.setattr(data_loader, "_get_data_dir", lambda: tmp_path)
+    monkeypatch.setattr(data_loader, "DATA_CACHE", False)
+    data_loader.clear_cache()
+    yield
+    monkeypatch.undo()
+    data_loader.clear_cache()
+
+
+def test_exact_match_ranks_above_folded(near_homograph):
+    assert translate_term("Súc Mành")["en"] == "Test Term"
+    assert translate_term("Sức Mạnh")["en"] == "Might"
+    # Without tone marks both fold the same: data order decides
+    assert translate_term("suc manh")["en"] == "Might"
+    result = translate_terms(["Súc Mành", "sức mạnh"])
+    assert [t["en"] for t in result["translations"]] == ["Test Term", "Might"]
+
+
+def test_trait_translation_only_uses_the_traits_section():
+    assert get_trait_translation("suc manh") == {"vi": "Sức Mạnh", "en": "Might"}
+    assert get_trait_translation("Knowledge") == {"vi": "Trí Tuệ", "en": "Knowledge"}
+
+    # A tokens entry, not a trait
+    assert translate_term("Might Roll")["categoryId"] == "tokens"
+    assert get_trait_translation("Might Roll") is None
+    assert registry.dispatch("get_trait_translation", {"trait": "Might Roll"}) == {
+        "error": "Trait not found",
+    }
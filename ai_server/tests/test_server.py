@@ -0,0 +1,110 @@
+"""
+Tests for the MCP server's caching of static-data tool responses.
+
+Run with:
+    python -m pytest tests
+"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp_server import data_loader, history_manager, server
+from mcp_server.session_store import create_store
+from mcp_server.tools import registry
+
+
+@pytest.fixture
+def dispatched(monkeypatch):
+    """Start with an empty response cache and record every dispatched call."""
+    calls = []
+    dispatch = registry.dispatch
+
+    def record(name, arguments):
+        calls.append(name)
+        return dispatch(name, arguments)
+
+    monkeypatch.setattr(server, "RESPONSE_CACHE_SIZE", 256)
+    monkeypatch.setattr(registry, "dispatch", record)
+    server._response_cache.clear()
+    yield calls
+    server._response_cache.clear()
+
+
+def _result(response) -> object:
+    return json.loads(response[0].text)
+
+
+def test_repeated_call_is_served_from_the_cache(dispatched):
+    first = server._call_tool("get_room_by_name", {"name": "ham mo"})
+    assert server._call_tool("get_room_by_name", {"name": "ham mo"}) is first
+    # Arguments outside the schema do not make a different call
+    assert server._call_tool("get_room_by_name", {"name": "ham mo", "extra": 1}) is first
+    assert dispatched == ["get_room_by_name"]
+
+    other = server._call_tool("get_room_by_name", {"name": "crypt"})
+    assert other is not first
+    assert dispatched == ["get_room_by_name"] * 2
+
+
+def test_cache_size_limit(dispatched, monkeypatch):
+    monkeypatch.setattr(server, "RESPONSE_CACHE_SIZE", 2)
+    for floor in ("ground", "upper", "basement", "ground"):
+        server._call_tool("get_rooms_by_floor", {"floor": floor})
+    # "ground" was evicted by "basement"
+    assert dispatched == ["get_rooms_by_floor"] * 4
+    assert len(server._response_cache) == 2
+
+
+def test_session_tools_are_never_cached(dispatched, tmp_path, monkeypatch):
+    for spec in registry.TOOLS.values():
+        if "session_id" in spec.input_schema["properties"]:
+            assert not spec.cacheable, spec.name
+
+    monkeypatch.setattr(history_manager, "SESSION_FLUSH_INTERVAL", 0)
+    history_manager.set_store(create_store("json", tmp_path))
+    try:
+        history_manager.create_history_file("s-1", {
+            "players": [], "map": {"placedRooms": []}, "turnState": {},
+        })
+        first = _result(server._call_tool("list_game_sessions", {}))
+        history_manager.create_history_file("s-2", {
+            "players": [], "map": {"placedRooms": []}, "turnState": {},
+        })
+        second = _result(server._call_tool("list_game_sessions", {}))
+    finally:
+        history_manager.set_store(None)
+
+    assert len(second) == len(first) + 1
+    assert dispatched == ["list_game_sessions"] * 2
+    assert not server._response_cache
+
+
+def test_reload_drops_cached_responses(dispatched, tmp_path, monkeypatch):
+    for filename in data_loader.DATA_FILES:
+        shutil.copy(data_loader._get_data_dir() / filename, tmp_path / filename)
+    monkeypatch.setattr(data_loader, "_get_data_dir", lambda: tmp_path)
+    monkeypatch.setattr(data_loader, "DATA_CACHE", False)
+    data_loader.clear_cache()
+    try:
+        before = _result(server._call_tool("get_room_by_name", {"name": "crypt"}))
+        assert before[0]["name"]["en"] == "Crypt"
+
+        maps_path = tmp_path / data_loader.MAPS_FILE
+        maps = json.loads(maps_path.read_text(encoding="utf-8"))
+        crypt = next(room for room in maps["ROOMS"] if room["name"]["en"] == "Crypt")
+        crypt["name"]["en"] = "Crypt of Changes"
+        maps_path.write_text(json.dumps(maps), encoding="utf-8")
+        assert data_loader.reload_if_changed()
+
+        after = _result(server._call_tool("get_room_by_name", {"name": "crypt"}))
+        assert after[0]["name"]["en"] == "Crypt of Changes"
+        assert dispatched == ["get_room_by_name"] * 2
+    finally:
+        monkeypatch.undo()
+        data_loader.clear_cache()
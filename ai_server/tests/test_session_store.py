@@ -0,0 +1,209 @@
+"""
+Tests for the session storage backends and the session index.
+
+Run with:
+    python -m pytest tests
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcp_server.session_codec import decode, encode
+from mcp_server.session_store import (
+    JsonFileStore,
+    _file_lock,
+    _read_lines_reversed,
+    create_store,
+)
+
+
+def _state(session_id: str, phase: str = "exploration", updated: str = "2025-01-01T00:00:00Z",
+           players: int = 2) -> dict:
+    return {
+        "meta": {
+            "sessionId": session_id,
+            "createdAt": "2025-01-01T00:00:00Z",
+            "lastUpdated": updated,
+            "gamePhase": phase,
+            "version": 0,
+        },
+        "players": [{"id": f"player-{i + 1}", "isAI": i == 0} for i in range(players)],
+        "map": {
+            "placedRooms": [
+                {"instanceId": "room-001", "floor": "ground", "x": 0, "y": -1, "doors": {}},
+            ],
+            "nextRoomId": 2,
+        },
+        "turnState": {"movementRemaining": 3, "pendingRolls": [{"rollId": "r1"}]},
+        "actionLogOffset": 0,
+    }
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path):
+    store = create_store(request.param, tmp_path)
+    yield store
+    store.close()
+
+
+def test_round_trip(store):
+    state = _state("s-1")
+    store.create("s-1", copy.deepcopy(state))
+
+    assert store.exists("s-1")
+    assert store.read("s-1") == state
+    with pytest.raises(FileExistsError):
+        store.create("s-1", state)
+
+    revision = store.revision("s-1")
+    state["turnState"]["movementRemaining"] = 1
+    state["map"]["placedRooms"].append(
+        {"instanceId": "room-002", "floor": "ground", "x": 0, "y": 0, "doors": {}}
+    )
+    store.write("s-1", copy.deepcopy(state))
+    assert store.read("s-1") == state
+    assert store.revision("s-1") != revision
+
+    assert store.delete("s-1")
+    assert not store.exists("s-1")
+    assert store.read("s-1") is None
+    assert store.revision("s-1") is None
+    assert not store.delete("s-1")
+
+
+def test_action_log(store):
+    state = _state("s-1")
+    store.create("s-1", state)
+    actions = [{"action": "move", "turn": 1, "n": i} for i in range(5)]
+
+    revision = store.revision("s-1")
+    store.append_actions("s-1", state, actions[:3])
+    middle = state["actionLogOffset"]
+    store.append_actions("s-1", state, actions[3:])
+    assert store.revision("s-1") != revision
+
+    logged = list(store.iter_actions("s-1", 0))
+    assert [action for _, action in logged] == actions
+    assert logged[2][0] == middle
+    assert logged[-1][0] == state["actionLogOffset"]
+    assert [action for _, action in store.iter_actions("s-1", middle)] == actions[3:]
+
+    reversed_actions = list(store.iter_actions_reversed("s-1", state["actionLogOffset"]))
+    assert reversed_actions == actions[::-1]
+    assert list(store.iter_actions_reversed("s-1", middle)) == actions[2::-1]
+    assert list(store.iter_actions_reversed("s-1", state["actionLogOffset"], "end_turn")) == []
+
+
+def test_append_discards_entries_past_the_snapshot(store):
+    state = _state("s-1")
+    store.create("s-1", state)
+    store.append_actions("s-1", state, [{"action": "move", "n": 0}])
+    saved = copy.deepcopy(state)
+
+    # Logged, but the snapshot that would include it was never written
+    store.append_actions("s-1", state, [{"action": "move", "n": 1}])
+    store.append_actions("s-1", saved, [{"action": "end_turn", "n": 2}])
+
+    assert [action["n"] for _, action in store.iter_actions("s-1", 0)] == [0, 2]
+
+
+def test_listing(store):
+    store.create("a", _state("a", updated="2025-01-03T00:00:00Z", players=3))
+    store.create("b", _state("b", phase="haunt", updated="2025-01-01T00:00:00Z"))
+    store.create("c", _state("c", updated="2025-01-02T00:00:00Z"))
+
+    assert [s["sessionId"] for s in store.list_sessions()] == ["a", "c", "b"]
+    assert [s["sessionId"] for s in store.list_sessions(descending=False)] == ["b", "c", "a"]
+    assert [s["sessionId"] for s in store.list_sessions(phase="exploration")] == ["a", "c"]
+    assert [s["sessionId"] for s in store.list_sessions(offset=1, limit=1)] == ["c"]
+    assert store.list_sessions(sort_by="playerCount")[0] == {
+        "sessionId": "a",
+        "createdAt": "2025-01-01T00:00:00Z",
+        "lastUpdated": "2025-01-03T00:00:00Z",
+        "gamePhase": "exploration",
+        "playerCount": 3,
+    }
+    assert store.count_sessions() == 3
+    assert store.count_sessions("haunt") == 1
+    with pytest.raises(ValueError):
+        store.list_sessions(sort_by="name")
+
+    store.write("b", _state("b", phase="exploration", updated="2025-01-04T00:00:00Z"))
+    store.delete("a")
+    assert [s["sessionId"] for s in store.list_sessions()] == ["b", "c"]
+    assert store.count_sessions("haunt") == 0
+    assert store.rebuild_index() == 2
+
+
+def test_json_index_follows_the_files(tmp_path):
+    store = JsonFileStore(tmp_path)
+    store.create("a", _state("a"))
+    state = _state("b")
+    store.create("b", state)
+    store.append_actions("b", state, [{"action": "move"}])
+    store.close()
+
+    # Files changed while no store had them open
+    (tmp_path / "a.json").unlink()
+    (tmp_path / "c.json").write_bytes(encode(_state("c", phase="haunt")))
+
+    store = JsonFileStore(tmp_path)
+    assert sorted(s["sessionId"] for s in store.list_sessions()) == ["a", "b"]
+    assert store.rebuild_index() == 2
+    assert sorted(s["sessionId"] for s in store.list_sessions()) == ["b", "c"]
+    assert store.count_sessions("haunt") == 1
+    store.close()
+
+    # A new index is filled from the files
+    (tmp_path / "session_index.db").unlink()
+    store = JsonFileStore(tmp_path)
+    assert sorted(s["sessionId"] for s in store.list_sessions()) == ["b", "c"]
+    store.close()
+
+
+def test_unsafe_codecs_need_to_be_configured(tmp_path):
+    state = _state("s-1")
+    for codec in ("pickle", "marshal"):
+        payload = encode(state, codec)
+        with pytest.raises(ValueError):
+            decode(payload)
+        assert decode(payload, codec) == state
+    assert decode(encode(state, "json+gzip"), "pickle") == state
+
+    (tmp_path / "s-1.json").write_bytes(encode(state, "pickle"))
+    store = JsonFileStore(tmp_path)
+    with pytest.raises(ValueError):
+        store.read("s-1")
+    assert store.count_sessions() == 0
+    store.close()
+
+    store = JsonFileStore(tmp_path, "pickle")
+    assert store.read("s-1") == state
+    store.close()
+
+
+def test_read_lines_reversed(tmp_path):
+    path = tmp_path / "log.jsonl"
+    lines = [f"line {i} " * (i % 7) + str(i) for i in range(50)]
+    data = "\n".join(lines).encode() + b"\n"
+    path.write_bytes(data)
+
+    # Blocks smaller than a line still yield whole lines
+    assert [line.decode() for line in _read_lines_reversed(path, len(data), 16)] == lines[::-1]
+    end = data.index(b"\n", 100) + 1
+    expected = data[:end].decode().splitlines()[::-1]
+    assert [line.decode() for line in _read_lines_reversed(path, end, 7)] == expected
+
+
+def test_file_lock_is_reentrant(tmp_path):
+    path = tmp_path / ".locks" / "s-1.lock"
+    with _file_lock(path):
+        with _file_lock(path):
+            assert path.exists()
+    with _file_lock(path):
+        pass